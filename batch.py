@@ -0,0 +1,422 @@
+"""
+ *****************************************************************************
+   FILE:  batch.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This program plays many two-player games of Monopoly at once
+                by keeping the token locations, money, owners and houses of
+                every game in NumPy arrays. Each step rolls the dice for
+                every game that is still being played and resolves the
+                spots they land on with array operations. The decisions are
+                the ones made by simulate.Bot: buy whenever the property is
+                affordable, pay the cheaper Income Tax, always use a "Jail
+                Free" card and build every affordable house.
+
+ *****************************************************************************
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+import engine
+
+
+# codes for the type of each spot:
+SAFE = 0
+PROPERTY = 1
+INCOME_TAX = 2
+LUXURY_TAX = 3
+GO_JAIL = 4
+CHANCE = 5
+COMMUNITY = 6
+
+# the spot numbers of the railroads and utilities:
+RAILROADS = np.array([6, 16, 26, 36])
+UTILITIES = np.array([13, 29])
+
+
+def build_tables(board):
+    """This function builds arrays indexed by spot number (1 to 40) from the
+       engine.BoardTable of the board: the type code, the price, the house
+       cost, the set number and the rent matrix. Row i of the rent matrix is
+       the rent of spot i for each number of houses (deeds) or number of
+       railroads or utilities owned."""
+
+    spot_type = np.zeros(41, dtype=np.int8)
+    price = np.array(board._prices, dtype=np.int64)
+    house_cost = np.array(board._house_costs, dtype=np.int64)
+    rent = np.zeros((41, 6), dtype=np.int64)
+
+    # the engine's type codes of the properties are merged into one:
+    codes = {engine.DEED: PROPERTY, engine.RAILROAD: PROPERTY,
+             engine.UTILITY: PROPERTY, engine.INCOME_TAX: INCOME_TAX,
+             engine.LUXURY_TAX: LUXURY_TAX, engine.GO_JAIL: GO_JAIL,
+             engine.CHANCE: CHANCE, engine.COMMUNITY: COMMUNITY}
+    for i in range(1, 41):
+        spot_type[i] = codes.get(board._kinds[i], SAFE)
+        rent[i, :len(board._rents[i])] = board._rents[i]
+
+    # lists the spots in each set of deeds, padding the two-deed sets by
+    # repeating their first spot:
+    deed_sets = []
+    for number in range(len(engine.SET_NAMES)):
+        spots = [i for i in range(1, 41)
+                 if board._sets[i] == number and
+                 board._kinds[i] == engine.DEED]
+        if len(spots) > 0:
+            deed_sets.append(spots + [spots[0]] * (3 - len(spots)))
+    deed_sets = np.array(deed_sets)
+
+    # the deed set (row of deed_sets) of each spot, -1 for other spots:
+    deed_set_of = np.full(41, -1, dtype=np.int64)
+    for row in range(len(deed_sets)):
+        deed_set_of[deed_sets[row]] = row
+
+    return spot_type, price, house_cost, deed_sets, deed_set_of, rent
+
+
+def _card_tables(table):
+    """Given an engine.CardTable, this function builds the arrays describing
+       the deck: the spot each card moves a player to from each spot (0 for
+       no move), whether the move passes "GO", the money the player and each
+       other player get, and whether the card is "Go to Jail" or "Jail
+       Free"."""
+
+    num_cards = len(table._names)
+    dest = np.zeros((num_cards, 41), dtype=np.int64)
+    passes_go = np.zeros((num_cards, 41), dtype=bool)
+    money = np.zeros(num_cards, dtype=np.int64)
+    others = np.zeros(num_cards, dtype=np.int64)
+
+    for card in range(num_cards):
+        effect = table._effects[card]
+        if table._moves[card] is not None:
+            for piece_loc in range(1, 41):
+                dest[card, piece_loc], passes_go[card, piece_loc] = \
+                    table._moves[card][piece_loc]
+        elif effect == engine.COLLECT:
+            money[card] = table._amounts[card]
+        elif effect == engine.PAY:
+            money[card] = -table._amounts[card]
+        elif effect == engine.PAY_EACH:
+            money[card] = -table._amounts[card]
+            others[card] = table._amounts[card]
+
+    effects = np.array(table._effects)
+    return (dest, passes_go, money, others, effects == engine.TO_JAIL,
+            effects == engine.KEEP_JAIL_FREE)
+
+
+# the Chance and Community Chest cards in the same order as
+# engine.CARD_TABLES:
+CHANCE_TABLES = _card_tables(engine.CARD_TABLES[0])
+COMM_TABLES = _card_tables(engine.CARD_TABLES[1])
+
+
+class BatchSimulator(object):
+    """This class plays num_games games at once. Row i of each array is the
+       state of game i and column 0 or 1 is player 1 or player 2."""
+
+    # the constructor for the BatchSimulator class:
+    def __init__(self, board, num_games, seed=None, max_turns=1000):
+
+        self._num_games = num_games
+        self._max_turns = max_turns
+        self._rng = np.random.default_rng(seed)
+
+        (self._spot_type, self._price, self._house_cost, self._deed_sets,
+         self._deed_set_of, self._rent) = build_tables(board)
+
+        # the state of each game:
+        self._piece_loc = np.ones((num_games, 2), dtype=np.int64)
+        self._money = np.full((num_games, 2), 1500, dtype=np.int64)
+        self._jail_free = np.zeros((num_games, 2), dtype=bool)
+        self._owned = np.zeros((num_games, 41), dtype=np.int8)
+        self._houses = np.zeros((num_games, 41), dtype=np.int8)
+        self._turn = np.zeros(num_games, dtype=np.int64)
+        self._roll_doubles = np.zeros(num_games, dtype=np.int64)
+        self._turns = np.ones(num_games, dtype=np.int64)
+        self._winner = np.zeros(num_games, dtype=np.int8)
+        self._over = np.zeros(num_games, dtype=bool)
+
+        # the order of each game's Chance and Community Chest decks and the
+        # number of cards drawn from them, shuffled before the first draw:
+        self._decks = [np.tile(np.arange(len(tables[2])), (num_games, 1))
+                       for tables in (CHANCE_TABLES, COMM_TABLES)]
+        self._drawn = [np.full(num_games, len(tables[2]), dtype=np.int64)
+                       for tables in (CHANCE_TABLES, COMM_TABLES)]
+
+    def step(self):
+        """This function rolls the dice once for every game that is still
+           being played and resolves the spot each player lands on. It
+           returns the number of games that are still being played."""
+
+        games = np.flatnonzero(~self._over)
+        if len(games) == 0:
+            return 0
+        turn = self._turn[games]
+
+        # rolls the dice for every game:
+        dice = self._rng.integers(1, 7, size=(len(games), 2))
+        advance = dice[:, 0] + dice[:, 1]
+        doubles = dice[:, 0] == dice[:, 1]
+        third = doubles & (self._roll_doubles[games] == 2)
+        jailed = third.copy()
+
+        # moves the players that weren't caught rolling doubles three times
+        # in succession, adding $200 if they pass "GO":
+        moving = ~third
+        piece_loc = self._piece_loc[games, turn]
+        move_to = piece_loc + advance
+        self._money[games, turn] += np.where(moving & (move_to > 40), 200, 0)
+        piece_loc = np.where(moving, (move_to - 1) % 40 + 1, piece_loc)
+
+        # draws Chance cards and then Community Chest cards (a Chance card
+        # can move the player back to a Community Chest spot):
+        for deck, kind, tables in ((0, CHANCE, CHANCE_TABLES),
+                                   (1, COMMUNITY, COMM_TABLES)):
+            drawing = moving & ~jailed & (self._spot_type[piece_loc] == kind)
+            if drawing.any():
+                piece_loc, jailed = self._draw_cards(games, turn, piece_loc,
+                                                     jailed, drawing, deck,
+                                                     tables)
+
+        # sends players that landed on "Go to Jail" to jail:
+        jailed |= moving & (self._spot_type[piece_loc] == GO_JAIL)
+        self._piece_loc[games, turn] = piece_loc
+        self._go_to_jail(games[jailed], turn[jailed])
+
+        # resolves taxes and properties for players that weren't jailed:
+        landed = ~jailed & moving
+        self._pay_taxes(games[landed], turn[landed], piece_loc[landed])
+        self._land_on_property(games[landed], turn[landed], piece_loc[landed],
+                               advance[landed])
+
+        # ends the turn of players that didn't roll doubles or were jailed:
+        again = doubles & ~jailed & ~self._over[games]
+        self._roll_doubles[games[again]] += 1
+        ending = games[~again & ~self._over[games]]
+        self._build_houses(ending, self._turn[ending])
+
+        # stops games that reached the turn limit before their turn is
+        # ended, the same as simulate.play_game:
+        limit = self._turns[ending] >= self._max_turns
+        self._over[ending[limit]] = True
+        ending = ending[~limit]
+
+        self._roll_doubles[ending] = 0
+        self._turn[ending] = 1 - self._turn[ending]
+        self._turns[ending] += 1
+
+        return int((~self._over).sum())
+
+    def _draw_cards(self, games, turn, piece_loc, jailed, drawing, deck,
+                    tables):
+        """This function draws the top card of the given deck (0 for Chance,
+           1 for Community Chest) for the games in the drawing mask and
+           performs the cards' actions. Each game's deck is shuffled once
+           every card has been drawn."""
+
+        dest, passes_go, money, others, jails, jail_frees = tables
+        rows = np.flatnonzero(drawing)
+        g = games[rows]
+        p = turn[rows]
+        loc = piece_loc[rows]
+
+        # shuffles the decks that ran out of cards:
+        decks = self._decks[deck]
+        drawn = self._drawn[deck]
+        empty = g[drawn[g] == len(money)]
+        decks[empty] = self._rng.permuted(decks[empty], axis=1)
+        drawn[empty] = 0
+
+        # picks the top card of each deck:
+        cards = decks[g, drawn[g]]
+        drawn[g] += 1
+
+        # moves the player, adding $200 if they pass "GO":
+        new_loc = dest[cards, loc]
+        self._money[g, p] += np.where(passes_go[cards, loc], 200, 0)
+        piece_loc = piece_loc.copy()
+        piece_loc[rows] = np.where(new_loc > 0, new_loc, loc)
+
+        # pays the player and the other player:
+        self._money[g, p] += money[cards]
+        self._money[g, 1 - p] += others[cards]
+
+        # gives out "Jail Free" cards and sends players to jail:
+        self._jail_free[g[jail_frees[cards]], p[jail_frees[cards]]] = True
+        jailed = jailed.copy()
+        jailed[rows] |= jails[cards]
+
+        return piece_loc, jailed
+
+    def _go_to_jail(self, games, turn):
+        """This function sends the players to jail, using their "Jail Free"
+           card instead if they have one."""
+
+        has_card = self._jail_free[games, turn]
+        self._jail_free[games[has_card], turn[has_card]] = False
+        self._piece_loc[games[~has_card], turn[~has_card]] = 11
+
+    def _bankrupcy(self, games, turn):
+        """This function ends the games where the active player went
+           bankrupt, making the other player the winner."""
+
+        self._over[games] = True
+        self._winner[games] = 2 - turn
+
+    def _pay_taxes(self, games, turn, piece_loc):
+        """This function makes players on a tax spot pay the tax."""
+
+        kind = self._spot_type[piece_loc]
+        money = self._money[games, turn]
+
+        # the Income Tax is the cheaper of 10% and $200:
+        tax = np.where(kind == INCOME_TAX,
+                       np.minimum((money * 0.1).astype(np.int64), 200), 0)
+        self._money[games, turn] -= tax
+
+        # the Luxury Tax is $200:
+        luxury = kind == LUXURY_TAX
+        self._money[games[luxury], turn[luxury]] -= 200
+
+        # checks if the players had enough money to pay the tax:
+        broke = (((kind == INCOME_TAX) | luxury) &
+                 (self._money[games, turn] < 0))
+        self._bankrupcy(games[broke], turn[broke])
+
+    def _land_on_property(self, games, turn, piece_loc, advance):
+        """This function buys unowned properties the player can afford and
+           makes the player pay rent on properties the other player owns."""
+
+        is_prop = self._spot_type[piece_loc] == PROPERTY
+        games = games[is_prop]
+        turn = turn[is_prop]
+        piece_loc = piece_loc[is_prop]
+        advance = advance[is_prop]
+
+        owner = self._owned[games, piece_loc]
+        money = self._money[games, turn]
+
+        # buys the unowned properties the player can afford:
+        buying = (owner == 0) & (money - self._price[piece_loc] > 0)
+        self._owned[games[buying], piece_loc[buying]] = turn[buying] + 1
+        self._money[games[buying], turn[buying]] -= self._price[
+            piece_loc[buying]]
+
+        # determines the rent of the properties the other player owns:
+        paying = (owner != 0) & (owner != turn + 1)
+        games = games[paying]
+        turn = turn[paying]
+        piece_loc = piece_loc[paying]
+        advance = advance[paying]
+        owner = owner[paying][:, None]
+        if len(games) == 0:
+            return
+
+        houses = self._houses[games, piece_loc]
+        deed_set = self._deed_set_of[piece_loc]
+        set_spots = self._deed_sets[np.maximum(deed_set, 0)]
+        monopoly = (deed_set >= 0) & (self._owned[games[:, None], set_spots] ==
+                                      owner).all(axis=1)
+        railroads = (self._owned[games[:, None], RAILROADS] ==
+                     owner).sum(axis=1)
+        utilities = (self._owned[games[:, None], UTILITIES] ==
+                     owner).sum(axis=1)
+
+        # railroads use the number of railroads owned, utilities use the
+        # number of utilities owned times the roll, and deeds use the number
+        # of houses, doubling the rent of a complete set without houses:
+        is_rail = np.isin(piece_loc, RAILROADS)
+        is_util = np.isin(piece_loc, UTILITIES)
+        level = np.where(is_rail, railroads, np.where(is_util, utilities,
+                                                      houses))
+        rent = self._rent[piece_loc, level]
+        rent = np.where(is_util, rent * advance, rent)
+        rent = np.where(monopoly & (houses == 0), rent * 2, rent)
+
+        # subtracts the rent, and pays the other player if the player can
+        # afford it:
+        self._money[games, turn] -= rent
+        broke = self._money[games, turn] < 0
+        self._money[games[~broke], 1 - turn[~broke]] += rent[~broke]
+        self._bankrupcy(games[broke], turn[broke])
+
+    def _build_houses(self, games, turn):
+        """This function builds every house the players can afford on the
+           sets of deeds they own completely, one house per deed at a
+           time."""
+
+        if len(games) == 0:
+            return
+        owner = (turn + 1)[:, None]
+
+        for row in range(len(self._deed_sets)):
+            spots = self._deed_sets[row]
+            complete = (self._owned[games[:, None], spots] == owner).all(
+                axis=1)
+            if not complete.any():
+                continue
+            g = games[complete]
+            p = turn[complete]
+            for level in range(3):
+                for spot in np.unique(spots):
+                    cost = self._house_cost[spot]
+                    can_build = ((self._houses[g, spot] == level) &
+                                 (self._money[g, p] - cost > 0))
+                    self._houses[g[can_build], spot] += 1
+                    self._money[g[can_build], p[can_build]] -= cost
+
+    def run(self):
+        """This function plays every game until it is over and returns the
+           results."""
+
+        while self.step() > 0:
+            pass
+        return self.results()
+
+    def results(self):
+        """This function returns a dictionary of arrays with the winner of
+           each game (0 if nobody won), the number of the last turn played
+           and the money of each player."""
+
+        return {'winner': self._winner.copy(),
+                'turns': self._turns.copy(),
+                'money': self._money.copy()}
+
+
+def main():
+    """This function runs a batch of games from the command line and prints
+       the number of wins for each player and the average number of
+       turns."""
+
+    parser = argparse.ArgumentParser(description='Simulate many games of '
+                                                 'Monopoly at once.')
+    parser.add_argument('games', type=int, help='number of games to play')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed of the random number generator')
+    parser.add_argument('--max-turns', type=int, default=1000,
+                        help='number of turns before a game is stopped')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    args = parser.parse_args()
+
+    simulator = BatchSimulator(engine.load_board(args.board), args.games,
+                               args.seed, args.max_turns)
+    results = simulator.run()
+
+    sys.stdout.write('games: %d\n' % args.games)
+    sys.stdout.write('player 1 wins: %d\n' % (results['winner'] == 1).sum())
+    sys.stdout.write('player 2 wins: %d\n' % (results['winner'] == 2).sum())
+    sys.stdout.write('no winner: %d\n' % (results['winner'] == 0).sum())
+    sys.stdout.write('average turns: %.1f\n' % results['turns'].mean())
+
+
+if __name__ == '__main__':
+    main()
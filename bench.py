@@ -0,0 +1,356 @@
+"""
+ *****************************************************************************
+   FILE:  bench.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This program measures how fast the rules engine performs the
+                work every simulated game repeats: whole games (games and
+                turns per second), the action of each type of spot, drawing
+                and applying each kind of card, moving a token (with and
+                without passing "GO"), checking for complete sets, and
+                saving and loading snapshots. Each action is timed over many
+                calls on a game set up for it, and the fastest of several
+                runs is kept. The results are written as JSON with the
+                details of the machine and Python they were measured on, so
+                that the numbers before and after a change to the engine can
+                be compared.
+
+ *****************************************************************************
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import snapshot
+from engine import (CARD_TABLES, CHANCE, COMMUNITY, DEED, GO_JAIL,
+                    INCOME_TAX, LUXURY_TAX, MAX_PLAYERS, MIN_PLAYERS,
+                    RAILROAD, SAFE, UTILITY, GameEngine, GameRandom,
+                    load_board)
+from simulate import Bot, play_game, play_turn
+
+
+# the names of the card effect codes (MOVE_TO to KEEP_JAIL_FREE):
+EFFECT_NAMES = ['move to', 'move nearest', 'move back', 'collect', 'pay',
+                'pay each', 'to jail', 'jail free']
+
+
+def best_time(function, number, repeat):
+    """This function calls function number times, repeat times over, and
+       returns the time of one call in the fastest run, in seconds. * The
+       fastest run is the one least slowed down by the rest of the
+       machine"""
+
+    best = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best / number
+
+
+def timing(seconds):
+    """This function returns the result of a timed action: the time of one
+       call and the number of calls per second."""
+
+    return {'seconds': seconds, 'per_second': 1 / seconds}
+
+
+def environment():
+    """This function returns the details of the machine and Python the
+       benchmarks are run on."""
+
+    return {'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpus': os.cpu_count(),
+            'date': datetime.datetime.now().isoformat(timespec='seconds')}
+
+
+def give(engine, player, piece_loc):
+    """This function gives a property to a player without them paying for
+       it."""
+
+    engine.set_ownership(piece_loc, player._idnum)
+    player._properties.append(piece_loc)
+    player._owned_mask |= engine._board._bits[piece_loc]
+
+
+def spots_of(board, kind):
+    """This function returns the spots of the given type code."""
+
+    return [piece_loc for piece_loc in range(1, 41)
+            if board._kinds[piece_loc] == kind]
+
+
+def bench_games(board, num_games, num_players, max_turns):
+    """This function plays num_games games of bots and returns the number of
+       games and turns played per second."""
+
+    turns = 0
+    start = time.perf_counter()
+    for seed in range(num_games):
+        bots = [Bot() for i in range(num_players)]
+        turns += play_game(board, seed, bots, max_turns)['turns']
+    elapsed = time.perf_counter() - start
+    return {'games': num_games,
+            'turns': turns,
+            'seconds': elapsed,
+            'games_per_second': num_games / elapsed,
+            'turns_per_second': turns / elapsed}
+
+
+def spot_game(board):
+    """This function returns an engine whose active player (player 1) lands
+       on properties of player 2: one deed of a set player 2 doesn't own
+       completely, a complete set with and without houses, two railroads
+       and both utilities. It also returns the spots of each case."""
+
+    engine = GameEngine(board, GameRandom(0))
+    owner = engine._state._players[1]
+
+    deeds = spots_of(board, DEED)
+    sets = [board._sets[piece_loc] for piece_loc in deeds]
+    monopoly = [piece_loc for piece_loc in deeds
+                if board._sets[piece_loc] == sets[0]]
+    plain = [piece_loc for piece_loc in deeds
+             if board._sets[piece_loc] == sets[-1]][0]
+    railroads = spots_of(board, RAILROAD)[:2]
+    utilities = spots_of(board, UTILITY)
+
+    for piece_loc in monopoly + [plain] + railroads + utilities:
+        give(engine, owner, piece_loc)
+    engine._state._houses[monopoly[-1]] = 3
+
+    spots = {'safe': spots_of(board, SAFE)[0],
+             'deed for sale': [piece_loc for piece_loc in deeds
+                               if engine.get_ownership(piece_loc) == 0][0],
+             'deed rent': plain,
+             'deed set rent': monopoly[0],
+             'deed houses rent': monopoly[-1],
+             'railroad rent': railroads[0],
+             'utility rent': utilities[0],
+             'income tax': spots_of(board, INCOME_TAX)[0],
+             'luxury tax': spots_of(board, LUXURY_TAX)[0],
+             'go to jail': spots_of(board, GO_JAIL)[0],
+             'chance': spots_of(board, CHANCE)[0],
+             'community chest': spots_of(board, COMMUNITY)[0]}
+    return engine, spots
+
+
+def bench_spot_action(board, number, repeat):
+    """This function times the action of each type of spot. * Each call
+       first puts the player back on the spot with $1500 so that every call
+       does the same work"""
+
+    engine, spots = spot_game(board)
+    state = engine._state
+    player = engine.player()
+    state._advance = 7
+
+    results = {}
+    for name in spots:
+        piece_loc = spots[name]
+
+        def action():
+            player._piece_loc = piece_loc
+            player._money = 1500
+            player._jail_free = False
+            state._phase = 'roll'
+            engine.spot_action([])
+
+        results[name] = timing(best_time(action, number, repeat))
+    return results
+
+
+def bench_cards(board, number, repeat):
+    """This function times drawing a card from each deck (with its action)
+       and applying one card of each effect."""
+
+    engine, spots = spot_game(board)
+    state = engine._state
+    player = engine.player()
+    state._advance = 7
+
+    results = {}
+    for deck_index, name in ((0, 'chance'), (1, 'community chest')):
+
+        def draw():
+            player._piece_loc = spots[name]
+            player._money = 1500
+            player._jail_free = False
+            state._phase = 'roll'
+            engine.draw_card(deck_index, name, [])
+
+        results['draw ' + name] = timing(best_time(draw, number, repeat))
+
+    # times the first card of each effect found in either deck:
+    for effect in range(len(EFFECT_NAMES)):
+        for table in CARD_TABLES:
+            if effect in table._effects:
+                card = table._effects.index(effect)
+                break
+        else:
+            continue
+
+        def apply():
+            player._piece_loc = spots['chance']
+            player._money = 1500
+            player._jail_free = False
+            state._phase = 'roll'
+            engine.apply_card(table, card, [])
+
+        results['apply ' + EFFECT_NAMES[effect]] = timing(
+            best_time(apply, number, repeat))
+    return results
+
+
+def bench_move_piece(board, number, repeat):
+    """This function times moving a token with and without passing "GO"."""
+
+    engine = GameEngine(board, GameRandom(0))
+    player = engine.player()
+
+    results = {}
+    for name, start, advance in (('no go', 1, 7), ('passing go', 35, 8)):
+
+        def move():
+            player._piece_loc = start
+            engine.move_piece(player, advance, [])
+
+        results[name] = timing(best_time(move, number, repeat))
+    return results
+
+
+def bench_monopoly(board, number, repeat):
+    """This function times checking whether the active player owns the set
+       of a deed and listing the sets they can build houses on."""
+
+    engine, spots = spot_game(board)
+    # makes the owner of the properties the active player:
+    engine._state._turn = 1
+    piece_loc = spots['deed set rent']
+
+    return {'owns set': timing(best_time(lambda: engine.owns_set(piece_loc),
+                                         number, repeat)),
+            'house sets': timing(best_time(engine.house_sets, number,
+                                           repeat))}
+
+
+def bench_snapshot(board, number, repeat):
+    """This function times saving and loading a snapshot of a game 100 turns
+       in, to bytes and to a file."""
+
+    engine = GameEngine(board, GameRandom(0))
+    state = engine._state
+    bots = [Bot(), Bot()]
+    while state._phase != 'over' and state._turns < 100:
+        play_turn(engine, bots[state._turn])
+        if state._phase != 'over':
+            engine.end_turn()
+    data = snapshot.dumps(state, engine._rng)
+
+    results = {'bytes': len(data),
+               'dumps': timing(best_time(
+                   lambda: snapshot.dumps(state, engine._rng), number,
+                   repeat)),
+               'loads': timing(best_time(lambda: snapshot.loads(data), number,
+                                         repeat))}
+
+    # files are much slower, so they are timed over fewer calls:
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'game.snap')
+        number = max(number // 10, 1)
+        results['save'] = timing(best_time(
+            lambda: snapshot.save(filename, state, engine._rng), number,
+            repeat))
+        results['load'] = timing(best_time(lambda: snapshot.load(filename),
+                                           number, repeat))
+    return results
+
+
+def run_benchmarks(board, games=200, players=2, number=10000, repeat=5,
+                   max_turns=1000):
+    """This function runs every benchmark and returns the results with the
+       settings and environment they were measured with."""
+
+    return {'environment': environment(),
+            'settings': {'games': games, 'players': players,
+                         'number': number, 'repeat': repeat,
+                         'max_turns': max_turns},
+            'results': {'games': bench_games(board, games, players,
+                                             max_turns),
+                        'spot_action': bench_spot_action(board, number,
+                                                         repeat),
+                        'cards': bench_cards(board, number, repeat),
+                        'move_piece': bench_move_piece(board, number,
+                                                       repeat),
+                        'monopoly': bench_monopoly(board, number, repeat),
+                        'snapshot': bench_snapshot(board, number // 10,
+                                                   repeat)}}
+
+
+def write_report(report, outfile):
+    """This function writes the results as a table that can be read at a
+       glance."""
+
+    games = report['results']['games']
+    outfile.write('games: %.1f games/s, %.0f turns/s\n' %
+                  (games['games_per_second'], games['turns_per_second']))
+    for group in ('spot_action', 'cards', 'move_piece', 'monopoly',
+                  'snapshot'):
+        results = report['results'][group]
+        for name in results:
+            if isinstance(results[name], dict):
+                outfile.write('%-12s %-22s %9.3f us %12.0f /s\n' %
+                              (group, name, 1e6 * results[name]['seconds'],
+                               results[name]['per_second']))
+
+
+def main():
+    """This function runs the benchmarks from the command line, writing the
+       results to a JSON file and a summary to the screen."""
+
+    parser = argparse.ArgumentParser(description='Measure the speed of the '
+                                                 'rules engine.')
+    parser.add_argument('--output', default='bench.json',
+                        help='file the JSON results are written to')
+    parser.add_argument('--games', type=int, default=200,
+                        help='number of whole games to play')
+    parser.add_argument('--players', type=int, default=2,
+                        choices=range(MIN_PLAYERS, MAX_PLAYERS + 1),
+                        metavar='PLAYERS',
+                        help='number of players in each game (2 to 8)')
+    parser.add_argument('--number', type=int, default=10000,
+                        help='number of calls in each run of an action')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of runs of each action')
+    parser.add_argument('--max-turns', type=int, default=1000,
+                        help='number of turns before a game is stopped')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    args = parser.parse_args()
+
+    report = run_benchmarks(load_board(args.board), args.games, args.players,
+                            args.number, args.repeat, args.max_turns)
+    with open(args.output, 'w') as outfile:
+        json.dump(report, outfile, indent=2)
+        outfile.write('\n')
+    write_report(report, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
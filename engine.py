@@ -0,0 +1,1089 @@
+"""
+ *****************************************************************************
+   FILE:  engine.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This module contains the rules of the Monopoly game without
+                any graphics. The GameEngine class advances a GameState one
+                decision at a time and returns a list of events describing
+                what happened so that a view (such as the one in game.py) or
+                a simulation can react to them.
+
+ *****************************************************************************
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import random
+import tempfile
+
+
+# the property sets - houses can only be built on the sets before
+# 'railroad':
+SET_NAMES = ['brown', 'lt blue', 'pink', 'orange', 'red', 'yellow', 'green',
+             'dk blue', 'railroad', 'utility']
+HOUSE_SETS = SET_NAMES.index('railroad')
+SET_INDEX = dict((SET_NAMES[i], i) for i in range(len(SET_NAMES)))
+
+# codes for the effect of each Chance and Community Chest card - the codes
+# of the cards that move the player are between MOVE_TO and MOVE_BACK:
+MOVE_TO = 0
+MOVE_NEAREST = 1
+MOVE_BACK = 2
+COLLECT = 3
+PAY = 4
+PAY_EACH = 5
+TO_JAIL = 6
+KEEP_JAIL_FREE = 7
+
+# lists all the possible Chance cards that could be picked as (name, effect,
+# argument): the spot moved to, the spots to move to the nearest of, the
+# number of spaces moved back or the amount of money:
+CHANCE_EFFECTS = [('Go', MOVE_TO, 1),
+                  ('Ill Ave', MOVE_TO, 25),
+                  ('St Char Plc', MOVE_TO, 12),
+                  ('Util', MOVE_NEAREST, (13, 29)),
+                  ('Rail', MOVE_NEAREST, (6, 16, 26, 36)),
+                  ('$50 Div', COLLECT, 50),
+                  ('Jail Free', KEEP_JAIL_FREE, 0),
+                  ('Back 3', MOVE_BACK, 3),
+                  ('Go Jail', TO_JAIL, 0),
+                  ('Poor Tax', PAY, 15),
+                  ('Read Rail', MOVE_TO, 6),
+                  ('Boardwalk', MOVE_TO, 40),
+                  ('Chairman', PAY_EACH, 50),
+                  ('Loan Matures', COLLECT, 150)]
+
+# lists all the possible Community Chest cards that could be picked - the
+# "Opera" card makes every other player pay the player:
+COMM_EFFECTS = [('Go', MOVE_TO, 1),
+                ('Bank Error', COLLECT, 200),
+                ('Doc Fee', PAY, 50),
+                ('Jail Free', KEEP_JAIL_FREE, 0),
+                ('Go Jail', TO_JAIL, 0),
+                ('Opera', PAY_EACH, -50),
+                ('Holiday', COLLECT, 100),
+                ('Income Refund', COLLECT, 20),
+                ('Life Insur', COLLECT, 100),
+                ('Hosp Fee', PAY, 100),
+                ('Sch Fee', PAY, 150),
+                ('Cons Fee', COLLECT, 25),
+                ('Beauty', COLLECT, 10),
+                ('Inherit', COLLECT, 100)]
+
+# the names of the cards in the order of their decks:
+CHANCE_CARDS = [card[0] for card in CHANCE_EFFECTS]
+COMM_CARDS = [card[0] for card in COMM_EFFECTS]
+
+# the maximum number of houses that can be built on a deed:
+MAX_HOUSES = 3
+
+# the number of players a game can have:
+MIN_PLAYERS = 2
+MAX_PLAYERS = 8
+
+# codes for the type of each spot - the codes of the properties that can be
+# bought are between DEED and UTILITY:
+SAFE = 0
+DEED = 1
+RAILROAD = 2
+UTILITY = 3
+INCOME_TAX = 4
+LUXURY_TAX = 5
+GO_JAIL = 6
+CHANCE = 7
+COMMUNITY = 8
+
+
+# the version of the compiled board - changing BoardTable makes the boards
+# cached on disk by older versions stale:
+BOARD_VERSION = 2
+
+# the directory (next to the board file) that compiled boards are cached in:
+BOARD_CACHE_DIR = '__boardcache__'
+
+# the compiled boards already loaded by this process, keyed by the hash of
+# their file - they are never changed so every game can share them:
+_loaded_boards = {}
+
+
+def load_properties(filename='dicts.json'):
+    """This function loads the dictionary of information about each spot on
+       the board (type of spot, prices, rent, etc.) from the given file."""
+
+    with open(filename, 'r') as infile:
+        return json.load(infile)
+
+
+def check_properties(properties):
+    """This function checks that the dictionary of information about each
+       spot has everything the rules need and raises a ValueError describing
+       the first problem found."""
+
+    for piece_loc in range(1, 41):
+        key = str(piece_loc)
+        if key not in properties:
+            raise ValueError('spot %s is missing' % key)
+        spot = properties[key]
+
+        if 'type' not in spot or 'name' not in spot:
+            raise ValueError('spot %s has no type or name' % key)
+        kind = spot['type']
+        if kind not in ('deed', 'railroad', 'utility', 'tax', 'jail', 'card',
+                        'collect', '0'):
+            raise ValueError('spot %s has unknown type %r' % (key, kind))
+        if kind not in ('deed', 'railroad', 'utility'):
+            continue
+
+        # checks the information needed to buy and charge rent:
+        if not isinstance(spot.get('price'), int) or spot['price'] <= 0:
+            raise ValueError('spot %s has no price' % key)
+        if spot.get('set', kind) not in SET_INDEX:
+            raise ValueError('spot %s has unknown set %r' %
+                             (key, spot.get('set')))
+        if kind == 'deed' and not isinstance(spot.get('house cost'), int):
+            raise ValueError('spot %s has no house cost' % key)
+        rent = spot.get('rent')
+        if not isinstance(rent, dict) or len(rent) == 0:
+            raise ValueError('spot %s has no rent' % key)
+        for level in rent:
+            if (not level.isdigit() or int(level) > 5 or
+                    not isinstance(rent[level], int)):
+                raise ValueError('spot %s has bad rent %r: %r' %
+                                 (key, level, rent[level]))
+
+        # the rent must cover every number of houses or properties owned:
+        if kind == 'deed':
+            levels = range(MAX_HOUSES + 1)
+        elif kind == 'railroad':
+            levels = range(1, 5)
+        else:
+            levels = range(1, 3)
+        for level in levels:
+            if str(level) not in rent:
+                raise ValueError('spot %s has no rent for %d' % (key, level))
+
+
+def count_bits(mask):
+    """This function returns the number of bits set in a mask of spots."""
+
+    return bin(mask).count('1')
+
+
+def load_board(filename='dicts.json', use_cache=True):
+    """This function returns the BoardTable compiled from the given file.
+       The dictionary is only checked and compiled the first time a file is
+       seen: the BoardTable is kept on disk in BOARD_CACHE_DIR, keyed by the
+       hash of the file, and in memory so that every game in the process
+       shares the same one. * Problems writing the cache are ignored"""
+
+    with open(filename, 'rb') as infile:
+        data = infile.read()
+    key = '%s-%d' % (hashlib.sha256(data).hexdigest(), BOARD_VERSION)
+
+    # checks if this process already loaded the board:
+    board = _loaded_boards.get(key)
+    if board is not None:
+        return board
+
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(filename)),
+                             BOARD_CACHE_DIR)
+    cache_file = os.path.join(cache_dir, key + '.pickle')
+
+    # checks if the board was compiled by an earlier process:
+    if use_cache:
+        try:
+            with open(cache_file, 'rb') as infile:
+                board = pickle.load(infile)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError):
+            board = None
+        if not isinstance(board, BoardTable):
+            board = None
+
+    if board is None:
+        properties = json.loads(data.decode('utf-8'))
+        check_properties(properties)
+        board = BoardTable(properties)
+
+        # writes the cache to a temporary file first so that other
+        # processes never read half of it:
+        if use_cache:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                outfd, temp_file = tempfile.mkstemp(dir=cache_dir)
+                with os.fdopen(outfd, 'wb') as outfile:
+                    pickle.dump(board, outfile, pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_file, cache_file)
+            except OSError:
+                pass
+
+    _loaded_boards[key] = board
+    return board
+
+
+class BoardTable(object):
+    """This class holds the information about each spot on the board that
+       the rules need, compiled from the dictionary in 'dicts.json' into
+       tuples indexed by the spot number (1 to 40): the type code, name,
+       price, house cost, set (index into SET_NAMES, -1 if none), rent and
+       deed image file. The rent of a spot is a tuple indexed by the number
+       of houses (deeds) or the number of railroads or utilities owned. It
+       also holds the bit of each spot in a player's mask of owned spots and
+       the mask of each set (in the order of SET_NAMES). * A set is owned
+       completely when the player's mask has every bit of the set's mask"""
+
+    __slots__ = ('_kinds', '_names', '_prices', '_house_costs', '_sets',
+                 '_rents', '_images', '_bits', '_set_masks')
+
+    # the constructor for the BoardTable class:
+    def __init__(self, properties):
+
+        # index 0 is unused so that spot numbers can be used directly:
+        kinds = [SAFE]
+        names = ['']
+        prices = [0]
+        house_costs = [0]
+        sets = [-1]
+        rents = [()]
+        images = ['']
+
+        for piece_loc in range(1, 41):
+            spot = properties[str(piece_loc)]
+            kind = spot['type']
+
+            # determines the type code of the spot:
+            if kind == 'deed':
+                kinds.append(DEED)
+            elif kind == 'railroad':
+                kinds.append(RAILROAD)
+            elif kind == 'utility':
+                kinds.append(UTILITY)
+            elif kind == 'tax' and spot['name'] == 'Income Tax':
+                kinds.append(INCOME_TAX)
+            elif kind == 'tax':
+                kinds.append(LUXURY_TAX)
+            elif kind == 'jail':
+                kinds.append(GO_JAIL)
+            elif kind == 'card' and spot['name'] == 'Chance':
+                kinds.append(CHANCE)
+            elif kind == 'card':
+                kinds.append(COMMUNITY)
+            else:
+                kinds.append(SAFE)
+
+            names.append(spot['name'])
+            prices.append(spot.get('price', 0))
+            house_costs.append(spot.get('house cost', 0))
+            sets.append(SET_INDEX.get(spot.get('set', kind), -1))
+            images.append(spot.get('image info', ''))
+
+            # lists the rent for each level, 0 for missing levels:
+            rent = spot.get('rent', {})
+            levels = [0] * (max([int(level) for level in rent] + [-1]) + 1)
+            for level in rent:
+                levels[int(level)] = rent[level]
+            rents.append(tuple(levels))
+
+        self._kinds = tuple(kinds)
+        self._names = tuple(names)
+        self._prices = tuple(prices)
+        self._house_costs = tuple(house_costs)
+        self._sets = tuple(sets)
+        self._rents = tuple(rents)
+        self._images = tuple(images)
+
+        # the bit of each spot and the mask of the spots in each set:
+        self._bits = tuple([1 << piece_loc for piece_loc in range(41)])
+        set_masks = [0] * len(SET_NAMES)
+        for piece_loc in range(1, 41):
+            if sets[piece_loc] >= 0:
+                set_masks[sets[piece_loc]] |= self._bits[piece_loc]
+        self._set_masks = tuple(set_masks)
+
+
+class CardTable(object):
+    """This class holds a deck of Chance or Community Chest cards compiled
+       from a list of (name, effect, argument) into tuples indexed by the
+       card number: the name, effect code and amount of money of each card,
+       and for cards that move the player, a tuple indexed by the spot the
+       player is on (1 to 40) of the spot they move to and whether they pass
+       "GO" on the way (None for other cards). * Applying a card is then a
+       lookup instead of a chain of comparisons"""
+
+    __slots__ = ('_names', '_effects', '_amounts', '_moves')
+
+    # the constructor for the CardTable class:
+    def __init__(self, cards):
+
+        names = []
+        effects = []
+        amounts = []
+        moves = []
+
+        for name, effect, arg in cards:
+            names.append(name)
+            effects.append(effect)
+
+            # determines the spot the card moves the player to from each spot
+            # (index 0 is unused):
+            if effect == MOVE_TO:
+                amounts.append(0)
+                moves.append(tuple([(0, False)] +
+                                   [(arg, arg <= piece_loc)
+                                    for piece_loc in range(1, 41)]))
+            elif effect == MOVE_NEAREST:
+                amounts.append(0)
+                moves.append(tuple([(0, False)] +
+                                   [self.nearest(arg, piece_loc)
+                                    for piece_loc in range(1, 41)]))
+            elif effect == MOVE_BACK:
+                amounts.append(0)
+                moves.append(tuple([(0, False)] +
+                                   [((piece_loc - arg - 1) % 40 + 1, False)
+                                    for piece_loc in range(1, 41)]))
+            else:
+                amounts.append(arg)
+                moves.append(None)
+
+        self._names = tuple(names)
+        self._effects = tuple(effects)
+        self._amounts = tuple(amounts)
+        self._moves = tuple(moves)
+
+    def nearest(self, spots, piece_loc):
+        """This function returns the next of the given spots after the
+           player's spot and whether the player passes "GO" to reach it."""
+
+        for spot in spots:
+            if piece_loc < spot:
+                return spot, False
+        return spots[0], True
+
+
+# the compiled Chance and Community Chest decks, in the order the decks are
+# kept in a GameState:
+CARD_TABLES = (CardTable(CHANCE_EFFECTS), CardTable(COMM_EFFECTS))
+
+
+# maps random bytes to die values - the four bytes that can't be split evenly
+# between the six faces are dropped:
+_DIE_BYTES = bytes([1 + byte % 6 for byte in range(252)] + [0] * 4)
+_DIE_DROPPED = bytes(range(252, 256))
+
+
+class GameRandom(object):
+    """This class is the random number generator of one game. It is seeded
+       with an integer or a tuple of integers (the key) and can be split into
+       child generators whose streams are independent of it and of each
+       other, such as one per worker process or per game. Dice and the random
+       numbers used to shuffle the decks are drawn in bulk from the generator
+       and kept in buffers."""
+
+    __slots__ = ('_key', '_spawned', '_random', '_buffer_size', '_dice',
+                 '_dice_pos', '_cards', '_cards_pos')
+
+    # the constructor for the GameRandom class:
+    def __init__(self, seed=None, buffer_size=1024):
+
+        # picks an unpredictable key if no seed is given:
+        if seed is None:
+            seed = int.from_bytes(os.urandom(16), 'big')
+        if isinstance(seed, int):
+            self._key = (seed,)
+        else:
+            self._key = tuple(seed)
+        self._spawned = 0
+
+        # seeds the generator with the hash of the key so that the keys of
+        # children (the parent's key and the child's number) give unrelated
+        # streams:
+        digest = hashlib.sha256(repr(self._key).encode('ascii')).digest()
+        self._random = random.Random(int.from_bytes(digest, 'big'))
+
+        # the buffers of dice values and shuffling bytes are filled on first
+        # use:
+        self._buffer_size = buffer_size
+        self._dice = b''
+        self._dice_pos = 0
+        self._cards = b''
+        self._cards_pos = 0
+
+    def spawn(self, num_children):
+        """This function returns a list of num_children new generators with
+           streams independent of this one. * Spawning again gives different
+           children"""
+
+        children = []
+        for i in range(num_children):
+            children.append(GameRandom(self._key + (self._spawned + i,),
+                                       self._buffer_size))
+        self._spawned += num_children
+        return children
+
+    def roll_dice(self):
+        """This function returns the values of two dice."""
+
+        # refills the buffer once every die in it has been used:
+        pos = self._dice_pos
+        if pos + 2 > len(self._dice):
+            self._dice = self._random.randbytes(
+                2 * self._buffer_size).translate(_DIE_BYTES, _DIE_DROPPED)
+            pos = 0
+        self._dice_pos = pos + 2
+        return self._dice[pos], self._dice[pos + 1]
+
+    def below(self, limit):
+        """This function returns a random number from 0 to limit - 1 (limit
+           must be at most 256)."""
+
+        # drops the bytes that can't be split evenly between the numbers:
+        largest = 256 - 256 % limit
+        while True:
+            if self._cards_pos == len(self._cards):
+                self._cards = self._random.randbytes(self._buffer_size)
+                self._cards_pos = 0
+            byte = self._cards[self._cards_pos]
+            self._cards_pos += 1
+            if byte < largest:
+                return byte % limit
+
+    def shuffle(self, deck):
+        """This function shuffles the deck (a bytearray or list) in place."""
+
+        for i in range(len(deck) - 1, 0, -1):
+            j = self.below(i + 1)
+            deck[i], deck[j] = deck[j], deck[i]
+
+    def getstate(self):
+        """This function returns the state of the generator, including its
+           buffers, so that it can be saved and restored with setstate()."""
+
+        return (self._key, self._spawned, self._random.getstate(),
+                self._buffer_size, self._dice, self._dice_pos, self._cards,
+                self._cards_pos)
+
+    def setstate(self, state):
+        """This function restores the state returned by getstate()."""
+
+        (self._key, self._spawned, random_state, self._buffer_size,
+         self._dice, self._dice_pos, self._cards, self._cards_pos) = state
+        self._random.setstate(random_state)
+
+
+class PlayerState(object):
+    """This class holds the attributes of a player that the rules of the game
+       need: their location, money, "Jail Free" card, owned properties (as a
+       list and as a mask with the BoardTable bit of each) and whether they
+       went bankrupt."""
+
+    __slots__ = ('_idnum', '_piece_loc', '_money', '_jail_free',
+                 '_properties', '_owned_mask', '_bankrupt')
+
+    # the constructor for the PlayerState class:
+    def __init__(self, idnum):
+
+        self._idnum = idnum
+
+        # initializes the player's token location, money, "Jail Free" card
+        # possession, owned properties (their board locations) and mask of
+        # owned properties:
+        self._piece_loc = 1
+        self._money = 1500
+        self._jail_free = False
+        self._properties = []
+        self._owned_mask = 0
+        self._bankrupt = False
+
+    def copy(self):
+        """This function returns a copy of the player that can be changed
+           without changing this one."""
+
+        player = PlayerState.__new__(PlayerState)
+        player._idnum = self._idnum
+        player._piece_loc = self._piece_loc
+        player._money = self._money
+        player._jail_free = self._jail_free
+        player._properties = list(self._properties)
+        player._owned_mask = self._owned_mask
+        player._bankrupt = self._bankrupt
+        return player
+
+
+class GameState(object):
+    """This class holds everything that changes during a game of 2 to 8
+       players: the players, who owns each property, the houses on each
+       property, the order of the card decks and the phase of the current
+       turn. * Uses __slots__ so that many games can be kept in memory at
+       once"""
+
+    __slots__ = ('_owned', '_houses', '_players', '_players_left', '_turn',
+                 '_roll_doubles', '_same_roll', '_advance', '_phase',
+                 '_turns', '_winner', '_bankrupcy_cause', '_decks', '_drawn')
+
+    # the constructor for the GameState class:
+    def __init__(self, num_players=2):
+
+        if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+            raise ValueError('a game has %d to %d players, not %d' %
+                             (MIN_PLAYERS, MAX_PLAYERS, num_players))
+
+        # the owner's id number (0 if not owned) and the number of houses of
+        # each spot, indexed by the spot number - player i + 1 is at index i
+        # of _players:
+        self._owned = bytearray(41)
+        self._houses = bytearray(41)
+
+        # creates the players, player 1 playing first, and counts the ones
+        # that haven't gone bankrupt:
+        self._players = [PlayerState(i + 1) for i in range(num_players)]
+        self._players_left = num_players
+        self._turn = 0
+
+        # initializes the number of successive doubles, whether the last roll
+        # lets the player roll again and the value of the last roll:
+        self._roll_doubles = 0
+        self._same_roll = False
+        self._advance = 0
+
+        # the phase of the turn is one of 'roll', 'buy', 'tax', 'jail free',
+        # 'end' or 'over':
+        self._phase = 'roll'
+        self._turns = 1
+        self._winner = None
+        self._bankrupcy_cause = None
+
+        # the order of the Chance and Community Chest decks (card numbers of
+        # CARD_TABLES) and the number of cards drawn from each - every card
+        # counts as drawn so that the decks are shuffled before the first
+        # draw:
+        self._decks = [bytearray(range(len(table._names)))
+                       for table in CARD_TABLES]
+        self._drawn = [len(deck) for deck in self._decks]
+
+    def copy(self):
+        """This function returns a copy of the state that can be changed
+           without changing this one. * Used to look ahead from a state, so
+           it copies each field directly instead of using the copy module"""
+
+        state = GameState.__new__(GameState)
+        state._owned = bytearray(self._owned)
+        state._houses = bytearray(self._houses)
+        state._players = [player.copy() for player in self._players]
+        state._players_left = self._players_left
+        state._turn = self._turn
+        state._roll_doubles = self._roll_doubles
+        state._same_roll = self._same_roll
+        state._advance = self._advance
+        state._phase = self._phase
+        state._turns = self._turns
+        state._winner = self._winner
+        state._bankrupcy_cause = self._bankrupcy_cause
+        state._decks = [bytearray(deck) for deck in self._decks]
+        state._drawn = list(self._drawn)
+        return state
+
+    def next_turn(self):
+        """This function returns the index of the next player after the
+           active one that hasn't gone bankrupt."""
+
+        turn = (self._turn + 1) % len(self._players)
+        while self._players[turn]._bankrupt:
+            turn = (turn + 1) % len(self._players)
+        return turn
+
+    def eliminate(self, index):
+        """This function takes the bankrupt player at the given index out of
+           the game. Their properties and houses go back to the bank unless
+           only one player is left, who wins the game."""
+
+        player = self._players[index]
+        player._bankrupt = True
+        self._players_left -= 1
+
+        if self._players_left == 1:
+            self._phase = 'over'
+            self._winner = self._players[self.next_turn()]._idnum
+            return
+
+        for piece_loc in player._properties:
+            self._owned[piece_loc] = 0
+            self._houses[piece_loc] = 0
+        player._properties = []
+        player._owned_mask = 0
+
+        # the rest of the bankrupt player's turn is skipped:
+        self._same_roll = False
+        self._phase = 'end'
+
+
+class GameEngine(object):
+    """This class performs the rules of Monopoly on a GameState. Each public
+       function performs one action of the active player and returns a list
+       of events (tuples whose first item names the event) that describe
+       what happened."""
+
+    # the constructor for the GameEngine class:
+    def __init__(self, board, rng=None, state=None, log=None):
+
+        # the BoardTable is shared between games and never changed, and the
+        # GameRandom rolls the dice and shuffles the decks:
+        self._board = board
+        self._rng = rng if rng is not None else GameRandom()
+
+        # starts a new game unless a state to continue is given:
+        if state is None:
+            state = GameState()
+        self._state = state
+
+        # the EventLog (or None) that the events of every action are
+        # recorded in:
+        self._log = log
+
+    def player(self):
+        """This function returns the active player."""
+
+        return self._state._players[self._state._turn]
+
+    def other(self):
+        """This function returns the player whose turn is next (the passive
+           player of a two-player game)."""
+
+        return self._state._players[self._state.next_turn()]
+
+    def set_ownership(self, piece_loc, player_idnum):
+        """This function sets the owner of a property given the property's spot
+           number and the player's id number."""
+
+        self._state._owned[piece_loc] = player_idnum
+
+    def get_ownership(self, piece_loc):
+        """This function returns the owner of a specific property."""
+
+        return self._state._owned[piece_loc]
+
+    def get_houses(self, piece_loc):
+        """This function returns the number of houses on a property."""
+
+        return self._state._houses[piece_loc]
+
+    def roll(self, die1=None, die2=None):
+        """This function rolls the dice for the active player (or uses the
+           given values), moves the player's token and performs the action of
+           the spot that was landed on."""
+
+        state = self._state
+        player = self.player()
+
+        # rolls each die by finding a random number between 1 and 6 unless
+        # the roll was given:
+        if die1 is None:
+            die1, die2 = self._rng.roll_dice()
+
+        # determines the number of spaces the player will advance:
+        state._advance = die1 + die2
+        events = [('roll', die1, die2)]
+
+        if die1 != die2:
+            # the player can't roll again:
+            state._same_roll = False
+            self.move_piece(player, state._advance, events)
+            self.spot_action(events)
+
+        elif state._roll_doubles < 2:
+            # the player rolled doubles less than three times in succession
+            # and may roll again:
+            state._roll_doubles += 1
+            state._same_roll = True
+            self.move_piece(player, state._advance, events)
+            self.spot_action(events)
+
+        else:
+            # the player rolled doubles three times in succession and is sent
+            # to jail without moving:
+            state._same_roll = False
+            self.send_to_jail(events)
+
+        return self._logged(events)
+
+    def move_piece(self, player, advance, events):
+        """Given the player and the number of spaces the token will advance,
+           this function moves the player around the board."""
+
+        # determines the spot the player will move to:
+        move_piece_to = player._piece_loc + advance
+
+        # if the player moves all the way around the board (passes "GO"), $200
+        # is added to their money:
+        passed_go = move_piece_to > 40
+        if passed_go:
+            player._money += 200
+
+        # since there are only 40 spots on the board, keeps the player on the
+        # board by modding by 40:
+        piece_loc = move_piece_to % 40
+        if piece_loc == 0:
+            piece_loc = 40
+        player._piece_loc = piece_loc
+
+        events.append(('move', piece_loc, passed_go))
+
+    def move_to(self, player, piece_loc, passes_go, events):
+        """This function moves the player directly to the given spot, adding
+           $200 to their money if they pass "GO" on the way."""
+
+        if passes_go:
+            player._money += 200
+        player._piece_loc = piece_loc
+
+        events.append(('move', piece_loc, passes_go))
+
+    def send_to_jail(self, events):
+        """This function sends the active player to jail, or lets them choose
+           to use their "Jail Free" card if they have one."""
+
+        state = self._state
+        state._same_roll = False
+
+        # checks if player has a get out of "Jail Free" card:
+        if self.player()._jail_free:
+            state._phase = 'jail free'
+            events.append(('jail free',))
+        else:
+            # sets the player's location to spot 11 ("Just Visiting") because
+            # the player's next roll will move from that spot:
+            self.player()._piece_loc = 11
+            events.append(('jail',))
+            self._finish_action()
+
+    def spot_action(self, events):
+        """This function determines the type of spot the player landed on and
+           performs the actions that go along with the spot."""
+
+        state = self._state
+        board = self._board
+        player = self.player()
+        piece_loc = player._piece_loc
+
+        # determines the type of spot:
+        kind = board._kinds[piece_loc]
+
+        # checks if the spot is a deed, utility or railroad:
+        if DEED <= kind <= UTILITY:
+            owner = self.get_ownership(piece_loc)
+
+            # checks if the property is not yet owned:
+            if owner == 0:
+                # checks if player has enough money to buy:
+                if player._money - board._prices[piece_loc] > 0:
+                    # the player must choose whether or not to buy:
+                    state._phase = 'buy'
+                    events.append(('buy choice', piece_loc))
+                    return
+                events.append(('cant buy', piece_loc))
+
+            # checks if the property is owned by another player:
+            elif owner != player._idnum:
+                other = state._players[owner - 1]
+                rent = board._rents[piece_loc]
+
+                # determines the amount of rent the player must pay:
+                if kind == DEED:
+                    houses = self.get_houses(piece_loc)
+                    money_lost = rent[houses]
+                    # checks if the owner owns all of the properties in the
+                    # set and doubles the rent:
+                    if houses == 0:
+                        set_mask = board._set_masks[board._sets[piece_loc]]
+                        if other._owned_mask & set_mask == set_mask:
+                            money_lost = money_lost * 2
+
+                else:
+                    # the rent of railroads and utilities depends on the
+                    # number the owner owns - utility rent is multiplied by
+                    # the roll:
+                    owned = count_bits(
+                        other._owned_mask &
+                        board._set_masks[board._sets[piece_loc]])
+                    money_lost = rent[owned]
+                    if kind == UTILITY:
+                        money_lost = money_lost * state._advance
+
+                # subtracts money_lost from the player's money and checks if
+                # the player doesn't have enough money to pay rent:
+                player._money -= money_lost
+                if player._money < 0:
+                    self.bankrupcy('rent', money_lost, events)
+                    return
+                other._money += money_lost
+                events.append(('pay', piece_loc, money_lost, owner))
+
+            # the player already owns the property:
+            else:
+                events.append(('player_owns', piece_loc))
+
+        # checks if the spot is the Income Tax:
+        elif kind == INCOME_TAX:
+            # the player must choose which payment to make:
+            state._phase = 'tax'
+            events.append(('tax choice',))
+            return
+
+        # checks if the spot is the Luxury Tax:
+        elif kind == LUXURY_TAX:
+            # subtracts the luxury tax payment from player's money and checks
+            # if the player doesn't have enough money to pay the tax:
+            player._money -= 200
+            if player._money < 0:
+                self.bankrupcy('luxury tax', 200, events)
+                return
+            events.append(('luxury',))
+
+        # checks if the spot is "Go to Jail":
+        elif kind == GO_JAIL:
+            self.send_to_jail(events)
+            return
+
+        # checks if the spot is a Chance or Community Chest card:
+        elif kind == CHANCE:
+            self.chance(events)
+            return
+
+        elif kind == COMMUNITY:
+            self.community(events)
+            return
+
+        # the spot is "Go", "Just Visiting" or "Free Parking":
+        else:
+            events.append(('safe',))
+
+        self._finish_action()
+
+    def chance(self, events):
+        """This function picks a Chance card and performs its action."""
+
+        self.draw_card(0, 'chance', events)
+
+    def community(self, events):
+        """This function picks a Community Chest card and performs its
+           action."""
+
+        self.draw_card(1, 'community', events)
+
+    def draw_card(self, deck_index, event, events):
+        """Given the deck (0 for Chance, 1 for Community Chest), this function
+           draws the top card of the deck and performs its action. The deck
+           is shuffled once every card has been drawn. * The "Jail Free"
+           card stays in the deck while a player keeps it"""
+
+        state = self._state
+        deck = state._decks[deck_index]
+
+        # shuffles the deck once it runs out of cards:
+        if state._drawn[deck_index] == len(deck):
+            self._rng.shuffle(deck)
+            state._drawn[deck_index] = 0
+            events.append(('shuffle', deck_index, bytes(deck)))
+
+        # picks the top card:
+        card = deck[state._drawn[deck_index]]
+        state._drawn[deck_index] += 1
+
+        table = CARD_TABLES[deck_index]
+        events.append((event, table._names[card]))
+        self.apply_card(table, card, events)
+
+    def apply_card(self, table, card, events):
+        """Given the CardTable and the number of a card in it, this function
+           performs the card's action for the active player."""
+
+        player = self.player()
+
+        # checks the effect of the card:
+        effect = table._effects[card]
+        if MOVE_TO <= effect <= MOVE_BACK:
+            piece_loc, passes_go = table._moves[card][player._piece_loc]
+            self.move_to(player, piece_loc, passes_go, events)
+            # "GO" has no action of its own:
+            if piece_loc != 1:
+                self.spot_action(events)
+                return
+
+        elif effect == COLLECT:
+            player._money += table._amounts[card]
+
+        elif effect == PAY:
+            player._money -= table._amounts[card]
+
+        elif effect == PAY_EACH:
+            # pays every other player still in the game the amount (or is
+            # paid by them if the amount is negative):
+            amount = table._amounts[card]
+            player._money -= amount * (self._state._players_left - 1)
+            for other in self._state._players:
+                if other is not player and not other._bankrupt:
+                    other._money += amount
+
+        elif effect == TO_JAIL:
+            self.send_to_jail(events)
+            return
+
+        else:
+            player._jail_free = True
+
+        self._finish_action()
+
+    def bankrupcy(self, cause, money_lost, events):
+        """This function takes the active player out of the game because they
+           can't pay the money_lost that was already subtracted from their
+           money. The game is over once only one player is left."""
+
+        state = self._state
+        state._bankrupcy_cause = cause
+        state.eliminate(state._turn)
+        events.append(('bankrupcy', cause, money_lost))
+
+    def _logged(self, events):
+        """This function records the events of an action in the EventLog, if
+           there is one, and returns them."""
+
+        if self._log is not None:
+            self._log.record(events)
+        return events
+
+    def _finish_action(self):
+        """This function ends the action of a spot by letting the player roll
+           again if they rolled doubles, or by ending their rolls for the
+           turn."""
+
+        state = self._state
+        if state._phase == 'over':
+            return
+        if state._same_roll:
+            state._phase = 'roll'
+        else:
+            state._phase = 'end'
+
+    def buy(self):
+        """This function buys the property the active player is on."""
+
+        player = self.player()
+        piece_loc = player._piece_loc
+
+        # sets the owner of the spot, appends it to the player's properties
+        # and adds its bit to the player's mask:
+        player._money -= self._board._prices[piece_loc]
+        self.set_ownership(piece_loc, player._idnum)
+        player._properties.append(piece_loc)
+        player._owned_mask |= self._board._bits[piece_loc]
+
+        self._finish_action()
+        return self._logged([('buy', piece_loc)])
+
+    def pass_property(self):
+        """This function lets the active player pass on buying the property
+           they are on."""
+
+        self._finish_action()
+        return self._logged([('pass', self.player()._piece_loc)])
+
+    def pay_income_tax(self, choice):
+        """Given the player's choice of '10%' or '200', this function makes
+           the active player pay the Income Tax."""
+
+        player = self.player()
+
+        # determines the money lost after paying the tax:
+        if choice == '10%':
+            money_lost = int(player._money * 0.1)
+        else:
+            money_lost = 200
+        player._money -= money_lost
+
+        # checks if the player has enough money to pay the tax:
+        events = []
+        if player._money < 0:
+            self.bankrupcy('income tax', money_lost, events)
+        else:
+            events.append(('tax paid', money_lost))
+            self._finish_action()
+        return self._logged(events)
+
+    def jail_free_choice(self, use_card):
+        """This function lets the active player use their "Jail Free" card to
+           stay out of jail, or sends them to jail."""
+
+        player = self.player()
+        events = []
+
+        if use_card:
+            player._jail_free = False
+            events.append(('jail free used',))
+        else:
+            player._piece_loc = 11
+            events.append(('jail',))
+
+        # going to jail always ends the player's rolls:
+        self._state._same_roll = False
+        self._finish_action()
+        return self._logged(events)
+
+    def house_sets(self):
+        """This function returns the names of the sets that the active player
+           owns completely."""
+
+        house_sets = []
+        owned_mask = self.player()._owned_mask
+        set_masks = self._board._set_masks
+        for i in range(HOUSE_SETS):
+            if owned_mask & set_masks[i] == set_masks[i]:
+                house_sets.append(SET_NAMES[i])
+        return house_sets
+
+    def owns_set(self, piece_loc):
+        """This function returns True if the active player owns every
+           property of the set of the given spot."""
+
+        set_mask = self._board._set_masks[self._board._sets[piece_loc]]
+        return self.player()._owned_mask & set_mask == set_mask
+
+    def buy_house(self, piece_loc):
+        """This function builds a house on the given property of the active
+           player."""
+
+        board = self._board
+        player = self.player()
+
+        # houses can only be bought once the player is done rolling, on a
+        # property of a set the player owns completely that doesn't already
+        # have all three houses:
+        if (self._state._phase != 'end' or board._kinds[piece_loc] != DEED or
+                self.get_ownership(piece_loc) != player._idnum or
+                not self.owns_set(piece_loc) or
+                self.get_houses(piece_loc) >= MAX_HOUSES):
+            return []
+
+        # checks if the player has enough money to buy:
+        house_cost = board._house_costs[piece_loc]
+        if player._money - house_cost > 0:
+            player._money -= house_cost
+            self._state._houses[piece_loc] += 1
+            return self._logged([('house', piece_loc)])
+        return self._logged([('cant buy house', piece_loc)])
+
+    def end_turn(self):
+        """This function ends the active player's turn and starts the next
+           player's turn."""
+
+        state = self._state
+        state._turn = state.next_turn()
+        state._roll_doubles = 0
+        state._same_roll = False
+        state._phase = 'roll'
+        state._turns += 1
+        return self._logged([('end turn', self.player()._idnum)])
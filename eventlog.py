@@ -0,0 +1,486 @@
+"""
+ *****************************************************************************
+   FILE:  eventlog.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This module records the events returned by
+                engine.GameEngine in a compact binary log and rebuilds the
+                GameState of a game from its log without the bots or the
+                rules. A log starts with the number of players and each
+                event is a code byte followed by its fields as varints (7
+                bits per byte, the high bit set on every byte but the
+                last) - amounts of money can be negative so they are
+                zigzag coded first (0, -1, 1, -2, ... as 0, 1, 2, 3, ...).
+                A roll or a move is a single byte, and the fields
+                that the state of the game already determines (the spot the
+                player is on, the owner of the spot, the card on top of the
+                deck) are left out. The logs of many games are kept in an
+                archive file by appending a frame for each game: its seed
+                (zigzag coded, as seeds can be negative), the length of its
+                log and the log.
+
+ *****************************************************************************
+"""
+
+import argparse
+import sys
+
+from engine import (CARD_TABLES, COLLECT, KEEP_JAIL_FREE, PAY, PAY_EACH,
+                    GameState, load_board)
+
+
+# the kinds of events in the order of their codes (roll and move events are
+# coded by ROLL_BASE and MOVE_BASE instead):
+EVENT_KINDS = ['roll', 'move', 'jail', 'jail free', 'jail free used', 'safe',
+               'player_owns', 'pay', 'cant buy', 'buy choice', 'tax choice',
+               'luxury', 'tax paid', 'chance', 'community', 'bankrupcy',
+               'buy', 'pass', 'house', 'cant buy house', 'end turn',
+               'shuffle']
+EVENT_CODES = dict((EVENT_KINDS[i], i) for i in range(len(EVENT_KINDS)))
+
+# a roll is coded as ROLL_BASE + 6 * (die1 - 1) + (die2 - 1) and a move as
+# MOVE_BASE + 2 * spot + passed_go:
+ROLL_BASE = 64
+MOVE_BASE = 128
+
+# the causes of a bankrupcy in the order of their codes:
+CAUSES = ['rent', 'luxury tax', 'income tax']
+
+# the card events in the order of engine.CARD_TABLES:
+CARD_EVENTS = ['chance', 'community']
+
+# the phase each event leaves the turn in - the other events finish the
+# action of a spot, leaving the phase 'roll' if the player rolled doubles
+# and 'end' if not:
+EVENT_PHASES = {'buy choice': 'buy', 'tax choice': 'tax',
+                'jail free': 'jail free', 'end turn': 'roll'}
+
+
+def write_varint(out, value):
+    """This function appends the varint of a value that is 0 or more to the
+       bytearray."""
+
+    while value >= 0x80:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def write_signed(out, value):
+    """This function appends the zigzag varint of a value that can be
+       negative to the bytearray."""
+
+    if value < 0:
+        write_varint(out, -2 * value - 1)
+    else:
+        write_varint(out, 2 * value)
+
+
+def read_signed(data, pos):
+    """This function reads the zigzag varint starting at pos in the bytes
+       and returns its value and the position after it."""
+
+    value, pos = read_varint(data, pos)
+    if value & 1:
+        return -(value + 1) // 2, pos
+    return value // 2, pos
+
+
+def read_varint(data, pos):
+    """This function reads the varint starting at pos in the bytes and
+       returns its value and the position after it."""
+
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class EventLog(object):
+    """This class is the append-only log of one game of num_players
+       players. Given to a GameEngine, it records the events of every
+       action."""
+
+    __slots__ = ('_data',)
+
+    # the constructor for the EventLog class:
+    def __init__(self, num_players=2):
+
+        self._data = bytearray([num_players])
+
+    def record(self, events):
+        """This function appends the given list of events to the log."""
+
+        out = self._data
+        for event in events:
+            kind = event[0]
+
+            # packs rolls and moves into a single byte:
+            if kind == 'roll':
+                out.append(ROLL_BASE + 6 * (event[1] - 1) + event[2] - 1)
+                continue
+            if kind == 'move':
+                out.append(MOVE_BASE + 2 * event[1] + event[2])
+                continue
+
+            out.append(EVENT_CODES[kind])
+            if kind == 'pay':
+                write_signed(out, event[2])
+            elif kind == 'tax paid':
+                write_signed(out, event[1])
+            elif kind == 'bankrupcy':
+                out.append(CAUSES.index(event[1]))
+                write_signed(out, event[2])
+            elif kind == 'house' or kind == 'cant buy house':
+                out.append(event[1])
+            elif kind == 'shuffle':
+                out.append(event[1])
+                out.extend(event[2])
+
+    def getvalue(self):
+        """This function returns the log as bytes."""
+
+        return bytes(self._data)
+
+
+class Replay(object):
+    """This class rebuilds the GameState of a game from its log by applying
+       the change each event made, without rolling dice, drawing cards or
+       asking the bots for decisions. * The GameRandom of the game is not
+       part of the log"""
+
+    # the constructor for the Replay class:
+    def __init__(self, board, data):
+
+        self._board = board
+        self._data = data
+        self._pos = 1
+        self._state = GameState(data[0])
+
+    def next_event(self):
+        """This function decodes the next event of the log, filling in the
+           fields that the state determines."""
+
+        state = self._state
+        data = self._data
+        player = state._players[state._turn]
+        code = data[self._pos]
+        self._pos += 1
+
+        # unpacks rolls and moves:
+        if code >= MOVE_BASE:
+            return ('move', (code - MOVE_BASE) >> 1, bool(code & 1))
+        if code >= ROLL_BASE:
+            return ('roll', (code - ROLL_BASE) // 6 + 1,
+                    (code - ROLL_BASE) % 6 + 1)
+
+        kind = EVENT_KINDS[code]
+        if kind == 'pay':
+            amount, self._pos = read_signed(data, self._pos)
+            return ('pay', player._piece_loc, amount,
+                    state._owned[player._piece_loc])
+        elif kind == 'tax paid':
+            amount, self._pos = read_signed(data, self._pos)
+            return ('tax paid', amount)
+        elif kind in ('player_owns', 'cant buy', 'buy choice', 'buy',
+                      'pass'):
+            return (kind, player._piece_loc)
+        elif kind == 'chance' or kind == 'community':
+            # the card is the top card of the deck:
+            deck_index = CARD_EVENTS.index(kind)
+            card = state._decks[deck_index][state._drawn[deck_index]]
+            return (kind, CARD_TABLES[deck_index]._names[card])
+        elif kind == 'bankrupcy':
+            cause = CAUSES[data[self._pos]]
+            money_lost, self._pos = read_signed(data, self._pos + 1)
+            return ('bankrupcy', cause, money_lost)
+        elif kind == 'house' or kind == 'cant buy house':
+            self._pos += 1
+            return (kind, data[self._pos - 1])
+        elif kind == 'end turn':
+            return ('end turn', state._players[state.next_turn()]._idnum)
+        elif kind == 'shuffle':
+            deck_index = data[self._pos]
+            start = self._pos + 1
+            self._pos = start + len(state._decks[deck_index])
+            return ('shuffle', deck_index, bytes(data[start:self._pos]))
+        return (kind,)
+
+    def apply(self, event):
+        """This function changes the state by what the event did."""
+
+        state = self._state
+        board = self._board
+        player = state._players[state._turn]
+        kind = event[0]
+
+        if kind == 'roll':
+            # keeps track of the doubles rolled in succession:
+            state._advance = event[1] + event[2]
+            if event[1] != event[2]:
+                state._same_roll = False
+            elif state._roll_doubles < 2:
+                state._roll_doubles += 1
+                state._same_roll = True
+            else:
+                state._same_roll = False
+
+        elif kind == 'move':
+            if event[2]:
+                player._money += 200
+            player._piece_loc = event[1]
+
+        elif kind == 'pay':
+            player._money -= event[2]
+            state._players[event[3] - 1]._money += event[2]
+
+        elif kind == 'buy':
+            piece_loc = event[1]
+            player._money -= board._prices[piece_loc]
+            state._owned[piece_loc] = player._idnum
+            player._properties.append(piece_loc)
+            player._owned_mask |= board._bits[piece_loc]
+
+        elif kind == 'house':
+            player._money -= board._house_costs[event[1]]
+            state._houses[event[1]] += 1
+
+        elif kind == 'end turn':
+            state._turn = state.next_turn()
+            state._roll_doubles = 0
+            state._same_roll = False
+            state._turns += 1
+
+        elif kind == 'chance' or kind == 'community':
+            # draws the top card and performs the part of its action that
+            # isn't an event of its own:
+            deck_index = CARD_EVENTS.index(kind)
+            table = CARD_TABLES[deck_index]
+            card = state._decks[deck_index][state._drawn[deck_index]]
+            state._drawn[deck_index] += 1
+            effect = table._effects[card]
+            if effect == COLLECT:
+                player._money += table._amounts[card]
+            elif effect == PAY:
+                player._money -= table._amounts[card]
+            elif effect == PAY_EACH:
+                amount = table._amounts[card]
+                player._money -= amount * (state._players_left - 1)
+                for other in state._players:
+                    if other is not player and not other._bankrupt:
+                        other._money += amount
+            elif effect == KEEP_JAIL_FREE:
+                player._jail_free = True
+
+        elif kind == 'shuffle':
+            state._decks[event[1]][:] = event[2]
+            state._drawn[event[1]] = 0
+
+        elif kind == 'jail':
+            player._piece_loc = 11
+            state._same_roll = False
+
+        elif kind == 'jail free':
+            state._same_roll = False
+
+        elif kind == 'jail free used':
+            player._jail_free = False
+            state._same_roll = False
+
+        elif kind == 'luxury':
+            player._money -= 200
+
+        elif kind == 'tax paid':
+            player._money -= event[1]
+
+        elif kind == 'bankrupcy':
+            # takes the player out of the game, which also sets the phase:
+            player._money -= event[2]
+            state._bankrupcy_cause = event[1]
+            state.eliminate(state._turn)
+            return
+
+        # determines the phase the event leaves the turn in:
+        phase = EVENT_PHASES.get(kind)
+        if phase is None:
+            phase = 'roll' if state._same_roll else 'end'
+        state._phase = phase
+
+    def events(self):
+        """This function applies the events of the log one at a time and
+           yields each one after it is applied."""
+
+        while self._pos < len(self._data):
+            event = self.next_event()
+            self.apply(event)
+            yield event
+
+    def run(self):
+        """This function applies every event of the log and returns the
+           rebuilt GameState."""
+
+        state = self._state
+        data = self._data
+
+        while self._pos < len(data):
+            code = data[self._pos]
+
+            # applies moves and rolls without building their events since
+            # they are the most common:
+            if code >= MOVE_BASE:
+                self._pos += 1
+                player = state._players[state._turn]
+                if code & 1:
+                    player._money += 200
+                player._piece_loc = (code - MOVE_BASE) >> 1
+                state._phase = 'roll' if state._same_roll else 'end'
+            elif code >= ROLL_BASE:
+                self._pos += 1
+                die1, die2 = divmod(code - ROLL_BASE, 6)
+                state._advance = die1 + die2 + 2
+                if die1 != die2:
+                    state._same_roll = False
+                elif state._roll_doubles < 2:
+                    state._roll_doubles += 1
+                    state._same_roll = True
+                else:
+                    state._same_roll = False
+                state._phase = 'roll' if state._same_roll else 'end'
+            else:
+                self.apply(self.next_event())
+        return state
+
+
+def replay(board, data):
+    """This function returns the GameState rebuilt from the log of a game
+       played on the given BoardTable."""
+
+    return Replay(board, data).run()
+
+
+def write_game(outfile, seed, data):
+    """This function appends the frame of a game (its seed, the length of
+       its log and the log) to the archive file opened for binary
+       writing."""
+
+    frame = bytearray()
+    write_signed(frame, seed)
+    write_varint(frame, len(data))
+    outfile.write(bytes(frame) + data)
+
+
+def read_games(filename):
+    """This function yields the seed and log of every game in the archive
+       file. * The logs are skipped over without being decoded"""
+
+    with open(filename, 'rb') as infile:
+        data = infile.read()
+
+    pos = 0
+    while pos < len(data):
+        seed, pos = read_signed(data, pos)
+        length, pos = read_varint(data, pos)
+        yield seed, data[pos:pos + length]
+        pos += length
+
+
+def find_game(filename, seed):
+    """This function returns the log of the game with the given seed in the
+       archive file, or None if it isn't there."""
+
+    for game_seed, data in read_games(filename):
+        if game_seed == seed:
+            return data
+    return None
+
+
+def check_logs(board, num_games, first_seed=0):
+    """This function checks the log format: amounts of money of both signs
+       must be read back as they were written, and the GameState rebuilt
+       from the log of each of num_games games must end like the game. It
+       returns a list of the problems found."""
+
+    # simulate uses this module to record its games:
+    from simulate import play_game
+
+    problems = []
+    for value in (0, 1, -1, 63, -64, 64, -65, 200, -4, -45, 1 << 40,
+                  -(1 << 40)):
+        out = bytearray()
+        write_signed(out, value)
+        if read_signed(out, 0) != (value, len(out)):
+            problems.append('amount %d is read back wrong' % value)
+
+    for seed in range(first_seed, first_seed + num_games):
+        result = play_game(board, seed, record=True)
+        state = replay(board, result['log'])
+        if (state._turns != result['turns'] or
+                (state._winner or 0) != result['winner'] or
+                [player._money for player in state._players] !=
+                result['money']):
+            problems.append('game %d is replayed wrong' % seed)
+    return problems
+
+
+def main():
+    """This function prints the events and the final state of one game from
+       an archive file written by simulate.py --log, or checks the log
+       format on games it plays."""
+
+    parser = argparse.ArgumentParser(description='Replay a game from an '
+                                                 'archive of event logs.')
+    parser.add_argument('archive', nargs='?',
+                        help='file written by simulate.py --log')
+    parser.add_argument('seed', type=int, nargs='?',
+                        help='seed of the game to replay')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    parser.add_argument('--events', action='store_true',
+                        help='also print every event')
+    parser.add_argument('--check', type=int, default=0, metavar='GAMES',
+                        help='instead, check the log format on this many '
+                             'games')
+    parser.add_argument('--first-seed', type=int, default=0,
+                        help='seed of the first game checked')
+    args = parser.parse_args()
+
+    if args.check > 0:
+        problems = check_logs(load_board(args.board), args.check,
+                              args.first_seed)
+        for problem in problems:
+            sys.stdout.write(problem + '\n')
+        sys.stdout.write('%d problems\n' % len(problems))
+        sys.exit(1 if problems else 0)
+    if args.archive is None or args.seed is None:
+        parser.error('the archive and seed are required')
+
+    data = find_game(args.archive, args.seed)
+    if data is None:
+        sys.stderr.write('no game with seed %d\n' % args.seed)
+        sys.exit(1)
+
+    game = Replay(load_board(args.board), data)
+    for event in game.events():
+        if args.events:
+            sys.stdout.write('%d %r\n' % (game._state._turns, event))
+
+    state = game._state
+    sys.stdout.write('log: %d bytes\n' % len(data))
+    sys.stdout.write('turns: %d\n' % state._turns)
+    sys.stdout.write('winner: %s\n' % (state._winner or 0))
+    for player in state._players:
+        sys.stdout.write('player %d: $%d on spot %d, properties %s\n' %
+                         (player._idnum, player._money, player._piece_loc,
+                          sorted(player._properties)))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,19 +15,72 @@
  *****************************************************************************
 """
 
+import argparse
+import atexit
+import time
+
+import snapshot
 from cs110graphics import *
-import random
-import json
+from engine import GameEngine, count_bits, load_board
+from profiling import PhaseProfiler
+
+
+# the properties of each set that houses can be built on, with the center
+# of the button that builds a house on each:
+HOUSE_BUTTONS = {'brown': ((2, (580, 600)), (4, (465, 600))),
+                 'lt blue': ((7, (290, 600)), (9, (180, 600)),
+                             (10, (120, 600))),
+                 'pink': ((12, (100, 580)), (14, (100, 465)),
+                          (15, (100, 410))),
+                 'orange': ((17, (100, 290)), (19, (100, 180)),
+                            (20, (100, 120))),
+                 'red': ((22, (120, 100)), (24, (235, 100)),
+                         (25, (290, 100))),
+                 'yellow': ((27, (410, 100)), (28, (465, 100)),
+                            (30, (580, 100))),
+                 'green': ((32, (600, 120)), (33, (600, 180)),
+                           (35, (600, 290))),
+                 'dk blue': ((38, (600, 465)), (40, (600, 580)))}
+
+
+def _house_spots():
+    """This function returns the centers of the houses of each property as
+       a tuple indexed by the property's spot (1 to 40) of a tuple with the
+       center of its first, second and third house (empty for spots that
+       can't have houses)."""
+
+    spots = [()] * 41
+    for set_typ in HOUSE_BUTTONS:
+        for piece_loc, center in HOUSE_BUTTONS[set_typ]:
+            x, y = center
+            # the houses are in a row along the outer edge of the board,
+            # starting at the side nearest to "GO":
+            if y == 600:
+                spots[piece_loc] = ((x + 15, 620), (x, 620), (x - 15, 620))
+            elif x == 100:
+                spots[piece_loc] = ((80, y + 15), (80, y), (80, y - 15))
+            elif y == 100:
+                spots[piece_loc] = ((x - 15, 80), (x, 80), (x + 15, 80))
+            else:
+                spots[piece_loc] = ((620, y - 15), (620, y), (620, y + 15))
+    return tuple(spots)
+
+
+# the centers of the houses of each property - the same for every game so
+# they are never changed:
+HOUSE_SPOTS = _house_spots()
 
 
 class GameManager(EventHandler):
     """This class manages almost all other classes in the game. The primary
        functions of this class is to start the Board and GamePieces classes,
        add the starting popup window, create players, and start and end
-       turns."""
+       turns. The rules of the game are performed by a GameEngine - this class
+       shows the events returned by the engine one popup at a time. * A game
+       can be saved to a snapshot after every turn and continued from one"""
 
     # the constructor for the GameManager class:
-    def __init__(self, win):
+    def __init__(self, win, save_file=None, resume=None):
 
         # call the EventHandler parent class so that methods belonging to
         # that class are accessible:
@@ -35,11 +88,19 @@ class GameManager(EventHandler):
 
         self._win = win
 
+        # the file the game is saved to after every turn (or None) and the
+        # (GameState, GameRandom) of a saved game to continue (or None):
+        self._save_file = save_file
+        self._resume = resume
+
         # starts Board and GamePieces classes:
         self._board = Board(self._win)
         self._game_pieces = GamePieces(self._win, self)
         self._houses = Houses(self._win, self)
 
+        # keeps the popup windows that can be reused:
+        self._pop_ups = PopUpPool(self._win, self)
+
         # initializes the list of player tokens and starts the game opening
         # popup window:
         self._player_characters = []
@@ -51,90 +112,206 @@ class GameManager(EventHandler):
            Players are created using the token choices made in the _start_win.
            The play_turn() function is called with _player1 playing first."""
 
+        # starts the rules engine (continuing the saved game, if there is
+        # one) and the list of events waiting to be shown:
+        if self._resume is not None:
+            state, rng = self._resume
+            self._engine = GameEngine(self._board._table, rng, state)
+        else:
+            self._engine = GameEngine(self._board._table)
+        self._events = []
+        self._houses.show_game(self)
+
+        # creates the text showing whose turn it is and their money:
+        self._hud = Hud(self._win)
+
         # makes players:
         self._player1 = Player(self._win, self._game_pieces,
                                self._player_characters[0],
-                               self._board, 1)
+                               self._board, 1, self._engine._state._players[0])
         self._player2 = Player(self._win, self._game_pieces,
                                self._player_characters[1],
-                               self._board, 2)
+                               self._board, 2, self._engine._state._players[1])
         self._all_players = [self._player1, self._player2]
+        for player in self._all_players:
+            player.show_deeds()
 
-        # starts first turn:
-        self.play_turn(self._player1, self._player2)
-
-    def play_turn(self, player, other):
+        # creates the objects used on every turn once for the whole game -
+        # each turn only resets them:
+        self._buy_prop = BuyProperty(self._win, None, None, self)
+        self._die1 = Die(self._win, (1075, 90))
+        self._die2 = Die(self._win, (1125, 90))
+        self._die_handler = DieHandler(self._win, self._die1, self._die2,
+                                       self)
+        self._die1.add_handler(self._die_handler)
+        self._die2.add_handler(self._die_handler)
+        self.create_end_turn_button()
+
+        # starts first turn - a saved game may have been stopped in the
+        # middle of a turn, so the player is asked for their next action:
+        self.play_turn()
+        if self._engine._state._phase != 'roll':
+            self.prompt()
+
+    def play_turn(self):
         """This function performs all the components of a turn of Monopoly."""
 
         # _player is the active player for the turn and _other is the passive
         # player:
-        self._player = player
-        self._other = other
-
-        # initializes the number of successive doubles rolled by the player for
-        # this turn:
-        self._roll_doubles = 0
+        self._player = self._all_players[self._engine._state._turn]
+        self._other = self._all_players[1 - self._engine._state._turn]
 
         # displays whose turn it is, the player's money, and any properties
         # that the player may have:
-        self._player.display_player_title()
-        self._player.display_money()
+        self._hud.show_player(self._player)
         self._player.display_properties()
 
-        # starts the BuyProperty, Spots, and Cards classes:
-        self._buy_prop = BuyProperty(self._win, self._player, self._other,
-                                     self)
-        self._spots = Spots(self._win, self._player, self._buy_prop,
-                            self._board, self)
-        self._cards = Cards(self._win, self._player, self._other, self._board,
-                            self)
-        # creates the dice for game play and adds handlers to them:
-        self._die1 = Die(self._win, (1075, 90))
-        self._die2 = Die(self._win, (1125, 90))
-        self._die1.add_handler(DieHandler(self._win, self._die1, self._die2,
-                                          self._game_pieces, self._spots,
-                                          self._player, self,
-                                          self._roll_doubles))
-        self._die2.add_handler(DieHandler(self._win, self._die2, self._die1,
-                                          self._game_pieces, self._spots,
-                                          self._player, self,
-                                          self._roll_doubles))
+        # starts the turn of the BuyProperty class and the dice:
+        self._buy_prop.start_turn(self._player, self._other)
+        self._die_handler.start_turn()
 
-    def add_end_turn_button(self):
-        """This function adds an end turn button to the window."""
+    def end_game(self):
+        """This function disposes of the objects that were used on every turn
+           once the game is over."""
+
+        self._die_handler.dispose()
+        if self._end_turn_shown:
+            self.remove_end_turn_button()
+
+    def show_events(self, events):
+        """This function adds the events returned by the rules engine to the
+           events waiting to be shown and starts showing them."""
+
+        self._events.extend(events)
+        self.next_event()
+
+    def next_event(self):
+        """This function shows the events waiting to be shown until one of
+           them opens a popup window. Once every event has been shown, the
+           player is asked for their next action. * Called again whenever a
+           popup window is closed"""
+
+        # updates the player's money on the window:
+        self._hud.update_money()
+
+        while len(self._events) > 0:
+            event = self._events.pop(0)
+            # stops until the popup window for the event is closed:
+            if self.show_event(event):
+                return
+
+        self.prompt()
+
+    def show_event(self, event):
+        """This function shows a single event from the rules engine. It
+           returns True if a popup window was opened for the event."""
+
+        kind = event[0]
+
+        if kind == 'move':
+            # moves the player's token to its new spot:
+            self._game_pieces.move_piece(self._player)
+            return False
+
+        elif kind == 'jail':
+            # moves the player's token to the jail board spot and tells the
+            # player that they were thrown in jail:
+            self._player._player_piece.move_to(self._board._locations[41])
+            jail_win = self._pop_ups.open(self._player)
+            jail_win.jail()
+
+        elif kind == 'safe':
+            self._buy_prop.safe()
+
+        elif kind == 'player_owns':
+            self._buy_prop.already_own()
+
+        elif kind == 'pay':
+            self._buy_prop.pay(event[1], event[2], event[3])
+
+        elif kind == 'cant buy':
+            self._buy_prop.cant_buy(event[1])
+
+        elif kind == 'luxury':
+            self._buy_prop.luxury_tax()
+
+        elif kind == 'chance':
+            card_win = self._pop_ups.open(self._player)
+            card_win.chance(event[1])
+
+        elif kind == 'community':
+            card_win = self._pop_ups.open(self._player)
+            card_win.community(event[1])
+
+        else:
+            # the rest of the events are shown by prompt() or need no popup
+            # window:
+            return False
+
+        return True
+
+    def prompt(self):
+        """This function asks the player for their next action based on the
+           phase of the turn."""
+
+        phase = self._engine._state._phase
+
+        if phase == 'buy':
+            # the player chooses whether or not to buy the property:
+            self._buy_prop.buy()
+
+        elif phase == 'tax':
+            # the player chooses which Income Tax payment to make:
+            self._buy_prop.income_tax()
+
+        elif phase == 'jail free':
+            # the player chooses if they would like to use their "Jail Free"
+            # card:
+            jail_free_win = self._pop_ups.open(self._player)
+            jail_free_win.jail_free_choice()
+
+        elif phase == 'over':
+            # the player must declare bankrupcy:
+            self._buy_prop.bankrupcy()
+
+        elif phase == 'roll':
+            # the player rolled doubles and can roll again:
+            pop_up = self._pop_ups.open(None)
+            pop_up.roll_again()
+
+        elif phase == 'end':
+            self.add_end_turn_button()
+
+    def create_end_turn_button(self):
+        """This function creates the end turn button that is added to the
+           window at the end of each turn."""
 
         # creates the body of the button:
         self._end_turn_button = Rectangle(self._win, 70, 40, (1155, 30))
         self._end_turn_button.set_depth(2)
         self._end_turn_button.set_fill_color('red')
-        self._win.add(self._end_turn_button)
 
         # creates the text inside the button:
         self._end_turn_text = Text(self._win, 'END TURN', 8, (1155, 30))
         self._end_turn_text.set_depth(1)
-        self._win.add(self._end_turn_text)
 
         # adds handlers to the body and text of the button:
         self._end_turn_button.add_handler(self)
         self._end_turn_text.add_handler(self)
+        self._end_turn_shown = False
+
+    def add_end_turn_button(self):
+        """This function adds the end turn button to the window."""
+
+        self._end_turn_button.set_border_color('black')
+        self._win.add(self._end_turn_button)
+        self._win.add(self._end_turn_text)
+        self._end_turn_shown = True
 
-        # initiates the player's ability to buy a house as False:
-        self._can_buy_house = False
-        # initiates the different sets of properties that a player has
-        # complete:
-        house_sets = []
-
-        # looks through all the different property sets:
-        for prop_set in self._player._prop_kinds:
-            # checks if the player has all the deeds in the set:
-            if (self._player._prop_kinds
-                    [prop_set]['have']) == (self._player._prop_kinds
-                                            [prop_set]['max']):
-                # changes the player's ability to buy a house to True:
-                self._can_buy_house = True
-                # appends the name of the set that the player has a monopoly
-                # on and adds it to house_sets
-                house_sets.append(prop_set)
+        # finds the different sets of properties that the player has complete
+        # - the player can buy houses if there are any:
+        house_sets = self._engine.house_sets()
+        self._can_buy_house = len(house_sets) > 0
 
         # if the player has the ability to buy houses, calls the function
         # Houses.display_house_buttons:
@@ -146,6 +323,7 @@ class GameManager(EventHandler):
 
         self._win.remove(self._end_turn_button)
         self._win.remove(self._end_turn_text)
+        self._end_turn_shown = False
 
     def handle_mouse_enter(self):
         """This function changes the button's body color to red when the player
@@ -161,22 +339,34 @@ class GameManager(EventHandler):
 
     def handle_mouse_release(self):
         """This function ends the player's turn by removing player-specific
-           information (buy house buttons, money, properties, and title), the
-           dice, and the end turn button itself. It also starts a new turn with
-           the players in the active and passive playing positions switching
-           roles."""
+           information (buy house buttons and properties) and the end turn
+           button itself. It also starts a new turn with the players in the
+           active and passive playing positions switching roles - the title,
+           money text and dice are reset by the new turn. While the phases
+           are timed, the timings so far are written after every turn."""
+
+        self.end_turn()
+
+        # saves the game at the start of the next turn:
+        if self._save_file is not None:
+            snapshot.save(self._save_file, self._engine._state,
+                          self._engine._rng)
+
+        # keeps the profile up to date while the game runs (the write is
+        # outside end_turn so it isn't timed as part of ending the turn):
+        if PROFILE_FILE is not None:
+            write_profile(PROFILE_FILE)
+
+    def end_turn(self):
+        """This function ends the active player's turn and starts the next
+           one."""
 
         if self._can_buy_house:
             self._houses.remove_house_buttons()
-        self._player.remove_money()
         self._player.remove_properties()
-        self._player.remove_player_title()
-        self._die1.remove_die()
-        self._die1.remove_pips_from_win()
-        self._die2.remove_die()
-        self._die2.remove_pips_from_win()
         self.remove_end_turn_button()
-        self.play_turn(self._other, self._player)
+        self._engine.end_turn()
+        self.play_turn()
 
 
 class Board(object):
@@ -233,12 +423,86 @@ class Board(object):
                            37: (660, 410), 38: (660, 465), 39: (660, 525),
                            40: (660, 580), 41: (60, 640)}
 
-        # loads a dictionary from the file 'dicts.json' - the dictionary
-        # includes information about each spot (type of spot - deed, chance,
-        # Go to Jail, etc; prices; rent; etc.), dictionary keys correspond to
-        # the keys of _locations:
-        with open('dicts.json', 'r') as infile:
-            self._properties = json.load(infile)
+        # loads the information about each spot from the file 'dicts.json'
+        # (type of spot - deed, chance, Go to Jail, etc; prices; rent; etc.)
+        # compiled into a BoardTable indexed like _locations - the compiled
+        # board is cached so it is only built once:
+        self._table = load_board('dicts.json')
+
+
+class HitIndex(object):
+    """This class finds which of the registered rectangular regions of the
+       window a click is in. The window is split into a grid of square cells
+       and each cell lists the regions that overlap it, so a click is only
+       checked against the few regions in its own cell."""
+
+    # the constructor for the HitIndex class:
+    def __init__(self, cell_size=50):
+
+        self._cell_size = cell_size
+
+        # the targets whose region overlaps each cell, keyed by the column
+        # and row of the cell, and the region (left, top, right, bottom) of
+        # each target:
+        self._cells = {}
+        self._regions = {}
+
+    def cells(self, region):
+        """This function returns the (column, row) of every cell the given
+           region overlaps."""
+
+        size = self._cell_size
+        left, top, right, bottom = region
+        cells = []
+        for column in range(int(left // size), int(right // size) + 1):
+            for row in range(int(top // size), int(bottom // size) + 1):
+                cells.append((column, row))
+        return cells
+
+    def register(self, center, width, height, target):
+        """This function adds the region with the given center, width and
+           height - clicks inside it are found as the given target."""
+
+        region = (center[0] - width / 2, center[1] - height / 2,
+                  center[0] + width / 2, center[1] + height / 2)
+        self._regions[target] = region
+        for cell in self.cells(region):
+            self._cells.setdefault(cell, []).append(target)
+
+    def register_all(self, regions):
+        """This function adds every (center, width, height, target) in the
+           given list of regions."""
+
+        for center, width, height, target in regions:
+            self.register(center, width, height, target)
+
+    def remove(self, target):
+        """This function removes the region of the given target."""
+
+        for cell in self.cells(self._regions.pop(target)):
+            self._cells[cell].remove(target)
+            if len(self._cells[cell]) == 0:
+                del self._cells[cell]
+
+    def remove_all(self, targets):
+        """This function removes the regions of all the given targets."""
+
+        for target in targets:
+            self.remove(target)
+
+    def find(self, location):
+        """This function returns the target of the region the given location
+           is in, or None if it isn't in any - the region registered last is
+           found if regions overlap."""
+
+        x = location[0]
+        y = location[1]
+        cell = (int(x // self._cell_size), int(y // self._cell_size))
+        for target in reversed(self._cells.get(cell, [])):
+            left, top, right, bottom = self._regions[target]
+            if left < x < right and top < y < bottom:
+                return target
+        return None
 
 
 class GamePieces(EventHandler):
@@ -273,6 +537,21 @@ class GamePieces(EventHandler):
                         'iron': {'file': 'iron.png', 'width': 40,
                                  'height': 35}}
 
+        # the center of each token in the starting popup window:
+        self._piece_centers = {'thimble': (450, 350),
+                               'wheelbarrow': (550, 350),
+                               'boot': (650, 350), 'boat': (750, 350),
+                               'car': (450, 450), 'dog': (550, 450),
+                               'hat': (650, 450), 'iron': (750, 450)}
+
+        # indexes the area of each token so that a click can be matched to
+        # the token it is on:
+        self._piece_hits = HitIndex()
+        for piece in self._pieces:
+            self._piece_hits.register(self._piece_centers[piece],
+                                      self._pieces[piece]['width'],
+                                      self._pieces[piece]['height'], piece)
+
     def display_pieces(self):
         """This function adds all the the potential game tokens to the
            window. * Only used in starting popup window as a way for
@@ -281,30 +560,37 @@ class GamePieces(EventHandler):
         # creates each token image:
         self._thimble = Image(self._win, self._pieces['thimble']['file'],
                               self._pieces['thimble']['width'],
-                              self._pieces['thimble']['height'], (450, 350))
+                              self._pieces['thimble']['height'],
+                              self._piece_centers['thimble'])
         self._wheelbarrow = Image(self._win,
                                   self._pieces['wheelbarrow']['file'],
                                   self._pieces['wheelbarrow']['width'],
                                   self._pieces['wheelbarrow']['height'],
-                                  (550, 350))
+                                  self._piece_centers['wheelbarrow'])
         self._boot = Image(self._win, self._pieces['boot']['file'],
                            self._pieces['boot']['width'],
-                           self._pieces['boot']['height'], (650, 350))
+                           self._pieces['boot']['height'],
+                           self._piece_centers['boot'])
         self._boat = Image(self._win, self._pieces['boat']['file'],
                            self._pieces['boat']['width'],
-                           self._pieces['boat']['height'], (750, 350))
+                           self._pieces['boat']['height'],
+                           self._piece_centers['boat'])
         self._car = Image(self._win, self._pieces['car']['file'],
                           self._pieces['car']['width'],
-                          self._pieces['car']['height'], (450, 450))
+                          self._pieces['car']['height'],
+                          self._piece_centers['car'])
         self._dog = Image(self._win, self._pieces['dog']['file'],
                           self._pieces['dog']['width'],
-                          self._pieces['dog']['height'], (550, 450))
+                          self._pieces['dog']['height'],
+                          self._piece_centers['dog'])
         self._hat = Image(self._win, self._pieces['hat']['file'],
                           self._pieces['hat']['width'],
-                          self._pieces['hat']['height'], (650, 450))
+                          self._pieces['hat']['height'],
+                          self._piece_centers['hat'])
         self._iron = Image(self._win, self._pieces['iron']['file'],
                            self._pieces['iron']['width'],
-                           self._pieces['iron']['height'], (750, 450))
+                           self._pieces['iron']['height'],
+                           self._piece_centers['iron'])
 
         # lists all the tokens:
         self._all_pieces = [self._thimble, self._wheelbarrow, self._boot,
@@ -331,37 +617,13 @@ class GamePieces(EventHandler):
            Game class's attribute _player_characters and changes the popup
            window to display the player's choice."""
 
-        # gets location of the player's click:
-        x = event.get_mouse_location()[0]
-        y = event.get_mouse_location()[1]
-
         # based on the player's mouse location, a player's choice of token
         # is determined, added to Game._player_characters, and passed to
         # the popup window function PopUpWin.piece_picked()
-        if 435 < x < 465 and 330 < y < 370:
-            self._game._player_characters.append('thimble')
-            self._game._start_win.piece_picked('thimble')
-        if 530 < x < 570 and 338 < y < 362:
-            self._game._player_characters.append('wheelbarrow')
-            self._game._start_win.piece_picked('wheelbarrow')
-        if 630 < x < 670 and 330 < y < 370:
-            self._game._player_characters.append('boot')
-            self._game._start_win.piece_picked('boot')
-        if 735 < x < 765 and 330 < y < 370:
-            self._game._player_characters.append('boat')
-            self._game._start_win.piece_picked('boat')
-        if 430 < x < 470 and 435 < y < 465:
-            self._game._player_characters.append('car')
-            self._game._start_win.piece_picked('car')
-        if 530 < x < 570 and 430 < y < 470:
-            self._game._player_characters.append('dog')
-            self._game._start_win.piece_picked('dog')
-        if 630 < x < 670 and 435 < y < 465:
-            self._game._player_characters.append('hat')
-            self._game._start_win.piece_picked('hat')
-        if 730 < x < 770 and 430 < y < 470:
-            self._game._player_characters.append('iron')
-            self._game._start_win.piece_picked('iron')
+        piece = self._piece_hits.find(event.get_mouse_location())
+        if piece is not None:
+            self._game._player_characters.append(piece)
+            self._game._start_win.piece_picked(piece)
 
     def start_piece(self, piece, player, board):
         """This function creates the game piece for the given player."""
@@ -372,99 +634,82 @@ class GamePieces(EventHandler):
         self._piece = Image(self._win, self._pieces[piece]['file'],
                             self._pieces[piece]['width'],
                             self._pieces[piece]['height'],
-                            self._board._locations[player._piece_loc])
+                            self._board._locations[player._state._piece_loc])
         self._piece.set_depth(9)
 
-    def move_piece(self, player, advance, jail=False):
-        """Given the player and the number of spaces the token will advance,
-           this function moves the player's game token around the board."""
-
-        self._advance = advance
-        self._jail = jail
-
-        # determines the spot the player will move to by adding the value of
-        # the die roll to the player's current location:
-        self._move_piece_to = player._piece_loc + self._advance
-
-        # if the player moves all the way around the board (passes "GO"), $200
-        # is added to their money - the new money value is displayed:
-        if self._move_piece_to > 40:
-            player._money += 200
-            player.remove_money()
-            player.display_money()
-
-        # since there are only 40 spots on the board, keeps played on the board
-        # by modding by 40:
-        piece_loc = self._move_piece_to % 40
-        if piece_loc == 0:
-            piece_loc = 40
-
-        # checks if player is required to "Go to Jail":
-        if self._jail:
-            # checks if player has a get out of "Jail Free" card:
-            if player._jail_free:
-                # adds popup window and calls the function
-                # PopUpWin.jail_free_choice() - allows players to choose if
-                # they would like to use their "Jail Free" card
-                jail_free_win = PopUpWin(self._win, player, self._game)
-                jail_free_win.jail_free_choice()
-            else:
-                # sends player to jail by moving them to the jail board spot,
-                # setting the player's location to spot 11 ("Just Visiting")
-                # because the player's next roll will move from that spot,
-                # removing the dice with handlers and adding new dice that
-                # don't have handlers, adds the popup window, and
-                # calls the function PopUpWin.jail() - tells player that they
-                # were thrown in jail
-                player._player_piece.move_to(self._board._locations[41])
-                player.set_piece_loc(11)
-                self._game._die1.remove_die()
-                self._game._die2.remove_die()
-                self._game._die1.create_die()
-                self._game._die2.create_die()
-                jail_win = PopUpWin(self._win, player, self._game)
-                jail_win.jail()
-        else:
-            # moves player along board by changing their piece location and
-            # moving them to the window coordinates for the given spot listed
-            # in Board._locations:
-            player.set_piece_loc(piece_loc)
-            player._player_piece.move_to(self._board._locations
-                                         [player._piece_loc])
+    def move_piece(self, player):
+        """Given the player, this function moves the player's game token to
+           the spot the rules engine moved them to."""
+
+        # moves the token to the window coordinates for the given spot listed
+        # in Board._locations:
+        player._player_piece.move_to(self._board._locations
+                                     [player._state._piece_loc])
+
+
+class Hud(object):
+    """This class keeps the text on the window that changes during the game:
+       whose turn it is and the active player's money. The text objects are
+       created once and only their text is changed, and only when the value
+       shown is different."""
+
+    # the constructor for the Hud class:
+    def __init__(self, win):
+
+        self._win = win
+        self._player = None
+
+        # the text each text object is showing:
+        self._shown = {}
+
+        # creates the turn title text and adds it to the window:
+        self._player_title = Text(self._win, '', 25, (900, 20))
+        self._win.add(self._player_title)
+
+        # creates the money text and adds it to the window:
+        self._money_text = Text(self._win, '', 18, (1075, 205))
+        self._money_text.set_depth(1)
+        self._win.add(self._money_text)
+
+    def set_text(self, text_obj, text):
+        """This function changes the text shown by one of the text objects if
+           it isn't already showing it."""
+
+        if self._shown.get(text_obj) != text:
+            self._shown[text_obj] = text
+            text_obj.set_text(text)
+
+    def show_player(self, player):
+        """This function displays whose turn it is and their money."""
+
+        self._player = player
+        self.set_text(self._player_title, 'PLAYER ' + str(player._idnum) +
+                      "'S TURN")
+        self.update_money()
+
+    def update_money(self):
+        """This function displays the active player's current money value
+           after a property is bought, taxes are paid, etc."""
+
+        self.set_text(self._money_text, str(self._player._state._money))
 
 
 class Player(object):
-    """This class creates all the attributes specific to individual players
-       of Monopoly. It allows for changes made to a player's token location
-       and money value to be updated at any point of the game."""
+    """This class creates all the graphical objects specific to individual
+       players of Monopoly. The player's token location, money and
+       properties are kept by the rules engine in a PlayerState."""
 
     # the constructor of the Player class:
-    def __init__(self, win, game_pieces, piece, board, idx):
+    def __init__(self, win, game_pieces, piece, board, idx, state):
 
         self._win = win
         self._game_pieces = game_pieces
         self._piece = piece
         self._board = board
         self._idnum = idx
+        self._state = state
 
-        # initializes the player's token location, money, "Jail Free" card
-        # possession, owned properties (their board locations), dictionary of
-        # owned properties in each set, and dictionary of owned properties to
-        # be displayed:
-        self._piece_loc = 1
-        self._money = 1500
-        self._jail_free = False
-        self._properties = []
-        self._prop_kinds = {'brown': {'have': 0, 'max': 2},
-                            'lt blue': {'have': 0, 'max': 3},
-                            'pink': {'have': 0, 'max': 3},
-                            'orange': {'have': 0, 'max': 3},
-                            'red': {'have': 0, 'max': 3},
-                            'yellow': {'have': 0, 'max': 3},
-                            'green': {'have': 0, 'max': 3},
-                            'dk blue': {'have': 0, 'max': 2},
-                            'railroad': {'have': 0, 'max': 5},
-                            'utility': {'have': 0, 'max': 5}}
+        # initializes the dictionary of owned properties to be displayed:
         self._prop_display = {}
 
         # uses the GamePieces.start_piece() funtion to create the player's
@@ -476,42 +721,34 @@ class Player(object):
         self._player_piece = self._game_pieces._piece
         self._win.add(self._player_piece)
 
-    def set_piece_loc(self, piece_loc):
-        """This function allows for the player's token location to be redefined
-           at any point of the game."""
-
-        self._piece_loc = piece_loc
-
-    # the functions Player.display_money() and Player.remove_money() are often
-    # used together in this game in order to display a player's current money
-    # value after a property is bought, taxes are paid, etc.:
-    def display_money(self):
-        """This function allows for the player's money value to be displayed at
-           any point of the game."""
-
-        # creates the money text and adds it to the window:
-        self._money_text = Text(self._win, str(self._money), 18, (1075, 205))
-        self._money_text.set_depth(1)
-        self._win.add(self._money_text)
-
-    def remove_money(self):
-        """This function allows for the player's money value to be removed from
-           the window at any point of the game."""
-
-        self._win.remove(self._money_text)
-
-    def display_player_title(self):
-        """This function displays whose turn it is."""
-
-        # creates the turn title text and adds it to the window:
-        self._player_title = Text(self._win, 'PLAYER ' + str(self._idnum) +
-                                  "'S TURN", 25, (900, 20))
-        self._win.add(self._player_title)
-
-    def remove_player_title(self):
-        """This function removes the text that states whose turn it is."""
-
-        self._win.remove(self._player_title)
+    def add_deed(self, prop):
+        """Given the image of a property deed, this function shrinks it and
+           moves it to its place among the player's properties."""
+
+        # determines the number of deeds owned by the player:
+        num_of_deeds = len(self._prop_display) + 1
+        # scales down the size of the displayed property deed and sets the
+        # depth and moves it to the display window based on the number of
+        # deeds:
+        prop.scale(13 / 16)
+        prop.set_depth(30 - num_of_deeds)
+        if num_of_deeds <= 8:
+            prop.move_to((780, 415 + (25 * (num_of_deeds - 1))))
+        elif 8 < num_of_deeds <= 16:
+            prop.move_to((920, 415 + (25 * (num_of_deeds - 9))))
+        elif 16 < num_of_deeds <= 24:
+            prop.move_to((1060, 415 + (25 * (num_of_deeds - 17))))
+        # adds the property to the the player's _prop_display dictionary:
+        self._prop_display[num_of_deeds] = prop
+
+    def show_deeds(self):
+        """This function creates the deeds of the properties the player
+           already owns when a saved game is continued."""
+
+        for piece_loc in self._state._properties:
+            prop = Image(self._win, self._board._table._images[piece_loc],
+                         160, 200, (800, 170))
+            self.add_deed(prop)
 
     def display_properties(self):
         """This function displays all the properties that a player owns."""
@@ -520,7 +757,7 @@ class Player(object):
         if len(self._prop_display.keys()) != 0:
             # for each property that is owned, the corresponding deed card is
             # displayed:
-            for i in range(1, len(self._properties) + 1):
+            for i in range(1, len(self._state._properties) + 1):
                 self._win.add(self._prop_display[i])
 
     def remove_properties(self):
@@ -531,7 +768,7 @@ class Player(object):
         if len(self._prop_display.keys()) != 0:
             # for each owned property, the corresponding deed card is removed
             # from the window:
-            for i in range(1, len(self._properties) + 1):
+            for i in range(1, len(self._state._properties) + 1):
                 self._win.remove(self._prop_display[i])
 
 
@@ -567,19 +804,20 @@ class Die(object):
                                  (self._center[0], self._center[1] - 14),
                                  (self._center[0], self._center[1] + 14)]}
 
-        # initializes _pip_center attribute as 1 pip:
-        self._pip_center = self._pip_centers[1]
+        # the pips of each face, created the first time the face is shown - a
+        # face is shown by adding its pips to the window and hidden by
+        # removing them:
+        self._faces = {}
 
-        # creates the die body and pips and adds the pips to the window:
+        # the die can be rolled until it is disabled:
+        self._enabled = True
+
+        # creates the die body and shows 1 pip:
+        self._face = 1
+        self._pips = self.face_pips(1)
         self.create_die()
         self.create_pips()
 
-    # because a handler is added to the die body, the functions
-    # Die.create_die() and Die.remove_die() are often used together throughout
-    # the game in order to make sure the player cannot roll after they have
-    # completed their rolls for the turn - once the player cannot roll, the die
-    # with the handler is removed and a new die (that cannot be rolled) is
-    # added to preserve the aesthetic:
     def create_die(self):
         """This function creates the die body and adds it to the window."""
 
@@ -595,19 +833,9 @@ class Die(object):
         self._win.remove(self._die)
 
     def create_pips(self):
-        """This function creates the pips for the die."""
+        """This function adds the pips of the face the die shows to the
+           window."""
 
-        # initializes the list of pips created:
-        self._pips = []
-        # creates a pip for each center in _pip_center:
-        for center in self._pip_center:
-            self._pip = Circle(self._win, 3, center)
-            self._pip.set_fill_color('black')
-            self._pip.set_border_color('black')
-            self._pip.set_depth(1)
-            self._pips.append(self._pip)
-
-        # adds pips to the window:
         for pip in self._pips:
             self._win.add(pip)
 
@@ -617,6 +845,60 @@ class Die(object):
         for pip in self._pips:
             self._win.remove(pip)
 
+    def face_pips(self, face):
+        """This function returns the pips of the face with the given number of
+           pips, creating them if the face hasn't been shown before."""
+
+        if face not in self._faces:
+            pips = []
+            for center in self._pip_centers[face]:
+                pip = Circle(self._win, 3, center)
+                pip.set_fill_color('black')
+                pip.set_border_color('black')
+                pip.set_depth(1)
+                pips.append(pip)
+            self._faces[face] = pips
+        return self._faces[face]
+
+    def reset(self):
+        """This function shows 1 pip and lets the die be clicked again for a
+           new turn."""
+
+        self.show_face(1)
+        self.enable()
+
+    def dispose(self):
+        """This function removes the die from the window for good."""
+
+        self.remove_die()
+        self.remove_pips_from_win()
+        self._faces = {}
+        self._pips = []
+
+    def show_face(self, face):
+        """This function changes the face the die shows to the given number of
+           pips."""
+
+        if face != self._face:
+            self.remove_pips_from_win()
+            self._face = face
+            self._pips = self.face_pips(face)
+            self.create_pips()
+
+    # the handler stays on the die body for the whole turn - the die is
+    # disabled once the player has completed their rolls for the turn so that
+    # clicking it does nothing:
+    def enable(self):
+        """This function lets the die be clicked to roll."""
+
+        self._enabled = True
+
+    def disable(self):
+        """This function stops the die from being clicked to roll."""
+
+        self._enabled = False
+        self._die.set_border_color('black')
+
     def add_handler(self, handler):
         """This function adds the handler to the die."""
 
@@ -625,12 +907,11 @@ class Die(object):
 
 class DieHandler(EventHandler):
     """This class is the handler for the Die class. It allows for each die to
-       be rolled together and calls for the piece to be moved and the action
-       for the spot the player landed on to be performed."""
+       be rolled together and has the rules engine move the player and
+       perform the action for the spot the player landed on."""
 
     # the constructor for the DieHandler class
-    def __init__(self, win, die1, die2, game_pieces, spots, player, game,
-                 roll_doubles):
+    def __init__(self, win, die1, die2, game):
 
         # calls the EventHandler parent class so that methods belonging to
         # that class are accessible:
@@ -639,17 +920,29 @@ class DieHandler(EventHandler):
         self._win = win
         self._die1 = die1
         self._die2 = die2
-        self._game_pieces = game_pieces
-        self._spots = spots
-        self._player = player
         self._game = game
-        self._roll_doubles = roll_doubles
 
-        # initiates the die roll as not rigged, adds the secret button and its
-        # handler:
+        # initiates the die roll as not rigged and creates the secret button
+        # - it is added to the window by start_turn():
         self._rigged = False
-        self._secret_button = SecretButton(self._win)
-        self._secret_button.start_secret_button(self)
+        self._secret_button = SecretButton(self._win, self)
+
+    def start_turn(self):
+        """This function resets the dice and the secret button for a new
+           turn."""
+
+        self._rigged = False
+        self._die1.reset()
+        self._die2.reset()
+        self._secret_button.start_secret_button()
+
+    def dispose(self):
+        """This function removes the dice and the secret button from the
+           window once the game is over."""
+
+        self._die1.dispose()
+        self._die2.dispose()
+        self._secret_button.end_secret_button()
 
     def set_die_roll(self, die1, die2):
         """This sets the die roll based on the inputted value."""
@@ -662,8 +955,9 @@ class DieHandler(EventHandler):
         """This function changes the button's body color to red when the player
            puts the mouse on the button."""
 
-        self._die1._die.set_border_color('red')
-        self._die2._die.set_border_color('red')
+        if self._die1._enabled:
+            self._die1._die.set_border_color('red')
+            self._die2._die.set_border_color('red')
 
     def handle_mouse_leave(self):
         """This function changes the button's body color to black when the
@@ -675,67 +969,39 @@ class DieHandler(EventHandler):
     def handle_mouse_release(self):
         """This function handles what happends when the die is clicked."""
 
-        # checks if game is rigged:
-        if self._rigged is False:
+        self.roll()
 
-            # rolls each dice by finding a random number between 1 and 6:
-            self._die1_roll = random.randint(1, 6)
-            self._die2_roll = random.randint(1, 6)
+    def roll(self):
+        """This function has the rules engine roll the dice for the active
+           player and shows what happened."""
 
+        engine = self._game._engine
+
+        # the dice can only be rolled when the player is allowed to roll:
+        if not self._die1._enabled or engine._state._phase != 'roll':
+            return
+
+        # checks if game is rigged - if it isn't, the rules engine rolls the
+        # dice:
+        if self._rigged:
+            events = engine.roll(self._die1_roll, self._die2_roll)
+        else:
+            events = engine.roll()
         self._rigged = False
 
-        # changes each die's _pip_center based on the die roll:
-        self._die1._pip_center = self._die1._pip_centers[self._die1_roll]
-        self._die2._pip_center = self._die2._pip_centers[self._die2_roll]
-
-        # takes pips off the window and adds new pips from the latest die roll:
-        self._die1.remove_pips_from_win()
-        self._die2.remove_pips_from_win()
-        self._die1.create_pips()
-        self._die2.create_pips()
-
-        # determines the number of spaces the player will advance based on
-        # their roll:
-        self._advance = self._die1_roll + self._die2_roll
-
-        # checks if the player rolled doubles:
-        if self._die1_roll != self._die2_roll:
-            # if player doesn't roll doubles, the die body is removed and added
-            # again:
-            self._die1.remove_die()
-            self._die2.remove_die()
-            self._die1.create_die()
-            self._die2.create_die()
-            self._secret_button.end_secret_button()
-            # calls the function GamePieces.move_piece() to move player token:
-            self._game_pieces.move_piece(self._player, self._advance)
-            # calls the function Spots.spot_action() to perform the action
-            # given to the spot that was landed on - the variable same_roll is
-            # False:
-            self._spots.spot_action(False, self._advance)
-
-        elif self._die1_roll == self._die2_roll and self._roll_doubles < 2:
-            # if the player rolls doubles and has gotten doubles less than two
-            # times in succession, increases the _roll_doubles count by 1:
-            self._roll_doubles += 1
-            # calls the function GamePieces.move_piece() to move player token:
-            self._game_pieces.move_piece(self._player, self._advance)
-            # calls the function Spots.spot_action() to perform the action
-            # given to the spot that was landed on - the variable same_roll is
-            # True:
-            self._spots.spot_action(True, self._advance)
-
-        elif self._die1_roll == self._die2_roll and self._roll_doubles == 2:
-            # if the player rolls doubles and has rolled doubles twice before
-            # in succession, the die body is removed and added again:
-            self._die1.remove_die()
-            self._die2.remove_die()
-            self._die1.create_die()
-            self._die2.create_die()
+        # shows the face of each die from the latest die roll:
+        self._die1.show_face(events[0][1])
+        self._die2.show_face(events[0][2])
+
+        # checks if the player can't roll again this turn:
+        if not engine._state._same_roll:
+            # the dice can't be clicked again this turn:
+            self._die1.disable()
+            self._die2.disable()
             self._secret_button.end_secret_button()
-            # calls the function GamePieces.move_piece() - GamePieces._jail
-            # is True:
-            self._game_pieces.move_piece(self._player, self._advance, True)
+
+        # shows what happened on the roll:
+        self._game.show_events(events)
 
 
 class SecretButton(EventHandler):
@@ -743,26 +1009,30 @@ class SecretButton(EventHandler):
        secretly input the value they want the die to show. (To cheat.)"""
 
     # constructor for the SecretButton class:
-    def __init__(self, win):
+    def __init__(self, win, diehandler):
 
         EventHandler.__init__(self)
         self._win = win
+        self._diehandler = diehandler
 
-        # creates the secret button off screen:
+        # creates the secret button off screen and adds its handler:
         self._secret_button = Rectangle(self._win, 1, 1, (1100, 0))
-
-    def start_secret_button(self, diehandler):
-        """This function adds the handler to the secret button."""
-
-        self._win.add(self._secret_button)
         self._secret_button.add_handler(self)
+        self._shown = False
 
-        self._diehandler = diehandler
+    def start_secret_button(self):
+        """This function adds the secret button to the window."""
+
+        if not self._shown:
+            self._win.add(self._secret_button)
+            self._shown = True
 
     def end_secret_button(self):
         """This function removes the secret button."""
 
-        self._win.remove(self._secret_button)
+        if self._shown:
+            self._win.remove(self._secret_button)
+            self._shown = False
 
     def handle_key_release(self, event):
         """This function determines what key was pressed and sends the
@@ -797,239 +1067,9 @@ class SecretButton(EventHandler):
             self._diehandler.set_die_roll(6, 6)
 
 
-class Spots(object):
-    """This class determines the type of spot that was landed on and performs
-       the actions specific to that spot."""
-
-    # the constructor for the Spots class:
-    def __init__(self, win, player, buy_prop, board, game):
-
-        self._win = win
-        self._player = player
-        self._buy_prop = buy_prop
-        self._properties = board._properties
-        self._game = game
-
-    def set_ownership(self, piece_loc, player_idnum):
-        """This function sets the owner of a property given the property's spot
-           number and the player's id number."""
-
-        self._properties[str(piece_loc)]['owned'] = player_idnum
-
-    def get_ownership(self, piece_loc):
-        """This function returns the owner of a specific property."""
-
-        return self._properties[str(piece_loc)]['owned']
-
-    def spot_action(self, same_roll, advance=0):
-        """This function determines the type of spot the player landed on and
-           performs the actions that go along with the spot."""
-
-        # determines the type of spot:
-        type_of_spot = self._properties[str(self._player._piece_loc)]['type']
-
-        # checks if the spot is a 'deed', 'utility', or 'railroad':
-        if type_of_spot == 'deed' or (type_of_spot == 'utility' or
-                                      type_of_spot == 'railroad'):
-            # adds image of the property deed to the window:
-            self._prop = Image(self._win,
-                               self._properties[str(self._player._piece_loc)]
-                               ['image info'], 160, 200, (800, 170))
-            self._prop.set_depth(1)
-            self._win.add(self._prop)
-
-            # checks if the property is not yet owned:
-            if self.get_ownership(self._player._piece_loc) == 0:
-                # subtracts the price of the property from the player's money
-                self._player._money -= (self._properties
-                                        [str(self._player._piece_loc)]
-                                        ['price'])
-
-                # checks if player has enough money to buy:
-                if self._player._money > 0:
-                    # calls the function BuyProperty.buy() so that the player
-                    # can choose whether or not to buy:
-                    self._buy_prop.buy(self._properties, self._prop, same_roll)
-
-                else:
-                    # adds prices of property back to player's money:
-                    self._player._money += (self._properties
-                                            [str(self._player._piece_loc)]
-                                            ['price'])
-                    # removes the deed image from the window:
-                    self._win.remove(self._prop)
-                    # calls the function BuyProperty.cant_buy() so that the
-                    # player is told they don't have enough money to buy:
-                    self._buy_prop.cant_buy(self._properties, same_roll)
-
-            # checks if the property is owned and it is not owned by the
-            # current player:
-            elif (self.get_ownership(self._player._piece_loc) != 0 and
-                  self.get_ownership(self._player._piece_loc) !=
-                  self._player._idnum):
-                # removes the deed image from the window:
-                self._win.remove(self._prop)
-
-                # checks if the type of spot is a 'deed':
-                if type_of_spot == 'deed':
-                    # determines the amount of rent the player must pay:
-                    money_lost = (self._properties
-                                  [str(self._player._piece_loc)]['rent']['0'])
-
-                    if self._properties[str(self._player._piece_loc)]['houses'] > 0:
-
-                        money_lost = (self._properties
-                                      [str(self._player._piece_loc)]
-                                      ['rent']
-                                      [str(self._properties
-                                           [str(self._player._piece_loc)]
-                                           ['houses'])])
-
-                    # checks if other player owns all of the properties in the
-                    # set:
-                    elif ((self._game._other._prop_kinds
-                         [self._properties[str(self._player._piece_loc)]
-                          ['set']]['have']) ==
-                        (self._game._other._prop_kinds
-                         [self._properties[str(self._player._piece_loc)]
-                          ['set']]['max'])):
-                        # doubles the money_lost
-                        money_lost = money_lost * 2
-
-                    # subtracts money_lost from the player's money:
-                    self._player._money -= money_lost
-
-                    # checks if the player doesn't have enough money to
-                    # pay rent:
-                    if self._player._money < 0:
-                        # calls the function BuyProperty.bankrupcy() so that
-                        # the player can declare bankrupcy:
-                        self._buy_prop.bankrupcy()
-
-                    else:
-                        # calls the function BuyProperty.pay() so that the
-                        # player can pay the rent:
-                        self._buy_prop.pay(self._properties, same_roll,
-                                           money_lost)
-
-                # checks if the type of spot is a 'utility':
-                elif type_of_spot == 'utility':
-                    # determines the amount of rent the player must pay:
-                    money_lost = (self._properties
-                                  [str(self._player._piece_loc)]['rent']
-                                  [str(self._game._other._prop_kinds
-                                       ['utility']['have'])] * advance)
-                    # subtracts money_lost from the player's money:
-                    self._player._money -= money_lost
-
-                    # checks if the player doesn't have enough money to
-                    # pay rent:
-                    if self._player._money < 0:
-                        # calls the function BuyProperty.bankrupcy() so that
-                        # the player can declare bankrupcy:
-                        self._buy_prop.bankrupcy()
-
-                    else:
-                        # calls the function BuyProperty.pay() so that the
-                        # player can pay the rent:
-                        self._buy_prop.pay(self._properties, same_roll,
-                                           money_lost, advance)
-
-                # chekcs if the type of spot is a 'railroad':
-                elif type_of_spot == 'railroad':
-                    # determines the amount of rent the player must pay:
-                    money_lost = (self._properties
-                                  [str(self._player._piece_loc)]['rent']
-                                  [str(self._game._other._prop_kinds
-                                       ['railroad']['have'])])
-                    # subtracts money_lost from the player's money:
-                    self._player._money -= money_lost
-
-                    # checks if the player doesn't have enough money to
-                    # pay rent:
-                    if self._player._money < 0:
-                        # calls the function BuyProperty.bankrupcy() so that
-                        # the player can declare bankrupcy:
-                        self._buy_prop.bankrupcy()
-
-                    else:
-                        # calls the function BuyProperty.pay() so that the
-                        # player can pay the rent:
-                        self._buy_prop.pay(self._properties, same_roll,
-                                           money_lost)
-
-            # checks if the player already owns the property:
-            elif (self.get_ownership(self._player._piece_loc) ==
-                  self._player._idnum):
-                # removes the property deed from the window:
-                self._win.remove(self._prop)
-                # calls the function BuyProperty.already_own() so that the
-                # player is notified that they already own the property:
-                self._buy_prop.already_own(same_roll)
-
-        # checks if the type of spot is a 'tax':
-        elif type_of_spot == 'tax':
-            # checks if the name of the property is "Income Tax":
-            if (self._properties[str(self._player._piece_loc)]
-                    ['name']) == 'Income Tax':
-                # calls the function BuyProperty.income_tax() so that the
-                # player can choose which payment to make:
-                self._buy_prop.income_tax(same_roll)
-
-            # checks if the name of the property is "Luxury Tax":
-            elif (self._properties
-                  [str(self._player._piece_loc)]['name']) == 'Luxury Tax':
-                # subtracts the luxury tax payment from player's money:
-                self._player._money -= 200
-
-                # checks if the player doesn't have enough money to
-                # pay the tax:
-                if self._player._money < 0:
-                    # calls the function BuyProperty.bankrupcy() so that
-                    # the player can declare bankrupcy:
-                    self._buy_prop.bankrupcy()
-
-                else:
-                    # adds and removes the player's money from the window to
-                    # display the most current values:
-                    self._player.remove_money()
-                    self._player.display_money()
-                    # calls the function BuyProperty.luxury_tax() so that the
-                    # player is notified they played a luxury tax:
-                    self._buy_prop.luxury_tax(same_roll)
-
-        # checks if the type of spot is "0" or "collect":
-        elif type_of_spot == '0' or type_of_spot == 'collect':
-            # calls the function BuyProperty.safe() so that the player is
-            # notified they landed on a safe spot:
-            self._buy_prop.safe(same_roll)
-
-        # checks if the type of spot is "jail":
-        elif type_of_spot == 'jail':
-            # calls the function GamePieces.move_piece() to move the player's
-            # token to jail:
-            self._game._game_pieces.move_piece(self._player, 0, True)
-
-        # checks if the type of spot is "card":
-        elif type_of_spot == 'card':
-            # checks if the name of the property is "Chance":
-            if (self._properties[str(self._player._piece_loc)]
-                    ['name']) == 'Chance':
-                # calls the function Cards.chance() so that a chance card will
-                # be picked:
-                self._game._cards.chance(self, same_roll)
-
-            # checks if the name of the property is "Community Chest":
-            elif (self._properties[str(self._player._piece_loc)]
-                  ['name']) == 'Community Chest':
-                # calls the function Cards.communtiy() so that a community
-                # chest card will be picked:
-                self._game._cards.community(self, same_roll)
-
-
 class BuyProperty(object):
-    """This class contains functions that correspond to the actions landing
-       on different spots would cause."""
+    """This class contains functions that create the popup windows and
+       buttons for the actions landing on different spots would cause."""
 
     # the constructor for the BuyProperty class:
     def __init__(self, win, player, other, game):
@@ -1038,25 +1078,40 @@ class BuyProperty(object):
         self._player = player
         self._other = other
         self._game = game
+        self._table = game._board._table
+
+    def start_turn(self, player, other):
+        """This function sets the active and passive players for a new
+           turn."""
 
-    def buy(self, properties, prop, same_roll):
+        self._player = player
+        self._other = other
+
+    def buy(self):
         """This function allows the player to choose whether or not to buy
            a property."""
 
+        # adds image of the property deed to the window:
+        prop = Image(self._win,
+                     self._table._images[self._player._state._piece_loc],
+                     160, 200, (800, 170))
+        prop.set_depth(1)
+        self._win.add(prop)
+
         # adds a buy and pass button to window and adds their handlers:
         buy_button = Button(self._win, 70, 40, (935, 90), 'green', 'BUY', 18,
                             'buy')
         pass_button = Button(self._win, 70, 40, (935, 140), 'yellow', 'PASS',
                              18, 'pass')
-        buy_button.add_handler(self._player, self._other, properties,
-                               self._game, self, same_roll, prop, pass_button)
-        pass_button.add_handler(self._player, self._other, properties,
-                                self._game, self, same_roll, prop, buy_button)
+        buy_button.add_handler(self._player, self._other, self._table,
+                               self._game, self, prop, pass_button)
+        pass_button.add_handler(self._player, self._other, self._table,
+                                self._game, self, prop, buy_button)
 
         # calls the function info_window():
-        self.info_window(self._player, properties)
+        self.info_window(self._player, self._table)
 
-    def info_window(self, player, properties):
+    def info_window(self, player, table):
         """This function creates an info window where addition information
            about the property is displayed."""
 
@@ -1070,8 +1125,8 @@ class BuyProperty(object):
         self._win.add(self._price_word)
         # adds the price of the property to the box:
         self._price_info = Text(self._win, '$' +
-                                str(properties[str(player._piece_loc)]
-                                    ['price']), 12, (935, 193))
+                                str(table._prices[player._state._piece_loc]),
+                                12, (935, 193))
         self._price_info.set_depth(1)
         self._win.add(self._price_info)
         # adds the words "NUMBER OWNED IN SET" to the box:
@@ -1086,10 +1141,10 @@ class BuyProperty(object):
         self._win.add(self._monop_words3)
         # adds the number of properties the player owns in the set to
         # the box:
-        self._monop_info = Text(self._win, str(player._prop_kinds
-                                               [properties
-                                                [str(player._piece_loc)]
-                                                ['set']]['have']),
+        set_mask = table._set_masks[table._sets[player._state._piece_loc]]
+        self._monop_info = Text(self._win,
+                                str(count_bits(player._state._owned_mask &
+                                               set_mask)),
                                 16, (935, 258))
         self._monop_info.set_depth(1)
         self._win.add(self._monop_info)
@@ -1106,475 +1161,84 @@ class BuyProperty(object):
         self._win.remove(self._monop_words3)
         self._win.remove(self._monop_info)
 
-    def pay(self, properties, same_roll, money_lost, advance=0):
+    def pay(self, piece_loc, money_lost, owner):
         """This function creates a popup window that tells the player they
            paid rent."""
 
-        # updates the player's money displayed on the window:
-        self._player.remove_money()
-        self._player.display_money()
         # adds a popup window describing the rent payed:
-        pay_win = PopUpWin(self._win, self._player, self._game)
-        pay_win.pay(properties, same_roll, money_lost, advance)
+        pay_win = self._game._pop_ups.open(self._player)
+        pay_win.pay(self._table, piece_loc, money_lost, owner)
 
-    def cant_buy(self, properties, same_roll):
+    def cant_buy(self, piece_loc):
         """This function creates a popup window that tells the player they
            can't buy the property."""
 
-        cant_win = PopUpWin(self._win, self._player, self._game)
-        cant_win.cant_buy(same_roll, properties)
+        cant_win = self._game._pop_ups.open(self._player)
+        cant_win.cant_buy(self._table, piece_loc)
 
-    def income_tax(self, same_roll):
+    def income_tax(self):
         """This function creates a popup window where the player can
            choose the tax they want to pay."""
 
-        income_win = PopUpWin(self._win, self._player, self._game)
-        income_win.tax_choice(same_roll)
+        income_win = self._game._pop_ups.open(self._player)
+        income_win.tax_choice()
 
-    def luxury_tax(self, same_roll):
+    def luxury_tax(self):
         """This function creates a popup window where the player can
            see that they payed the luxury tax."""
 
-        luxury_win = PopUpWin(self._win, self._player, self._game)
-        luxury_win.pay_tax(same_roll)
+        luxury_win = self._game._pop_ups.open(self._player)
+        luxury_win.pay_tax()
 
-    def already_own(self, same_roll):
+    def already_own(self):
         """This function creates a popup window that tells the player
            they already own the property."""
 
-        owned_win = PopUpWin(self._win, self._player, self._game)
-        owned_win.player_owns(same_roll)
+        owned_win = self._game._pop_ups.open(self._player)
+        owned_win.player_owns()
 
-    def safe(self, same_roll):
+    def safe(self):
         """This function creates a popup window that tells the player
            they landed on a safe spot."""
 
-        safe_win = PopUpWin(self._win, self._player, self._game)
-        safe_win.safe(same_roll)
+        safe_win = self._game._pop_ups.open(self._player)
+        safe_win.safe()
 
     def bankrupcy(self):
         """This function creates a popup window that allows the player to
            declare bankrupcy."""
 
-        bankrupcy_win = PopUpWin(self._win, self._player, self._game)
+        bankrupcy_win = self._game._pop_ups.open(self._player)
         bankrupcy_win.bankrupcy()
 
 
-class Cards(object):
-    """This class controls the actions for the Chance and Community Chest
-       cards."""
-
-    # the constructor for the Cards class:
-    def __init__(self, win, player, other, board, game):
-
-        self._win = win
-        self._player = player
-        self._other = other
-        self._board = board
-        self._game = game
-
-        # lists all the possible Chance cards that could be picked:
-        self._chance_cards = ['Go', 'Ill Ave', 'St Char Plc', 'Util', 'Rail',
-                              '$50 Div', 'Jail Free', 'Back 3', 'Go Jail',
-                              'Poor Tax', 'Read Rail', 'Boardwalk',
-                              'Chairman', 'Loan Matures']
-
-        # lists all the possible Community Chest cards that could be picked:
-        self._comm_cards = ['Go', 'Bank Error', 'Doc Fee',
-                            'Jail Free', 'Go Jail', 'Opera', 'Holiday',
-                            'Income Refund', 'Life Insur', 'Hosp Fee',
-                            'Sch Fee', 'Cons Fee', 'Beauty', 'Inherit']
-
-    def chance(self, spots, same_roll):
-        """This function controls the actions for the Chance cards."""
-
-        self._spots = spots
-
-        # picks a random card:
-        card = random.choice(self._chance_cards)
-        # creates the popup window:
-        pop_win = PopUpWin(self._win, self._player, self._game)
-
-        # checks the type of the card:
-        if card == 'Go':
-            # moves the player's token to the "GO" spot and sets its location
-            # to that spot:
-            self._player._player_piece.move_to(self._board._locations[1])
-            self._player.set_piece_loc(1)
-            # adds $200 to the player's money and updates the money on the
-            # window:
-            self._player._money += 200
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Go', same_roll)
-
-        elif card == 'Ill Ave':
-            # checks if the player will pass "Go":
-            if 25 <= self._player._piece_loc <= 40:
-                # adds $200 to the player's money and updates the money on the
-                # window:
-                self._player._money += 200
-                self._player.remove_money()
-                self._player.display_money()
-            # moves the player's token to the "Illinois Ave." spot and sets its
-            # location to that spot:
-            self._player._player_piece.move_to(self._board._locations[25])
-            self._player.set_piece_loc(25)
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Ill Ave', same_roll, self._spots)
-
-        elif card == 'St Char Plc':
-            # checks if the player will pass "Go":
-            if 12 <= self._player._piece_loc <= 40:
-                # adds $200 to the player's money and updates the money on the
-                # window:
-                self._player._money += 200
-                self._player.remove_money()
-                self._player.display_money()
-            # moves the player's token to the "St. Charles Place" spot and sets
-            # its location to that spot:
-            self._player._player_piece.move_to(self._board._locations[12])
-            self._player.set_piece_loc(12)
-            # calls the function PopUpWin.chance():
-            pop_win.chance('St Char Plc', same_roll, self._spots)
-
-        elif card == 'Util':
-            # checks if the player will pass "Go":
-            if 29 <= self._player._piece_loc <= 40:
-                # adds $200 to the player's money and updates the money on the
-                # window:
-                self._player._money += 200
-                self._player.remove_money()
-                self._player.display_money()
-            # determines what the next utility spot is, moves the player's
-            # token to that utility, and sets its location to that spot:
-            if self._player._piece_loc < 13 or self._player._piece_loc >= 29:
-                self._player._player_piece.move_to(self._board._locations[13])
-                self._player.set_piece_loc(13)
-            elif 13 <= self._player._piece_loc < 29:
-                self._player._player_piece.move_to(self._board._locations[29])
-                self._player.set_piece_loc(29)
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Util', same_roll, self._spots)
-
-        elif card == 'Rail':
-            # checks if the player will pass "Go":
-            if 36 <= self._player._piece_loc <= 40:
-                # adds $200 to the player's money and updates the money on the
-                # window:
-                self._player._money += 200
-                self._player.remove_money()
-                self._player.display_money()
-            # determines what the next railroad spot is, moves the player's
-            # token to that railroad, and sets its location to that spot:
-            if self._player._piece_loc < 6 or self._player._piece_loc >= 36:
-                self._player._player_piece.move_to(self._board._locations[6])
-                self._player.set_piece_loc(6)
-            elif 6 <= self._player._piece_loc < 16:
-                self._player._player_piece.move_to(self._board._locations[16])
-                self._player.set_piece_loc(16)
-            elif 16 <= self._player._piece_loc < 26:
-                self._player._player_piece.move_to(self._board._locations[26])
-                self._player.set_piece_loc(26)
-            elif 26 <= self._player._piece_loc < 36:
-                self._player._player_piece.move_to(self._board._locations[36])
-                self._player.set_piece_loc(36)
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Rail', same_roll, self._spots)
-
-        elif card == '$50 Div':
-            # adds $50 to the player's money and updates the money on the
-            # window:
-            self._player._money += 50
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.chance():
-            pop_win.chance('$50 Div', same_roll)
-
-        elif card == 'Jail Free':
-            # updates the player's "Jail Free" status - the player now has the
-            # possiblity to get out of going to jail:
-            self._player._jail_free = True
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Jail Free', same_roll)
-
-        elif card == 'Back 3':
-            # determines the new location of the player, moves the player's
-            # token to the spot, and sets the player's new location to that
-            # spot:
-            new_loc = self._player._piece_loc - 3
-            self._player._player_piece.move_to(self._board._locations[new_loc])
-            self._player.set_piece_loc(new_loc)
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Back 3', same_roll, self._spots)
-
-        elif card == 'Go Jail':
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Go Jail')
-
-        elif card == 'Poor Tax':
-            # subtracts $15 from the player's money and updates the money on
-            # the window:
-            self._player._money -= 15
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Poor Tax', same_roll)
-
-        elif card == 'Read Rail':
-            # checks if the player will pass "Go":
-            if 6 <= self._player._piece_loc <= 40:
-                # adds $200 to the player's money and updates the money on the
-                # window:
-                self._player._money += 200
-                self._player.remove_money()
-                self._player.display_money()
-            # moves the player's token to the "Reading Railroad" spot and sets
-            # the player's new location to that spot:
-            self._player._player_piece.move_to(self._board._locations[6])
-            self._player.set_piece_loc(6)
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Read Rail', same_roll, self._spots)
-
-        elif card == 'Boardwalk':
-            # checks if the player will pass "Go":
-            if self._player._piece_loc == 40:
-                # adds $200 to the player's money and updates the money on the
-                # window:
-                self._player._money += 200
-                self._player.remove_money()
-                self._player.display_money()
-            # moves the player's token to the "Boardwalk" spot and sets
-            # the player's new location to that spot:
-            self._player._player_piece.move_to(self._board._locations[40])
-            self._player.set_piece_loc(40)
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Boardwalk', same_roll, self._spots)
-
-        elif card == 'Chairman':
-            # subtracts $50 from the player's money and updates the money on
-            # on the window:
-            self._player._money -= 50
-            self._player.remove_money()
-            self._player.display_money()
-            # adds $50 to the other player's money:
-            self._other._money += 50
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Chairman', same_roll)
-
-        elif card == 'Loan Matures':
-            # adds $150 to the player's money and updates the money on the
-            # window:
-            self._player._money += 150
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.chance():
-            pop_win.chance('Loan Matures', same_roll)
-
-    def community(self, spots, same_roll):
-        """This function controls the actions for the Community Chest cards."""
-
-        self._spots = spots
-
-        # picks a random card:
-        card = random.choice(self._comm_cards)
-        # creates the popup window:
-        pop_win = PopUpWin(self._win, self._player, self._game)
-
-        # checks the type of card:
-        if card == 'Go':
-            # moves the player's token to the "GO" spot and sets the player's
-            # new location to that spot:
-            self._player._player_piece.move_to(self._board._locations[1])
-            self._player.set_piece_loc(1)
-            # adds $200 to the player's money and updates the money on the
-            # window:
-            self._player._money += 200
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Go', same_roll)
-
-        elif card == 'Bank Error':
-            # adds $200 to the player's money and updates the money on the
-            # window:
-            self._player._money += 200
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Bank Error', same_roll)
-
-        elif card == 'Doc Fee':
-            # subtracts $50 from the player's money and updates the money on
-            # on the window:
-            self._player._money -= 50
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Doc Fee', same_roll)
-
-        elif card == 'Jail Free':
-            # updates the player's "Jail Free" status - the player now has the
-            # possiblity to get out of going to jail:
-            self._player._jail_free = True
-            # calls the function PopUpWin.community():
-            pop_win.community('Jail Free', same_roll)
-
-        elif card == 'Go Jail':
-            # calls the function PopUpWin.community():
-            pop_win.community('Go Jail')
-
-        elif card == 'Opera':
-            # adds $50 to the player's money and updates the money on the
-            # window:
-            self._player._money += 50
-            self._player.remove_money()
-            self._player.display_money()
-            # subtracts $50 from the other player's money:
-            self._other._money -= 50
-            # calls the function PopUpWin.community():
-            pop_win.community('Opera', same_roll)
-
-        elif card == 'Holiday':
-            # adds $100 to the player's money and updates the money on the
-            # window:
-            self._player._money += 100
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Holiday', same_roll)
-
-        elif card == 'Income Refund':
-            # adds $20 to the player's money and updates the money on the
-            # window:
-            self._player._money += 20
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Income Refund', same_roll)
-
-        elif card == 'Life Insur':
-            # adds $100 to the player's money and updates the money on the
-            # window:
-            self._player._money += 100
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Life Insur', same_roll)
-
-        elif card == 'Hosp Fee':
-            # subtracts $100 from the player's money and updates the money on
-            # on the window:
-            self._player._money -= 100
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Hosp Fee', same_roll)
-
-        elif card == 'Sch Fee':
-            # subtracts $150 from the player's money and updates the money on
-            # on the window:
-            self._player._money -= 150
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Sch Fee', same_roll)
-
-        elif card == 'Cons Fee':
-            # adds $25 to the player's money and updates the money on the
-            # window:
-            self._player._money += 25
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Cons Fee', same_roll)
-
-        elif card == 'Beauty':
-            # adds $10 to the player's money and updates the money on the
-            # window:
-            self._player._money += 10
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Beauty', same_roll)
-
-        elif card == 'Inherit':
-            # adds $100 to the player's money and updates the money on the
-            # window:
-            self._player._money += 100
-            self._player.remove_money()
-            self._player.display_money()
-            # calls the function PopUpWin.community():
-            pop_win.community('Inherit', same_roll)
-
-class Houses(object):
+class Houses(EventHandler):
     """This class allows for houses to be added to properties on the board. It
-       determines the locations of the buttons and house spots that go along
-       with this function."""
+       shows the house buttons and the houses of each property, drawn from
+       the number of houses the rules engine has for it. * It is the handler
+       of every house button and finds the button that was clicked with a
+       HitIndex. * It only keeps the houses it has drawn, so it can show
+       another game with show_game()"""
 
     def __init__(self, win, game):
 
+        # calls the EventHandler parent class so that methods belonging to
+        # that class are accessible:
+        EventHandler.__init__(self)
+
         self._win = win
         self._game = game
 
-        # creates a dictionary of the house button locations for each set:
-        self._house_add_locs = {'brown': [(580, 600), (465, 600)],
-                                'lt blue': [(290, 600), (180, 600),
-                                            (120, 600)],
-                                'pink': [(100, 580), (100, 465), (100, 410)],
-                                'orange': [(100, 290), (100, 180), (100, 120)],
-                                'red': [(120, 100), (235, 100), (290, 100)],
-                                'yellow': [(410, 100), (465, 100), (580, 100)],
-                                'green': [(600, 120), (600, 180), (600, 290)],
-                                'dk blue': [(600, 465), (600, 580)]}
-
-        # creates a dictionary of the locations of the houses that correspond
-        # to each house button:
-        self._house_locs = {'(580, 600)': {'spots': [(595, 620), (580, 620),
-                                                     (565, 620)], 'prop': 2},
-                            '(465, 600)': {'spots': [(480, 620), (465, 620),
-                                                     (450, 620)], 'prop': 4},
-                            '(290, 600)': {'spots': [(305, 620), (290, 620),
-                                                     (275, 620)], 'prop': 7},
-                            '(180, 600)': {'spots': [(195, 620), (180, 620),
-                                                     (165, 620)], 'prop': 9},
-                            '(120, 600)': {'spots': [(135, 620), (120, 620),
-                                                     (105, 620)], 'prop': 10},
-                            '(100, 580)': {'spots': [(80, 595), (80, 580),
-                                                     (80, 565)], 'prop': 12},
-                            '(100, 465)': {'spots': [(80, 480), (80, 465),
-                                                     (80, 450)], 'prop': 14},
-                            '(100, 410)': {'spots': [(80, 425), (80, 410),
-                                                     (80, 395)], 'prop': 15},
-                            '(100, 290)': {'spots': [(80, 305), (80, 290),
-                                                     (80, 275)], 'prop': 17},
-                            '(100, 180)': {'spots': [(80, 195), (80, 180),
-                                                     (80, 165)], 'prop': 19},
-                            '(100, 120)': {'spots': [(80, 135), (80, 120),
-                                                     (80, 105)], 'prop': 20},
-                            '(120, 100)': {'spots': [(105, 80), (120, 80),
-                                                     (135, 80)], 'prop': 22},
-                            '(235, 100)': {'spots': [(220, 80), (235, 80),
-                                                     (250, 80)], 'prop': 24},
-                            '(290, 100)': {'spots': [(275, 80), (290, 80),
-                                                     (305, 80)], 'prop': 25},
-                            '(410, 100)': {'spots': [(395, 80), (410, 80),
-                                                     (425, 80)], 'prop': 27},
-                            '(465, 100)': {'spots': [(450, 80), (465, 80),
-                                                     (480, 80)], 'prop': 28},
-                            '(580, 100)': {'spots': [(565, 80), (580, 80),
-                                                     (595, 80)], 'prop': 30},
-                            '(600, 120)': {'spots': [(620, 105), (620, 120),
-                                                     (620, 135)], 'prop': 32},
-                            '(600, 180)': {'spots': [(620, 165), (620, 180),
-                                                     (620, 195)], 'prop': 33},
-                            '(600, 290)': {'spots': [(620, 275), (620, 290),
-                                                     (620, 305)], 'prop': 35},
-                            '(600, 465)': {'spots': [(620, 450), (620, 465),
-                                                     (620, 480)], 'prop': 38},
-                            '(600, 580)': {'spots': [(620, 565), (620, 580),
-                                                     (620, 595)], 'prop': 40}}
+        # initializes the list of buttons, the index used to find the button
+        # that was clicked and the button the mouse is on:
+        self._buttons = []
+        self._button_hits = HitIndex()
+        self._hovered = None
+
+        # the Rectangles of the houses shown on each property, keyed by its
+        # spot, and the property of each house button shown:
+        self._sprites = {}
+        self._button_props = {}
 
     def display_house_buttons(self, house_sets):
         """This function adds the buttons that allow the player to buy houses
@@ -1586,23 +1250,162 @@ class Houses(object):
         # adds buttons for each property in the sets totally owned by the
         # player:
         for set_typ in house_sets:
-            for center in self._house_add_locs[set_typ]:
+            for piece_loc, center in HOUSE_BUTTONS[set_typ]:
                 button = Button(self._win, 10, 10, center, 'yellow', '+', 5,
                                 'house')
-                button.add_handler(None, None, None, self._game, None, None,
-                                   None, None, None)
+                self._button_props[button] = piece_loc
+                button._button.add_handler(self)
+                button._button_text.add_handler(self)
                 button._button.set_depth(9)
                 button._button_text.set_depth(8)
                 self._buttons.append(button)
 
+        # indexes the area of every button at once:
+        self._button_hits.register_all([(button._center, button._width,
+                                         button._height, button)
+                                        for button in self._buttons])
+
     def remove_house_buttons(self):
         """This function removes all the buttons from the window."""
 
         # checks if there are any buttons to remove:
-        if len(self._buttons) > 0:   
+        if len(self._buttons) > 0:
             for button in self._buttons:
                 self._win.remove(button._button)
                 self._win.remove(button._button_text)
+            self._button_hits.remove_all(self._buttons)
+            self._buttons = []
+            self._button_props = {}
+            self._hovered = None
+
+    def handle_mouse_enter(self, event):
+        """This function changes the body color of the button the mouse is on
+           to red."""
+
+        self._hovered = self._button_hits.find(event.get_mouse_location())
+        if self._hovered is not None:
+            self._hovered._button.set_border_color('red')
+
+    def handle_mouse_leave(self, event):
+        """This function changes the body color of the button the mouse left
+           back to black."""
+
+        if self._hovered is not None:
+            self._hovered._button.set_border_color('black')
+            self._hovered = None
+
+    def handle_mouse_release(self, event):
+        """This function buys a house for the property of the button that was
+           clicked."""
+
+        button = self._button_hits.find(event.get_mouse_location())
+        if button is not None:
+            self.buy_house(self._button_props[button])
+
+    def buy_house(self, piece_loc):
+        """Given the spot of a property, this function has the rules engine
+           buy a house for it and shows the result."""
+
+        prop_name = self._game._board._table._names[piece_loc]
+        # the rules engine buys a house for the property - no events are
+        # returned if all three houses have already been added:
+        events = self._game._engine.buy_house(piece_loc)
+
+        # checks if the player had enough money to buy:
+        if len(events) > 0 and events[0][0] == 'house':
+            # updates the player's money and the houses on the window:
+            self._game._hud.update_money()
+            self.show_houses(piece_loc)
+            # creates the popup window that tells player that they
+            # bought a house:
+            bought = self._game._pop_ups.open(None)
+            bought.bought_house(prop_name)
+
+        elif len(events) > 0:
+            # creates the popup window that tells the player they
+            # don't have enough money to buy the house:
+            cant_buy = self._game._pop_ups.open(None)
+            cant_buy.cant_house(prop_name)
+
+    def show_houses(self, piece_loc):
+        """This function draws or removes houses on a property until the
+           window shows the number of houses the rules engine has for it."""
+
+        houses = self._game._engine.get_houses(piece_loc)
+        sprites = self._sprites.setdefault(piece_loc, [])
+
+        # adds the missing houses in the order of the property's spots:
+        while len(sprites) < houses:
+            house = Rectangle(self._win, 10, 10,
+                              HOUSE_SPOTS[piece_loc][len(sprites)])
+            house.set_fill_color('red')
+            house.set_depth(9)
+            self._win.add(house)
+            sprites.append(house)
+
+        # removes the houses that are no longer on the property:
+        while len(sprites) > houses:
+            self._win.remove(sprites.pop())
+
+    def show_game(self, game):
+        """This function shows the houses of the given game instead of the
+           game that was shown."""
+
+        self._game = game
+        for piece_loc in range(1, 41):
+            if len(HOUSE_SPOTS[piece_loc]) > 0:
+                self.show_houses(piece_loc)
+
+
+class ActionRegistry(object):
+    """This class maps the type of a button or popup window to the function
+       it performs, so that a click calls the function for its type instead
+       of going through a chain of comparisons. It also counts the calls of
+       each type and the total time they took to find the slow ones."""
+
+    # the constructor for the ActionRegistry class:
+    def __init__(self):
+
+        # the function, number of calls and total seconds of each type:
+        self._actions = {}
+        self._calls = {}
+        self._seconds = {}
+
+    def register(self, typ, function):
+        """This function sets the function called for the given type - the
+           function is given the button or popup window that was clicked."""
+
+        self._actions[typ] = function
+        self._calls.setdefault(typ, 0)
+        self._seconds.setdefault(typ, 0.0)
+
+    def dispatch(self, typ, target):
+        """This function calls the function registered for the given type
+           with the target. * Nothing happens for types with no function"""
+
+        function = self._actions.get(typ)
+        if function is None:
+            return
+
+        start = time.perf_counter()
+        try:
+            function(target)
+        finally:
+            self._calls[typ] += 1
+            self._seconds[typ] += time.perf_counter() - start
+
+    def stats(self):
+        """This function returns a dictionary of the number of calls, total
+           seconds and average seconds of each type that was called."""
+
+        stats = {}
+        for typ in self._calls:
+            calls = self._calls[typ]
+            if calls > 0:
+                stats[typ] = {'calls': calls,
+                              'seconds': self._seconds[typ],
+                              'average': self._seconds[typ] / calls}
+        return stats
 
 
 class Button(EventHandler):
@@ -1640,7 +1443,7 @@ class Button(EventHandler):
         self._button_text.set_depth(1)
         self._win.add(self._button_text)
 
-    def add_handler(self, player, other, properties, game, buy_prop, same_roll,
+    def add_handler(self, player, other, properties, game, buy_prop,
                     prop=None, other_button=None, pop_up=None):
         """This function adds the handler to the button body and text. It also
            allows for the input of more variables needed for the action the
@@ -1651,7 +1454,6 @@ class Button(EventHandler):
         self._properties = properties
         self._game = game
         self._buy_prop = buy_prop
-        self._same_roll = same_roll
         self._prop = prop
         self._other_button = other_button
         self._pop_up = pop_up
@@ -1676,224 +1478,187 @@ class Button(EventHandler):
         """This function handles the action when the button is clicked based on
            its specified type."""
 
-        # checks the type of the button:
-        if self._type == 'start':
-            # removes the two buttons and their text from the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
-            self._win.remove(self._pop_up._logo)
-            # calls the function PopUpWin.pick_pieces() with player 1 picking:
-            self._pop_up.pick_pieces(1)
-
-        elif self._type == 'rules':
-            # removes the two buttons and their text from the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
-            self._win.remove(self._pop_up._logo)
-            # calls the function PopUpWin.rules()
-            self._pop_up.rules()
-
-        elif self._type == 'buy':
-            # sets the owner of the spot as the player's id number:
-            self._game._spots.set_ownership(self._player._piece_loc,
-                                            self._player._idnum)
-            # appends the location of the spot to the list of the player's
-            # properties:
-            self._player._properties.append(self._player._piece_loc)
-            # increases the number of properties owned in the property's set
-            # by 1:
-            (self._player._prop_kinds[self._properties
-             [str(self._player._piece_loc)]['set']]['have']) += 1
+        # calls the function registered for the type of the button:
+        BUTTON_ACTIONS.dispatch(self._type, self)
+
+    def start_game(self):
+        """This function starts choosing the game tokens."""
+
+        # removes the two buttons and their text from the window:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        self._win.remove(self._other_button._button)
+        self._win.remove(self._other_button._button_text)
+        self._win.remove(self._pop_up._logo)
+        # calls the function PopUpWin.pick_pieces() with player 1 picking:
+        self._pop_up.pick_pieces(1)
+
+    def show_rules(self):
+        """This function shows the rules of the game."""
+
+        # removes the two buttons and their text from the window:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        self._win.remove(self._other_button._button)
+        self._win.remove(self._other_button._button_text)
+        self._win.remove(self._pop_up._logo)
+        # calls the function PopUpWin.rules()
+        self._pop_up.rules()
+
+    def buy_property(self):
+        """This function buys the property and moves its deed to the
+           player's properties."""
+
+        # the rules engine buys the property for the player:
+        events = self._game._engine.buy()
+        # moves the deed to the player's properties:
+        self._player.add_deed(self._prop)
+        # removes the two buttons and their text to the window:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        self._win.remove(self._other_button._button)
+        self._win.remove(self._other_button._button_text)
+        # calls the function BuyProperty.remove_info_window()
+        self._buy_prop.remove_info_window()
+        # calls the function Game.show_events() so the player can roll
+        # again or end their turn:
+        self._game.show_events(events)
+
+    def pass_property(self):
+        """This function passes on buying the property."""
+
+        # tells the rules engine the player didn't buy the property:
+        events = self._game._engine.pass_property()
+        # removes the two buttons and their text to the window:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        self._win.remove(self._other_button._button)
+        self._win.remove(self._other_button._button_text)
+        # removes the deed image from the window:
+        self._win.remove(self._prop)
+        # calls the function BuyProperty.remove_info_window()
+        self._buy_prop.remove_info_window()
+        # calls the function Game.show_events() so the player can roll
+        # again or end their turn:
+        self._game.show_events(events)
+
+    def pay_income_tax(self):
+        """This function pays the Income Tax the button is for."""
+
+        # the rules engine makes the player pay the chosen tax:
+        events = self._game._engine.pay_income_tax(self._type)
+        # removes the two buttons and their text to the window:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        self._win.remove(self._other_button._button)
+        self._win.remove(self._other_button._button_text)
+        # determines if the player had enough money to pay the tax:
+        if events[0][0] == 'bankrupcy':
+            # removes the text from the window:
+            self._win.remove(self._pop_up._tax_explain)
+            self._win.remove(self._pop_up._tax_choice)
+            # calls the function PopUpWin.bankrupcy():
+            self._pop_up.bankrupcy()
+        else:
             # updates the player's money on the window:
-            self._player.remove_money()
-            self._player.display_money()
-            # determines the number of deeds owned by the player:
-            self._num_of_deeds = len(self._player._properties)
-            # scales down the size of the displayed property deed and sets the
-            # depth and moves it to the display window based on the number of
-            # deeds:
-            self._prop.scale(13 / 16)
-            self._prop.set_depth(30 - self._num_of_deeds)
-            if self._num_of_deeds <= 8:
-                self._prop.move_to((780, 415 + (25 *
-                                                (self._num_of_deeds - 1))))
-            elif 8 < self._num_of_deeds <= 16:
-                self._prop.move_to((920, 415 + (25 *
-                                                (self._num_of_deeds - 9))))
-            elif 16 < self._num_of_deeds <= 24:
-                self._prop.move_to((1060, 415 + (25 *
-                                                 (self._num_of_deeds - 17))))
-            # adds the property to the the player's _prop_display dictionary:
-            self._player._prop_display[self._num_of_deeds] = self._prop
-            # removes the two buttons and their text to the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
-            # calls the function BuyProperty.remove_info_window()
-            self._buy_prop.remove_info_window()
-            # checks is the player rolled doubles:
-            if self._same_roll:
-                # adds the popup window that tells the player to roll again:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button()
-                self._game.add_end_turn_button()
-
-        elif self._type == 'pass':
-            # adds the price of the property back to the player's money:
-            self._player._money += (self._properties
-                                    [str(self._player._piece_loc)]
-                                    ['price'])
-            # removes the two buttons and their text to the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
-            # removes the deed image from the window:
-            self._win.remove(self._prop)
-            # calls the function BuyProperty.remove_info_window()
-            self._buy_prop.remove_info_window()
-            # checks is the player rolled doubles:
-            if self._same_roll:
-                # adds the popup window that tells the player to roll again:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button()
-                self._game.add_end_turn_button()
-
-        elif self._type == '10%':
-            # determines the money lost after paying the tax (10% of the
-            # player's current money), subtracts the money_lost from the
-            # player's money, and updates the player's money on the
-            # window:
-            money_lost = int(self._player._money * 0.1)
-            self._player._money -= money_lost
-            self._player.remove_money()
-            self._player.display_money()
-            # removes the two buttons and their text to the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
+            self._game._hud.update_money()
             # calls the functions PopUpWin.tax_choice_end() and
             # PopUpWin.close_buttons():
-            self._pop_up.tax_choice_end(money_lost)
+            self._pop_up.tax_choice_end(events[0][1])
             self._pop_up.close_buttons()
 
-        elif self._type == '200':
-            # sets the money_lost as $200, subtracts money_lost from the
-            # player's money:
-            money_lost = 200
-            self._player._money -= 200
-            # removes the two buttons and their text to the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
-            # determines if the player has enough money to pay the tax:
-            if self._player._money < 0:
-                # removes the text from the window:
-                self._win.remove(self._pop_up._tax_explain)
-                self._win.remove(self._pop_up._tax_choice)
-                # calls the function PopUpWin.bankrupcy():
-                self._pop_up.bankrupcy()
-            else:
-                # updates the player's money on the window:
-                self._player.remove_money()
-                self._player.display_money()
-                # calls the functions PopUpWin.tax_choice_end() and
-                # PopUpWin.close_buttons():
-                self._pop_up.tax_choice_end(money_lost)
-                self._pop_up.close_buttons()
-
-        elif self._type == 'jail free yes':
-            # updates the player's "Jail Free" status - the player now cannot
-            # get out of going to jail:
-            self._player._jail_free = False
-            # removes the two buttons and their text to the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
-            # calls the functions PopUpWin.jail_free_choice_end() and
-            # PopUpWin.close_buttons():
-            self._pop_up.jail_free_choice_end('yes')
-            self._pop_up.close_buttons()
+    def use_jail_free(self):
+        """This function uses the player's "Jail Free" card."""
+
+        # the rules engine uses the player's "Jail Free" card:
+        self._game._engine.jail_free_choice(True)
+        # removes the two buttons and their text to the window:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        self._win.remove(self._other_button._button)
+        self._win.remove(self._other_button._button_text)
+        # calls the functions PopUpWin.jail_free_choice_end() and
+        # PopUpWin.close_buttons():
+        self._pop_up.jail_free_choice_end('yes')
+        self._pop_up.close_buttons()
+
+    def go_to_jail(self):
+        """This function sends the player to jail."""
+
+        # the rules engine sends the player to jail:
+        self._game._engine.jail_free_choice(False)
+        # removes the two buttons and their text to the window:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        self._win.remove(self._other_button._button)
+        self._win.remove(self._other_button._button_text)
+        # calls the functions PopUpWin.jail_free_choice_end()
+        self._pop_up.jail_free_choice_end('no')
+
+    def declare_bankrupcy(self):
+        """This function declares the player bankrupt."""
+
+        # removes the button and its text:
+        self._win.remove(self._button)
+        self._win.remove(self._button_text)
+        # calls the function PopUpWin.bankrupcy_end()
+        self._pop_up.bankrupcy_end()
+
+
+# the function each type of button performs when it is clicked:
+BUTTON_ACTIONS = ActionRegistry()
+BUTTON_ACTIONS.register('start', Button.start_game)
+BUTTON_ACTIONS.register('rules', Button.show_rules)
+BUTTON_ACTIONS.register('buy', Button.buy_property)
+BUTTON_ACTIONS.register('pass', Button.pass_property)
+BUTTON_ACTIONS.register('10%', Button.pay_income_tax)
+BUTTON_ACTIONS.register('200', Button.pay_income_tax)
+BUTTON_ACTIONS.register('jail free yes', Button.use_jail_free)
+BUTTON_ACTIONS.register('jail free no', Button.go_to_jail)
+BUTTON_ACTIONS.register('bankrupcy', Button.declare_bankrupcy)
+
+
+class PopUpPool(object):
+    """This class keeps the popup windows that have been closed so that the
+       next popup window reuses one of them (its window, close button, text
+       and images) instead of building a new one for every event."""
+
+    # the constructor for the PopUpPool class:
+    def __init__(self, win, game):
+
+        self._win = win
+        self._game = game
+
+        # the popup windows that aren't open:
+        self._free = []
+
+    def open(self, player):
+        """This function adds a popup window for the given player to the
+           window and returns it."""
+
+        # builds a new popup window only if none are free:
+        if len(self._free) == 0:
+            return PopUpWin(self._win, player, self._game, self)
+
+        pop_up = self._free.pop()
+        pop_up._player = player
+        pop_up.open()
+        return pop_up
 
-        elif self._type == 'jail free no':
-            # removes the two buttons and their text to the window:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            self._win.remove(self._other_button._button)
-            self._win.remove(self._other_button._button_text)
-            # calls the functions PopUpWin.jail_free_choice_end()
-            self._pop_up.jail_free_choice_end('no')
-
-        elif self._type == 'bankrupcy':
-            # removes the button and its text:
-            self._win.remove(self._button)
-            self._win.remove(self._button_text)
-            # calls the function PopUpWin.bankrupcy_end()
-            self._pop_up.bankrupcy_end()
-
-        elif self._type == 'house':
-            # checks if all three houses have already been added:
-            if len(self._game._houses._house_locs
-                   [str(self._center)]['spots']) > 0:
-                # subtracts the price of the house from the player's money:
-                self._game._player._money -= (self._game._board._properties
-                                              [str(self._game._houses._house_locs
-                                                   [str(self._center)]
-                                                   ['prop'])]['house cost'])
-                # checks if the player has enough money to buy:
-                if self._game._player._money > 0:
-                    # updates the player's money on the window:
-                    self._game._player.remove_money()
-                    self._game._player.display_money()
-                    # adds another house to the property:
-                    (self._game._board._properties
-                     [str(self._game._houses._house_locs[str(self._center)]
-                     ['prop'])]['houses']) += 1
-                    # finds the center of the house on the board and makes sure
-                    # no other house can be placed there:
-                    center = (self._game._houses._house_locs
-                              [str(self._center)]['spots'].pop(0))
-                    # creates the house and adds it to the window:
-                    house = Rectangle(self._win, 10, 10, center)
-                    house.set_fill_color('red')
-                    house.set_depth(9)
-                    self._win.add(house)
-                    # creates the popup window that tells player that they
-                    # bought a house:
-                    bought = PopUpWin(self._win, None, self._game)
-                    bought.bought_house(self._game._board._properties
-                                        [str(self._game._houses._house_locs
-                                             [str(self._center)]['prop'])]
-                                        ['name'])
-
-                else:
-                    # creates the popup window that tells the player they
-                    # don't have enough money to buy the house:
-                    cant_buy = PopUpWin(self._win, None, self._game)
-                    cant_buy.cant_house(self._game._board._properties
-                                        [str(self._game._houses._house_locs
-                                             [str(self._center)]
-                                             ['prop'])]['name'])
+    def release(self, pop_up):
+        """This function takes back a popup window that was closed."""
+
+        self._free.append(pop_up)
 
 
 class PopUpWin(EventHandler):
     """This class creates a popup window. The window contains different
-       information based on the function called."""
+       information based on the function called. * The window, close button
+       and each text and image are only created the first time they are
+       needed and are reused once the popup window is closed"""
 
     # the constructor for the PopUpWin class:
-    def __init__(self, win, player, game):
+    def __init__(self, win, player, game, pool=None):
 
         # calls the EventHandler parent class so that methods belonging to
         # that class are accessible:
@@ -1902,34 +1667,91 @@ class PopUpWin(EventHandler):
         self._win = win
         self._player = player
         self._game = game
+        self._pool = pool
+
+        # the text and images created for the popup window, keyed by their
+        # size and center, the number of times each key was used since the
+        # popup window was opened and the text each text object shows:
+        self._content = {}
+        self._used = {}
+        self._shown = {}
 
-        # creates the window and adds it to the window:
+        # creates the window:
         self._window = Rectangle(self._win, 500, 400, (600, 350))
         self._window.set_depth(4)
-        self._win.add(self._window)
-
-    def close_buttons(self):
-        """This function adds a close button to the window."""
 
-        # creates the body of the close button and adds it to the window:
+        # creates the body and text of the close button:
         self._x = Square(self._win, 20, (370, 170))
         self._x.set_depth(2)
         self._x.set_fill_color('red')
-        self._win.add(self._x)
         self._x.add_handler(self)
-
-        # creates the text of the close button and adds it to the window:
         self._x_text = Text(self._win, 'X', 12, (370, 170))
         self._x_text.set_depth(1)
-        self._win.add(self._x_text)
         self._x_text.add_handler(self)
 
+        # adds the window to the window:
+        self.open()
+
+    def open(self):
+        """This function adds the window to the window so that new
+           information can be shown in it."""
+
+        self._used = {}
+        self._x.set_border_color('black')
+        self._win.add(self._window)
+
+    def reuse(self, key):
+        """This function returns the next text or image with the given key
+           that hasn't been used since the popup window was opened, or None
+           if a new one must be created."""
+
+        used = self._used.get(key, 0)
+        self._used[key] = used + 1
+        objs = self._content.setdefault(key, [])
+        if used < len(objs):
+            return objs[used]
+        return None
+
+    def reuse_text(self, text, size, center):
+        """This function returns a text object with the given text, size and
+           center, reusing one from an earlier time the popup window was
+           open if possible."""
+
+        key = ('text', size, center)
+        text_obj = self.reuse(key)
+        if text_obj is None:
+            text_obj = Text(self._win, text, size, center)
+            self._content[key].append(text_obj)
+        elif self._shown[text_obj] != text:
+            text_obj.set_text(text)
+        self._shown[text_obj] = text
+        return text_obj
+
+    def reuse_image(self, image_file, width, height, center):
+        """This function returns an image of the given file, size and center,
+           reusing one from an earlier time the popup window was open if
+           possible."""
+
+        key = ('image', image_file, width, height, center)
+        image = self.reuse(key)
+        if image is None:
+            image = Image(self._win, image_file, width, height, center)
+            self._content[key].append(image)
+        return image
+
+    def close_buttons(self):
+        """This function adds a close button to the window."""
+
+        # adds the body and text of the close button to the window:
+        self._win.add(self._x)
+        self._win.add(self._x_text)
+
     def start(self):
         """This function create the information for the start popup window."""
 
         # creates the logo and adds it to the window:
-        self._logo = Image(self._win, 'monopoly_logo.jpg', 450, 130,
-                           (600, 250))
+        self._logo = self.reuse_image('monopoly_logo.jpg', 450, 130,
+                                      (600, 250))
         self._logo.set_depth(1)
         self._win.add(self._logo)
 
@@ -1939,9 +1761,9 @@ class PopUpWin(EventHandler):
         self._rules_button = Button(self._win, 150, 90, (700, 400), 'white',
                                     'SHOW RULES', 15, 'rules')
         self._start_button.add_handler(None, None, None, self._game, None,
-                                       None, None, self._rules_button, self)
+                                       None, self._rules_button, self)
         self._rules_button.add_handler(None, None, None, self._game, None,
-                                       None, None, self._start_button, self)
+                                       None, self._start_button, self)
 
     def pick_pieces(self, player_number):
         """This function creates the information that allows the players to
@@ -1961,9 +1783,10 @@ class PopUpWin(EventHandler):
 
         # creates the text that says the player should pick a token and adds
         # it to the window:
-        self._pick_piece = Text(self._win, 'Player ' +
-                                str(self._player_number) +
-                                ' pick a game token!', 20, (600, 250))
+        self._pick_piece = self.reuse_text('Player ' +
+                                           str(self._player_number) +
+                                           ' pick a game token!', 20,
+                                           (600, 250))
         self._win.add(self._pick_piece)
         self._pick_piece.set_depth(1)
 
@@ -1981,10 +1804,10 @@ class PopUpWin(EventHandler):
 
         # creates the text that says the player picked a token and adds it to
         # the window:
-        self._picked_piece_text = Text(self._win, 'Player ' +
-                                       str(self._player_number) +
-                                       ' picked the ' + piece +
-                                       '!', 20, (600, 300))
+        self._picked_piece_text = self.reuse_text('Player ' +
+                                                  str(self._player_number) +
+                                                  ' picked the ' + piece + '!',
+                                                  20, (600, 300))
         self._picked_piece_text.set_depth(1)
         self._win.add(self._picked_piece_text)
 
@@ -2010,51 +1833,53 @@ class PopUpWin(EventHandler):
         self._type = 'rules'
 
         # creates the text for all the rules of Monopoly:
-        self._rules = Text(self._win, 'Monopoly Rules', 25, (600, 180))
-        self._rule1 = Text(self._win, '1.  Each player starts on "GO"',
-                           10, (460, 210))
-        self._rule2 = Text(self._win, '2.  Click the dice to roll - if ' +
-                           'doubles are thrown you may roll again', 10,
-                           (561, 230))
-        self._rule3 = Text(self._win, '3.  According to the space your ' +
-                           'token reaches, you may be entiled to buy real', 10,
-                           (597, 250))
-        self._rule4 = Text(self._win, 'estate or other properties - or ' +
-                           'obliged to pay rent, pay taxes, draw a Chance', 10,
-                           (610, 270))
-        self._rule5 = Text(self._win, 'or Community Chest card, Go to ' +
-                           'Jail, etc.', 10, (512, 290))
-        self._rule6 = Text(self._win, '4.  You may buy a property for the ' +
-                           'price shown next to the deed card', 10, (572, 310))
-        self._rule7 = Text(self._win, '5.  When you land on a property owned' +
-                           ' by another player, the owner collects', 10,
-                           (595, 330))
-        self._rule8 = Text(self._win, 'rent from you in accordance with the ' +
-                           'list printed on its Title Deed card', 10,
-                           (594, 350))
-        self._rule9 = Text(self._win, '6.  When you land on a "Chance" or ' +
-                           '"Community Chest" space, take a card', 10,
-                           (593, 370))
-        self._rule10 = Text(self._win, 'for the indicated deck and follow ' +
-                            'the instructions', 10, (533, 390))
-        self._rule11 = Text(self._win, '7.  You land in Jail when... (1) ' +
-                            'your token lands on the space "Go to Jail";', 10,
-                            (585, 410))
-        self._rule12 = Text(self._win, '(2) you draw a card marked "Go to ' +
-                            'Jail"; or (3) you roll doubles three times', 10,
-                            (605, 430))
-        self._rule13 = Text(self._win, 'in succession - when you are sent ' +
-                            'to jail, you do not pass "GO"', 10, (575, 450))
-        self._rule14 = Text(self._win, '(no other penalties are incurred)', 10,
-                            (480, 470))
-        self._rule15 = Text(self._win, '8.  You declare bankrupcy if you ' +
-                            'owe more than you can pay either to another', 10,
-                            (585, 490))
-        self._rule16 = Text(self._win, 'player or to the Bank - only cash ' +
-                            'savings can be put towards payments;', 10,
-                            (589, 510))
-        self._rule17 = Text(self._win, 'you may not mortgage properties', 10,
-                            (476, 530))
+        self._rules = self.reuse_text('Monopoly Rules', 25, (600, 180))
+        self._rule1 = self.reuse_text('1.  Each player starts on "GO"', 10,
+                                      (460, 210))
+        self._rule2 = self.reuse_text('2.  Click the dice to roll - if ' +
+                                      'doubles are thrown you may roll again',
+                                      10, (561, 230))
+        self._rule3 = self.reuse_text('3.  According to the space your ' +
+                                      'token reaches, you may be entiled ' +
+                                      'to buy real', 10, (597, 250))
+        self._rule4 = self.reuse_text('estate or other properties - or ' +
+                                      'obliged to pay rent, pay taxes, ' +
+                                      'draw a Chance', 10, (610, 270))
+        self._rule5 = self.reuse_text('or Community Chest card, Go to ' +
+                                      'Jail, etc.', 10, (512, 290))
+        self._rule6 = self.reuse_text('4.  You may buy a property for the ' +
+                                      'price shown next to the deed card', 10,
+                                      (572, 310))
+        self._rule7 = self.reuse_text('5.  When you land on a property owned' +
+                                      ' by another player, the owner collects',
+                                      10, (595, 330))
+        self._rule8 = self.reuse_text('rent from you in accordance with the ' +
+                                      'list printed on its Title Deed card',
+                                      10, (594, 350))
+        self._rule9 = self.reuse_text('6.  When you land on a "Chance" or ' +
+                                      '"Community Chest" space, take a card',
+                                      10, (593, 370))
+        self._rule10 = self.reuse_text('for the indicated deck and follow ' +
+                                       'the instructions', 10, (533, 390))
+        self._rule11 = self.reuse_text('7.  You land in Jail when... (1) ' +
+                                       'your token lands on the space ' +
+                                       '"Go to Jail";', 10, (585, 410))
+        self._rule12 = self.reuse_text('(2) you draw a card marked "Go to ' +
+                                       'Jail"; or (3) you roll doubles ' +
+                                       'three times', 10, (605, 430))
+        self._rule13 = self.reuse_text('in succession - when you are sent ' +
+                                       'to jail, you do not pass "GO"', 10,
+                                       (575, 450))
+        self._rule14 = self.reuse_text('(no other penalties are incurred)', 10,
+                                       (480, 470))
+        self._rule15 = self.reuse_text('8.  You declare bankrupcy if you ' +
+                                       'owe more than you can pay either ' +
+                                       'to another', 10, (585, 490))
+        self._rule16 = self.reuse_text('player or to the Bank - only cash ' +
+                                       'savings can be put towards payments;',
+                                       10, (589, 510))
+        self._rule17 = self.reuse_text('you may not mortgage properties', 10,
+                                       (476, 530))
 
         # creates a list of all the rules and adds all the rules to the window:
         self._rule = [self._rules, self._rule1, self._rule2, self._rule3,
@@ -2069,21 +1894,20 @@ class PopUpWin(EventHandler):
         # calls the function close_button()
         self.close_buttons()
 
-    def tax_choice(self, same_roll):
+    def tax_choice(self):
         """This function creates the information that allows the player to
            choose whether they want to pay 10% or $200."""
 
-        self._same_roll = same_roll
         # sets _type as 'tax':
         self._type = 'tax'
 
         # creates the text for the popup window and adds it to the window:
-        self._tax_explain = Text(self._win, 'You landed on Income Tax!', 25,
-                                 (600, 250))
+        self._tax_explain = self.reuse_text('You landed on Income Tax!', 25,
+                                            (600, 250))
         self._tax_explain.set_depth(1)
         self._win.add(self._tax_explain)
-        self._tax_choice = Text(self._win, 'Choose to either pay $200 or 10%' +
-                                ' of your money.', 15, (600, 300))
+        self._tax_choice = self.reuse_text('Choose to either pay $200 or 10%' +
+                                           ' of your money.', 15, (600, 300))
         self._tax_choice.set_depth(1)
         self._win.add(self._tax_choice)
 
@@ -2093,9 +1917,9 @@ class PopUpWin(EventHandler):
         self._pay_200 = Button(self._win, 100, 70, (670, 400), 'white',
                                'Pay $200', 15, '200')
         self._per.add_handler(self._player, None, None, self._game, None,
-                              None, None, self._pay_200, self)
+                              None, self._pay_200, self)
         self._pay_200.add_handler(self._player, None, None, self._game, None,
-                                  None, None, self._per, self)
+                                  None, self._per, self)
 
     def tax_choice_end(self, money_lost):
         """This function creates information that tells the player how much
@@ -2107,25 +1931,24 @@ class PopUpWin(EventHandler):
 
         # creates the text that says how much was paid and adds it to the
         # window:
-        self._end_tax_text = Text(self._win, 'You paid $' +
-                                  str(money_lost), 20, (600, 350))
+        self._end_tax_text = self.reuse_text('You paid $' + str(money_lost),
+                                             20, (600, 350))
         self._end_tax_text.set_depth(1)
         self._win.add(self._end_tax_text)
 
-    def pay_tax(self, same_roll):
+    def pay_tax(self):
         """This function creates the information that tells the player they
            payed a Luxury Tax."""
 
-        self._same_roll = same_roll
         # sets _type as 'luxury':
         self._type = 'luxury'
 
         # creates the text for the popup window and adds it to the window:
-        self._luxury_explain = Text(self._win, 'You landed on Luxury Tax!', 25,
-                                    (600, 300))
+        self._luxury_explain = self.reuse_text('You landed on Luxury Tax!', 25,
+                                               (600, 300))
         self._luxury_explain.set_depth(1)
         self._win.add(self._luxury_explain)
-        self._luxury_pay = Text(self._win, 'Pay $200', 30, (600, 350))
+        self._luxury_pay = self.reuse_text('Pay $200', 30, (600, 350))
         self._luxury_pay.set_depth(1)
         self._win.add(self._luxury_pay)
 
@@ -2140,40 +1963,38 @@ class PopUpWin(EventHandler):
         self._type = 'roll_again'
 
         # creates the text for the popup and adds it to the window:
-        self._roll_again_text = Text(self._win, 'ROLL AGAIN!', 30, (600, 350))
+        self._roll_again_text = self.reuse_text('ROLL AGAIN!', 30, (600, 350))
         self._roll_again_text.set_depth(1)
         self._win.add(self._roll_again_text)
 
         # calls the function close_buttons():
         self.close_buttons()
 
-    def player_owns(self, same_roll):
+    def player_owns(self):
         """This function creates the information that tells the player that
            they already own the property they landed on."""
 
-        self._same_roll = same_roll
         # sets _type as 'player_owns':
         self._type = 'player_owns'
 
         # creates the text for the popup and adds it to the window:
-        self._already_own_text = Text(self._win, 'You already own this ' +
-                                      'property!', 25, (600, 350))
+        self._already_own_text = self.reuse_text('You already own this ' +
+                                                 'property!', 25, (600, 350))
         self._already_own_text.set_depth(1)
         self._win.add(self._already_own_text)
 
         # calls the function close_buttons():
         self.close_buttons()
 
-    def safe(self, same_roll):
+    def safe(self):
         """This function creates the information that tells the player that
            they landed on a safe spot."""
 
-        self._same_roll = same_roll
         # sets _type as 'safe':
         self._type = 'safe'
 
         # creates the text for the popup and adds it to the window:
-        self._safe_text = Text(self._win, 'You are safe!', 30, (600, 350))
+        self._safe_text = self.reuse_text('You are safe!', 30, (600, 350))
         self._safe_text.set_depth(1)
         self._win.add(self._safe_text)
 
@@ -2188,8 +2009,8 @@ class PopUpWin(EventHandler):
         self._type = 'jail'
 
         # creates the text for the popup and adds it to the window:
-        self._jail_text = Text(self._win, 'You were thrown in jail!', 27,
-                               (600, 350))
+        self._jail_text = self.reuse_text('You were thrown in jail!', 27,
+                                          (600, 350))
         self._jail_text.set_depth(1)
         self._win.add(self._jail_text)
 
@@ -2204,9 +2025,9 @@ class PopUpWin(EventHandler):
         self._type = 'jail free'
 
         # creates the popup window's text and adds it to the window:
-        self._jail_free_ask = Text(self._win, 'Would you like to use your' +
-                                   ' get out of Jail Free card?', 15,
-                                   (600, 300))
+        self._jail_free_ask = self.reuse_text('Would you like to use your' +
+                                              ' get out of Jail Free card?',
+                                              15, (600, 300))
         self._jail_free_ask.set_depth(1)
         self._win.add(self._jail_free_ask)
 
@@ -2216,9 +2037,9 @@ class PopUpWin(EventHandler):
         self._no = Button(self._win, 100, 70, (670, 400), 'white',
                           'NO', 15, 'jail free no')
         self._yes.add_handler(self._player, None, None, self._game, None,
-                              None, None, self._no, self)
+                              None, self._no, self)
         self._no.add_handler(self._player, None, None, self._game, None,
-                             None, None, self._yes, self)
+                             None, self._yes, self)
 
     def jail_free_choice_end(self, answer):
         """This function creates the information that tells the player
@@ -2229,233 +2050,203 @@ class PopUpWin(EventHandler):
             # removes any text from the popup window:
             self._win.remove(self._jail_free_ask)
             # creates popup text and adds it to window:
-            self._jail_free_yes = Text(self._win, 'You used your get' +
-                                       ' out of Jail Free card!', 20,
-                                       (600, 350))
+            self._jail_free_yes = self.reuse_text('You used your get' +
+                                                  ' out of Jail Free card!',
+                                                  20, (600, 350))
             self._jail_free_yes.set_depth(1)
             self._win.add(self._jail_free_yes)
 
         elif answer == 'no':
             # removes any text from the popup window:
             self._win.remove(self._jail_free_ask)
-            # moves the player token to jail and sets the player's piece
-            # location:
+            # moves the player token to jail:
             self._player._player_piece.move_to(self._game._board._locations
                                                [41])
-            self._player.set_piece_loc(11)
             # calls the function jail():
             self.jail()
 
-    def pay(self, properties, same_roll, money_paid, advance=0):
+    def pay(self, table, piece_loc, money_paid, owner):
         """This function creates the information that tells the player
            how much they paid in rent."""
 
-        self._same_roll = same_roll
         # sets _type as 'pay':
         self._type = 'pay'
 
         # creates the text that says which property was landed on and adds it
         # to the window:
-        self._loc_text = Text(self._win, 'You landed on ' +
-                              properties[str(self._player._piece_loc)]['name'],
-                              20, (600, 300))
+        self._loc_text = self.reuse_text('You landed on ' +
+                                         table._names[piece_loc], 20,
+                                         (600, 300))
         self._loc_text.set_depth(1)
         self._win.add(self._loc_text)
 
-        # adds the money paid by the player to the other player:
-        self._game._other._money += money_paid
-
         # creates the text that says how much was payed to the owner and adds
         # it to the window:
-        self._pay_text = Text(self._win, 'You paid Player ' +
-                              str(properties[str(self._player._piece_loc)]
-                                  ['owned']) + ' $' + str(money_paid), 28,
-                              (600, 350))
+        self._pay_text = self.reuse_text('You paid Player ' + str(owner) +
+                                         ' $' + str(money_paid), 28,
+                                         (600, 350))
         self._pay_text.set_depth(1)
         self._win.add(self._pay_text)
 
         # calls the function close_buttons():
         self.close_buttons()
 
-    def cant_buy(self, same_roll, properties):
+    def cant_buy(self, table, piece_loc):
         """This fucntion creates the information that tells the player that
            they don't have enough money to buy the property."""
 
         # sets _type as 'cant buy':
         self._type = 'cant buy'
-        self._same_roll = same_roll
 
         # creates the text for the popup and adds it to the window:
-        self._cant_text1 = Text(self._win, 'You dont have enough money', 20,
-                                (600, 300))
+        self._cant_text1 = self.reuse_text('You dont have enough money', 20,
+                                           (600, 300))
         self._cant_text1.set_depth(1)
         self._win.add(self._cant_text1)
 
-        self._cant_text2 = Text(self._win, 'to buy ' +
-                                properties[str(self._player._piece_loc)]
-                                ['name'], 20, (600, 350))
+        self._cant_text2 = self.reuse_text('to buy ' + table._names[piece_loc],
+                                           20, (600, 350))
         self._cant_text2.set_depth(1)
         self._win.add(self._cant_text2)
 
         # calls the function close_buttons():
         self.close_buttons()
 
-    def chance(self, typ, same_roll=False, spots=None):
+    def chance(self, typ):
         """This function creates the information that tells the player which
            Chance card they picked."""
 
         # sets _type as 'card':
         self._type = 'card'
         self._sub_type = typ
-        self._spots = spots
-        self._same_roll = same_roll
 
         # creates the popup text and adds it to the window:
-        self._card_text = Text(self._win, 'You landed on Chance!', 20,
-                               (600, 250))
+        self._card_text = self.reuse_text('You landed on Chance!', 20,
+                                          (600, 250))
         self._card_text.set_depth(1)
         self._win.add(self._card_text)
 
         # creates the card image and adds it to the window:
-        self._card = Image(self._win, 'blankchance.jpg', 320, 200,
-                           (600, 400))
+        self._card = self.reuse_image('blankchance.jpg', 320, 200, (600, 400))
         self._card.set_depth(3)
         self._win.add(self._card)
 
         # based on the type of card that is picked, the corresponding
         # instructions and images are added to the window:
         if self._sub_type == 'Go':
-            self._card_text1 = Text(self._win, 'Advance to Go', 15,
-                                    (520, 335))
-            self._card_text2 = Text(self._win, 'Collect $200', 15,
-                                    (520, 365))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'chance_go.jpg', 200, 170,
-                                     (655, 400))
+            self._card_text1 = self.reuse_text('Advance to Go', 15, (520, 335))
+            self._card_text2 = self.reuse_text('Collect $200', 15, (520, 365))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('chance_go.jpg', 200, 170,
+                                                (655, 400))
 
         elif self._sub_type == 'Ill Ave':
-            self._card_text1 = Text(self._win, 'Advance to Illinois' +
-                                    ' Avenue', 15, (570, 335))
-            self._card_text2 = Text(self._win, 'If you pass Go,',
-                                    12, (520, 395))
-            self._card_text3 = Text(self._win, 'collect $200', 12,
-                                    (520, 425))
-            self._card_image = Image(self._win, 'chance_ill_ave.jpg', 150,
-                                     130, (675, 420))
+            self._card_text1 = self.reuse_text('Advance to Illinois' +
+                                               ' Avenue', 15, (570, 335))
+            self._card_text2 = self.reuse_text('If you pass Go,', 12,
+                                               (520, 395))
+            self._card_text3 = self.reuse_text('collect $200', 12, (520, 425))
+            self._card_image = self.reuse_image('chance_ill_ave.jpg', 150, 130,
+                                                (675, 420))
 
         elif self._sub_type == 'St Char Plc':
-            self._card_text1 = Text(self._win, 'Advance to St. ' +
-                                    'Charles Place', 15, (590, 335))
-            self._card_text2 = Text(self._win, 'If you pass Go,',
-                                    12, (520, 395))
-            self._card_text3 = Text(self._win, 'collect $200', 12,
-                                    (520, 425))
-            self._card_image = Image(self._win, 'chance_st_char.jpg', 150,
-                                     120, (675, 420))
+            self._card_text1 = self.reuse_text('Advance to St. ' +
+                                               'Charles Place', 15, (590, 335))
+            self._card_text2 = self.reuse_text('If you pass Go,', 12,
+                                               (520, 395))
+            self._card_text3 = self.reuse_text('collect $200', 12, (520, 425))
+            self._card_image = self.reuse_image('chance_st_char.jpg', 150, 120,
+                                                (675, 420))
 
         elif self._sub_type == 'Util':
-            self._card_text1 = Text(self._win, 'Advance to nearest ' +
-                                    'utility', 15, (590, 335))
-            self._card_text2 = Text(self._win, 'If you pass Go,',
-                                    12, (520, 395))
-            self._card_text3 = Text(self._win, 'collect $200', 12,
-                                    (520, 425))
-            self._card_image = Image(self._win, 'chance_util.jpg', 120, 145,
-                                     (675, 420))
+            self._card_text1 = self.reuse_text('Advance to nearest ' +
+                                               'utility', 15, (590, 335))
+            self._card_text2 = self.reuse_text('If you pass Go,', 12,
+                                               (520, 395))
+            self._card_text3 = self.reuse_text('collect $200', 12, (520, 425))
+            self._card_image = self.reuse_image('chance_util.jpg', 120, 145,
+                                                (675, 420))
 
         elif self._sub_type == 'Rail':
-            self._card_text1 = Text(self._win, 'Advance to nearest ' +
-                                    'railroad', 15, (590, 335))
-            self._card_text2 = Text(self._win, 'If you pass Go,',
-                                    12, (520, 395))
-            self._card_text3 = Text(self._win, 'collect $200', 12,
-                                    (520, 425))
-            self._card_image = Image(self._win, 'chance_railroad.png', 150,
-                                     90, (675, 420))
+            self._card_text1 = self.reuse_text('Advance to nearest ' +
+                                               'railroad', 15, (590, 335))
+            self._card_text2 = self.reuse_text('If you pass Go,', 12,
+                                               (520, 395))
+            self._card_text3 = self.reuse_text('collect $200', 12, (520, 425))
+            self._card_image = self.reuse_image('chance_railroad.png', 150, 90,
+                                                (675, 420))
 
         elif self._sub_type == '$50 Div':
-            self._card_text1 = Text(self._win, 'Bank pays you ' +
-                                    'dividend of $50', 15, (600, 335))
-            self._card_text2 = Text(self._win, '', 1, (1500, 0))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'chance_div.jpg', 150, 70,
-                                     (675, 420))
+            self._card_text1 = self.reuse_text('Bank pays you ' +
+                                               'dividend of $50', 15,
+                                               (600, 335))
+            self._card_text2 = self.reuse_text('', 1, (1500, 0))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('chance_div.jpg', 150, 70,
+                                                (675, 420))
 
         elif self._sub_type == 'Jail Free':
-            self._card_text1 = Text(self._win, 'Get out of',
-                                    15, (520, 375))
-            self._card_text2 = Text(self._win, 'jail free', 15,
-                                    (520, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'chance_jail_free.jpg', 150,
-                                     150, (675, 420))
+            self._card_text1 = self.reuse_text('Get out of', 15, (520, 375))
+            self._card_text2 = self.reuse_text('jail free', 15, (520, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('chance_jail_free.jpg', 150,
+                                                150, (675, 420))
 
         elif self._sub_type == 'Back 3':
-            self._card_text1 = Text(self._win, 'Go back', 15,
-                                    (520, 375))
-            self._card_text2 = Text(self._win, '3 spaces', 15,
-                                    (520, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'chance_back_3.jpg', 150,
-                                     130, (675, 420))
+            self._card_text1 = self.reuse_text('Go back', 15, (520, 375))
+            self._card_text2 = self.reuse_text('3 spaces', 15, (520, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('chance_back_3.jpg', 150, 130,
+                                                (675, 420))
 
         elif self._sub_type == 'Go Jail':
-            self._card_text1 = Text(self._win, 'Go to Jail', 15,
-                                    (520, 375))
-            self._card_text2 = Text(self._win, 'Do not pass go', 15,
-                                    (520, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'chance_go_jail.jpg', 150,
-                                     70, (675, 420))
+            self._card_text1 = self.reuse_text('Go to Jail', 15, (520, 375))
+            self._card_text2 = self.reuse_text('Do not pass go', 15,
+                                               (520, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('chance_go_jail.jpg', 150, 70,
+                                                (675, 420))
 
         elif self._sub_type == 'Poor Tax':
-            self._card_text1 = Text(self._win, 'Pay poor',
-                                    15, (520, 375))
-            self._card_text2 = Text(self._win, 'tax of $15', 15,
-                                    (520, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'chance_pay_tax.jpg', 130,
-                                     150, (675, 420))
+            self._card_text1 = self.reuse_text('Pay poor', 15, (520, 375))
+            self._card_text2 = self.reuse_text('tax of $15', 15, (520, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('chance_pay_tax.jpg', 130, 150,
+                                                (675, 420))
 
         elif self._sub_type == 'Read Rail':
-            self._card_text1 = Text(self._win, 'Advance to Reading' +
-                                    ' Railroad', 15, (590, 335))
-            self._card_text2 = Text(self._win, 'If you pass Go,',
-                                    12, (520, 395))
-            self._card_text3 = Text(self._win, 'collect $200', 12,
-                                    (520, 425))
-            self._card_image = Image(self._win, 'chance_railroad.png', 150,
-                                     85, (675, 420))
+            self._card_text1 = self.reuse_text('Advance to Reading' +
+                                               ' Railroad', 15, (590, 335))
+            self._card_text2 = self.reuse_text('If you pass Go,', 12,
+                                               (520, 395))
+            self._card_text3 = self.reuse_text('collect $200', 12, (520, 425))
+            self._card_image = self.reuse_image('chance_railroad.png', 150, 85,
+                                                (675, 420))
 
         elif self._sub_type == 'Boardwalk':
-            self._card_text1 = Text(self._win, 'Advance to Boardwalk',
-                                    15, (590, 335))
-            self._card_text2 = Text(self._win, 'If you pass Go,',
-                                    12, (520, 395))
-            self._card_text3 = Text(self._win, 'collect $200', 12,
-                                    (520, 425))
-            self._card_image = Image(self._win, 'chance_boardwalk.jpg', 150,
-                                     80, (675, 420))
+            self._card_text1 = self.reuse_text('Advance to Boardwalk', 15,
+                                               (590, 335))
+            self._card_text2 = self.reuse_text('If you pass Go,', 12,
+                                               (520, 395))
+            self._card_text3 = self.reuse_text('collect $200', 12, (520, 425))
+            self._card_image = self.reuse_image('chance_boardwalk.jpg', 150,
+                                                80, (675, 420))
 
         elif self._sub_type == 'Chairman':
-            self._card_text1 = Text(self._win, 'You have been',
-                                    15, (530, 345))
-            self._card_text2 = Text(self._win, 'elected Chairman', 15,
-                                    (530, 375))
-            self._card_text3 = Text(self._win, 'Pay each player $50',
-                                    12, (530, 415))
-            self._card_image = Image(self._win, 'chance_chairman.jpg',
-                                     150, 120, (675, 420))
+            self._card_text1 = self.reuse_text('You have been', 15, (530, 345))
+            self._card_text2 = self.reuse_text('elected Chairman', 15,
+                                               (530, 375))
+            self._card_text3 = self.reuse_text('Pay each player $50', 12,
+                                               (530, 415))
+            self._card_image = self.reuse_image('chance_chairman.jpg', 150,
+                                                120, (675, 420))
 
         elif self._sub_type == 'Loan Matures':
-            self._card_text1 = Text(self._win, 'Your building',
-                                    15, (530, 345))
-            self._card_text2 = Text(self._win, 'loan matures', 15,
-                                    (530, 375))
-            self._card_text3 = Text(self._win, 'Collect $150', 12,
-                                    (530, 415))
-            self._card_image = Image(self._win, 'chance_loan.jpg', 130, 150,
-                                     (675, 420))
+            self._card_text1 = self.reuse_text('Your building', 15, (530, 345))
+            self._card_text2 = self.reuse_text('loan matures', 15, (530, 375))
+            self._card_text3 = self.reuse_text('Collect $150', 12, (530, 415))
+            self._card_image = self.reuse_image('chance_loan.jpg', 130, 150,
+                                                (675, 420))
 
         self._card_text1.set_depth(1)
         self._card_text2.set_depth(1)
@@ -2469,157 +2260,137 @@ class PopUpWin(EventHandler):
         # calls the function close_buttons():
         self.close_buttons()
 
-    def community(self, typ, same_roll=False):
+    def community(self, typ):
         """This function creates the information that tells the player which
            Community Chest card they picked."""
 
-        self._spots = None
         # sets _type as 'card':
         self._type = 'card'
         self._sub_type = typ
-        self._same_roll = same_roll
 
         # creates the popup text and adds it to the window:
-        self._card_text = Text(self._win, 'You landed on Community Chest!',
-                               20, (600, 250))
+        self._card_text = self.reuse_text('You landed on Community Chest!', 20,
+                                          (600, 250))
         self._card_text.set_depth(1)
         self._win.add(self._card_text)
 
         # creates the card image and adds it to the window:
-        self._card = Image(self._win, 'blankcomm.jpg', 320, 200,
-                           (600, 400))
+        self._card = self.reuse_image('blankcomm.jpg', 320, 200, (600, 400))
         self._card.set_depth(3)
         self._win.add(self._card)
 
         # based on the type of card that is picked, the corresponding
         # instructions and images are added to the window:
         if self._sub_type == 'Go':
-            self._card_text1 = Text(self._win, 'Advance to Go', 15,
-                                    (520, 335))
-            self._card_text2 = Text(self._win, 'Collect $200', 15,
-                                    (520, 365))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_go.jpg', 200, 170,
-                                     (655, 400))
+            self._card_text1 = self.reuse_text('Advance to Go', 15, (520, 335))
+            self._card_text2 = self.reuse_text('Collect $200', 15, (520, 365))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_go.jpg', 200, 170,
+                                                (655, 400))
 
         elif self._sub_type == 'Bank Error':
-            self._card_text1 = Text(self._win, 'Bank error in',
-                                    15, (530, 345))
-            self._card_text2 = Text(self._win, 'your favor', 15,
-                                    (530, 375))
-            self._card_text3 = Text(self._win, 'Collect $200', 12,
-                                    (530, 415))
-            self._card_image = Image(self._win, 'comm_bank_err.jpg', 150,
-                                     130, (675, 420))
+            self._card_text1 = self.reuse_text('Bank error in', 15, (530, 345))
+            self._card_text2 = self.reuse_text('your favor', 15, (530, 375))
+            self._card_text3 = self.reuse_text('Collect $200', 12, (530, 415))
+            self._card_image = self.reuse_image('comm_bank_err.jpg', 150, 130,
+                                                (675, 420))
 
         elif self._sub_type == 'Doc Fee':
-            self._card_text1 = Text(self._win, "Doctor's fees",
-                                    15, (520, 375))
-            self._card_text2 = Text(self._win, 'Pay $50', 15,
-                                    (520, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_doc_fee.jpg', 150,
-                                     130, (675, 420))
+            self._card_text1 = self.reuse_text("Doctor's fees", 15, (520, 375))
+            self._card_text2 = self.reuse_text('Pay $50', 15, (520, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_doc_fee.jpg', 150, 130,
+                                                (675, 420))
 
         elif self._sub_type == 'Jail Free':
-            self._card_text1 = Text(self._win, 'Get out of',
-                                    15, (520, 375))
-            self._card_text2 = Text(self._win, 'jail free', 15,
-                                    (520, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_jail_free.jpg', 180,
-                                     150, (655, 420))
+            self._card_text1 = self.reuse_text('Get out of', 15, (520, 375))
+            self._card_text2 = self.reuse_text('jail free', 15, (520, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_jail_free.jpg', 180, 150,
+                                                (655, 420))
 
         elif self._sub_type == 'Go Jail':
-            self._card_text1 = Text(self._win, 'Go to Jail', 15,
-                                    (520, 375))
-            self._card_text2 = Text(self._win, 'Do not pass go', 15,
-                                    (520, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_go_jail.jpg', 150,
-                                     120, (675, 420))
+            self._card_text1 = self.reuse_text('Go to Jail', 15, (520, 375))
+            self._card_text2 = self.reuse_text('Do not pass go', 15,
+                                               (520, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_go_jail.jpg', 150, 120,
+                                                (675, 420))
 
         elif self._sub_type == 'Opera':
-            self._card_text1 = Text(self._win, 'Grand Opera Night',
-                                    15, (590, 335))
-            self._card_text2 = Text(self._win, 'Collect $50 from every',
-                                    12, (530, 395))
-            self._card_text3 = Text(self._win, 'player for seats', 12,
-                                    (530, 425))
-            self._card_image = Image(self._win, 'comm_opera.jpg', 130,
-                                     150, (675, 420))
+            self._card_text1 = self.reuse_text('Grand Opera Night', 15,
+                                               (590, 335))
+            self._card_text2 = self.reuse_text('Collect $50 from every', 12,
+                                               (530, 395))
+            self._card_text3 = self.reuse_text('player for seats', 12,
+                                               (530, 425))
+            self._card_image = self.reuse_image('comm_opera.jpg', 130, 150,
+                                                (675, 420))
 
         elif self._sub_type == 'Holiday':
-            self._card_text1 = Text(self._win, 'Holiday Fund matures',
-                                    12, (530, 375))
-            self._card_text2 = Text(self._win, 'Collect $100', 12,
-                                    (530, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_holiday.jpg', 130,
-                                     130, (675, 420))
+            self._card_text1 = self.reuse_text('Holiday Fund matures', 12,
+                                               (530, 375))
+            self._card_text2 = self.reuse_text('Collect $100', 12, (530, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_holiday.jpg', 130, 130,
+                                                (675, 420))
 
         elif self._sub_type == 'Income Refund':
-            self._card_text1 = Text(self._win, 'Income tax refund',
-                                    12, (530, 375))
-            self._card_text2 = Text(self._win, 'Collect $20', 12,
-                                    (530, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_holiday.jpg', 130,
-                                     130, (675, 420))
+            self._card_text1 = self.reuse_text('Income tax refund', 12,
+                                               (530, 375))
+            self._card_text2 = self.reuse_text('Collect $20', 12, (530, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_holiday.jpg', 130, 130,
+                                                (675, 420))
 
         elif self._sub_type == 'Life Insur':
-            self._card_text1 = Text(self._win, 'Life insurance matures',
-                                    12, (530, 375))
-            self._card_text2 = Text(self._win, 'Collect $100', 12,
-                                    (530, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_life_insur.jpg', 130,
-                                     130, (675, 420))
+            self._card_text1 = self.reuse_text('Life insurance matures', 12,
+                                               (530, 375))
+            self._card_text2 = self.reuse_text('Collect $100', 12, (530, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_life_insur.jpg', 130,
+                                                130, (675, 420))
 
         elif self._sub_type == 'Hosp Fee':
-            self._card_text1 = Text(self._win, 'Pay hospital fees',
-                                    15, (530, 375))
-            self._card_text2 = Text(self._win, 'of $100', 15,
-                                    (530, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_hosp_fee.jpg', 130,
-                                     110, (675, 420))
+            self._card_text1 = self.reuse_text('Pay hospital fees', 15,
+                                               (530, 375))
+            self._card_text2 = self.reuse_text('of $100', 15, (530, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_hosp_fee.jpg', 130, 110,
+                                                (675, 420))
 
         elif self._sub_type == 'Sch Fee':
-            self._card_text1 = Text(self._win, 'Pay school fees',
-                                    15, (530, 375))
-            self._card_text2 = Text(self._win, 'of $150', 15,
-                                    (530, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_sch_fee.jpg', 150,
-                                     150, (675, 420))
+            self._card_text1 = self.reuse_text('Pay school fees', 15,
+                                               (530, 375))
+            self._card_text2 = self.reuse_text('of $150', 15, (530, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_sch_fee.jpg', 150, 150,
+                                                (675, 420))
 
         elif self._sub_type == 'Cons Fee':
-            self._card_text1 = Text(self._win, 'Receive $25',
-                                    15, (530, 375))
-            self._card_text2 = Text(self._win, 'consultancy fee', 15,
-                                    (530, 405))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_cons_fee.jpg', 130,
-                                     120, (675, 420))
+            self._card_text1 = self.reuse_text('Receive $25', 15, (530, 375))
+            self._card_text2 = self.reuse_text('consultancy fee', 15,
+                                               (530, 405))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_cons_fee.jpg', 130, 120,
+                                                (675, 420))
 
         elif self._sub_type == 'Beauty':
-            self._card_text1 = Text(self._win, 'You have won second',
-                                    12, (535, 365))
-            self._card_text2 = Text(self._win, 'prize in a beauty contest',
-                                    12, (535, 395))
-            self._card_text3 = Text(self._win, 'Collect $10', 12,
-                                    (535, 435))
-            self._card_image = Image(self._win, 'comm_beauty.jpg', 130,
-                                     150, (675, 420))
+            self._card_text1 = self.reuse_text('You have won second', 12,
+                                               (535, 365))
+            self._card_text2 = self.reuse_text('prize in a beauty contest', 12,
+                                               (535, 395))
+            self._card_text3 = self.reuse_text('Collect $10', 12, (535, 435))
+            self._card_image = self.reuse_image('comm_beauty.jpg', 130, 150,
+                                                (675, 420))
 
         elif self._sub_type == 'Inherit':
-            self._card_text1 = Text(self._win, 'You inherit $100', 15,
-                                    (520, 355))
-            self._card_text2 = Text(self._win, '', 1, (1500, 0))
-            self._card_text3 = Text(self._win, '', 1, (1500, 0))
-            self._card_image = Image(self._win, 'comm_inherit.jpg', 200, 170,
-                                     (655, 400))
+            self._card_text1 = self.reuse_text('You inherit $100', 15,
+                                               (520, 355))
+            self._card_text2 = self.reuse_text('', 1, (1500, 0))
+            self._card_text3 = self.reuse_text('', 1, (1500, 0))
+            self._card_image = self.reuse_image('comm_inherit.jpg', 200, 170,
+                                                (655, 400))
 
         self._card_text1.set_depth(1)
         self._card_text2.set_depth(1)
@@ -2639,13 +2410,12 @@ class PopUpWin(EventHandler):
         self._type = 'bought house'
 
         # creates the text for the popup and adds it to the window:
-        self._cant_text1 = Text(self._win, 'You bought a house', 20,
-                                (600, 300))
+        self._cant_text1 = self.reuse_text('You bought a house', 20,
+                                           (600, 300))
         self._cant_text1.set_depth(1)
         self._win.add(self._cant_text1)
 
-        self._cant_text2 = Text(self._win, 'on ' +
-                                prop_name, 20, (600, 350))
+        self._cant_text2 = self.reuse_text('on ' + prop_name, 20, (600, 350))
         self._cant_text2.set_depth(1)
         self._win.add(self._cant_text2)
 
@@ -2658,13 +2428,13 @@ class PopUpWin(EventHandler):
         self._type = 'cant buy house'
 
         # creates the text for the popup and adds it to the window:
-        self._cant_text1 = Text(self._win, 'You dont have enough money', 20,
-                                (600, 300))
+        self._cant_text1 = self.reuse_text('You dont have enough money', 20,
+                                           (600, 300))
         self._cant_text1.set_depth(1)
         self._win.add(self._cant_text1)
 
-        self._cant_text2 = Text(self._win, 'to buy a house for ' +
-                                prop_name, 20, (600, 350))
+        self._cant_text2 = self.reuse_text('to buy a house for ' + prop_name,
+                                           20, (600, 350))
         self._cant_text2.set_depth(1)
         self._win.add(self._cant_text2)
 
@@ -2676,8 +2446,8 @@ class PopUpWin(EventHandler):
            declare bankrupcy."""
 
         # creates the popup text and adds it to the window:
-        self._bankrupcy_text = Text(self._win, "You don't have enough " +
-                                    "money to pay!", 15, (600, 300))
+        self._bankrupcy_text = self.reuse_text("You don't have enough " +
+                                               "money to pay!", 15, (600, 300))
         self._bankrupcy_text.set_depth(1)
         self._win.add(self._bankrupcy_text)
 
@@ -2687,7 +2457,7 @@ class PopUpWin(EventHandler):
                                         'bankrupcy')
         self._bankrupcy_button.add_handler(self._player, None, None,
                                            self._game, None, None, None,
-                                           None, self)
+                                           self)
 
     def bankrupcy_end(self):
         """This function creates the information that says which player won
@@ -2696,10 +2466,13 @@ class PopUpWin(EventHandler):
         # removes text already on the popup window:
         self._win.remove(self._bankrupcy_text)
 
+        # the game is over so the dice are no longer needed:
+        self._game.end_game()
+
         # creates the popup text and adds it to the window:
-        self._winner_text = Text(self._win, 'Player ' +
-                                 str(self._game._other._idnum) +
-                                 ' won the game!', 20, (600, 350))
+        winner = self._game._engine._state._winner
+        self._winner_text = self.reuse_text('Player ' + str(winner) +
+                                            ' won the game!', 20, (600, 350))
         self._winner_text.set_depth(1)
         self._win.add(self._winner_text)
 
@@ -2724,158 +2497,187 @@ class PopUpWin(EventHandler):
         self._win.remove(self._x)
         self._win.remove(self._x_text)
 
-        # checks the type of the popup window:
-        if self._type == 'next':
-            # removes the text from the popup window:
-            self._win.remove(self._picked_piece_text)
-            self._win.remove(self._picked)
-            # adds the popup window to the window:
-            self._win.add(self._window)
-            # calls the function pick_pieces with Player 2 picking a token:
-            self.pick_pieces(2)
-
-        elif self._type == 'start':
-            # removes the text from the popup window:
-            self._win.remove(self._picked_piece_text)
-            self._win.remove(self._picked)
-            # calls the function Game.create_players():
-            self._game.create_players()
-
-        elif self._type == 'rules':
-            # adds the popup window to the window:
-            self._win.add(self._window)
-            # removes all the rules from the window:
-            for rule in self._rule:
-                self._win.remove(rule)
-            # calls the function pick_pieces with Player 1 picking a token:
-            self.pick_pieces(1)
-
-        elif self._type == 'tax':
-            # removes text from popup window:
-            self._win.remove(self._end_tax_text)
-            # checks if the player rolled doubles:
-            if self._same_roll:
-                # creates roll again popup window:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button():
-                self._game.add_end_turn_button()
-
-        elif self._type == 'luxury':
-            # removes text from popup window:
-            self._win.remove(self._luxury_explain)
-            self._win.remove(self._luxury_pay)
-            # checks if the player rolled doubles:
-            if self._same_roll:
-                # creates roll again popup window:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button():
-                self._game.add_end_turn_button()
-
-        elif self._type == 'roll_again':
-            # removes text from popup window:
-            self._win.remove(self._roll_again_text)
-
-        elif self._type == 'player_owns':
-            # removes text from popup window:
-            self._win.remove(self._already_own_text)
-            # checks if the player rolled doubles:
-            if self._same_roll:
-                # creates roll again popup window:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button():
-                self._game.add_end_turn_button()
-
-        elif self._type == 'safe':
-            # removes text from popup window:
-            self._win.remove(self._safe_text)
-            # checks if the player rolled doubles:
-            if self._same_roll:
-                # creates roll again popup window:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button():
-                self._game.add_end_turn_button()
-
-        elif self._type == 'jail':
-            # removes text from popup window:
-            self._win.remove(self._jail_text)
-            # calls the function Game.add_end_turn_button():
-            self._game.add_end_turn_button()
-
-        elif self._type == 'pay':
-            # removes text from popup window:
-            self._win.remove(self._loc_text)
-            self._win.remove(self._pay_text)
-            # checks if the player rolled doubles:
-            if self._same_roll:
-                # creates roll again popup window:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button():
-                self._game.add_end_turn_button()
-
-        elif self._type == 'cant buy':
-            # removes text from popup window:
-            self._win.remove(self._cant_text1)
-            self._win.remove(self._cant_text2)
-            # checks if the player rolled doubles:
-            if self._same_roll:
-                # creates roll again popup window:
-                pop_up = PopUpWin(self._win, None, self._game)
-                pop_up.roll_again()
-            else:
-                # calls the function Game.add_end_turn_button():
-                self._game.add_end_turn_button()
-
-        elif self._type == 'card':
-            # removes text from popup window:
-            self._win.remove(self._card_text)
-            self._win.remove(self._card)
-            self._win.remove(self._card_text1)
-            self._win.remove(self._card_text2)
-            self._win.remove(self._card_text3)
-            self._win.remove(self._card_image)
-            # checks if spot action must happen:
-            if self._spots is not None:
-                # calls the function Spots.spot_action():
-                self._spots.spot_action(self._same_roll)
-            else:
-                # checks if the type is "Go Jail":
-                if self._sub_type == 'Go Jail':
-                    # calls the function GamePieces.move_piece():
-                    self._game._game_pieces.move_piece(self._player, 0, True)
-                    # checks if the player rolled doubles:
-                elif self._same_roll:
-                    # creates roll again popup window:
-                    pop_up = PopUpWin(self._win, None, self._game)
-                    pop_up.roll_again()
-                else:
-                    # calls the function Game.add_end_turn_button():
-                    self._game.add_end_turn_button()
-
-        elif self._type == 'jail free':
-            # removes text from popup window:
-            self._win.remove(self._jail_free_yes)
-            # calls the function Game.add_end_turn_button():
-            self._game.add_end_turn_button()
-
-        elif self._type == 'cant buy house' or self._type == 'bought house':
-            # removes text from popup window:
-            self._win.remove(self._cant_text1)
-            self._win.remove(self._cant_text2)
-
-
-
-
-def program(win):
+        # the popup window can be reused once it is closed - this is done
+        # before the next event is shown so that it can use it:
+        if (self._pool is not None and
+                self._type not in ('next', 'start', 'rules')):
+            self._pool.release(self)
+
+        # calls the function registered for the type of the popup window:
+        POPUP_ACTIONS.dispatch(self._type, self)
+
+    def close_next(self):
+        """This function lets Player 2 pick a token once Player 1 has."""
+
+        # removes the text from the popup window:
+        self._win.remove(self._picked_piece_text)
+        self._win.remove(self._picked)
+        # adds the popup window to the window:
+        self._win.add(self._window)
+        # calls the function pick_pieces with Player 2 picking a token:
+        self.pick_pieces(2)
+
+    def close_start(self):
+        """This function starts the game once both tokens are picked."""
+
+        # removes the text from the popup window:
+        self._win.remove(self._picked_piece_text)
+        self._win.remove(self._picked)
+        # calls the function Game.create_players():
+        self._game.create_players()
+
+    def close_rules(self):
+        """This function lets Player 1 pick a token once the rules are
+           closed."""
+
+        # adds the popup window to the window:
+        self._win.add(self._window)
+        # removes all the rules from the window:
+        for rule in self._rule:
+            self._win.remove(rule)
+        # calls the function pick_pieces with Player 1 picking a token:
+        self.pick_pieces(1)
+
+    def close_tax(self):
+        """This function removes the Income Tax payment."""
+
+        # removes text from popup window:
+        self._win.remove(self._end_tax_text)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_luxury(self):
+        """This function removes the Luxury Tax payment."""
+
+        # removes text from popup window:
+        self._win.remove(self._luxury_explain)
+        self._win.remove(self._luxury_pay)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_roll_again(self):
+        """This function removes the roll again message."""
+
+        # removes text from popup window:
+        self._win.remove(self._roll_again_text)
+
+    def close_player_owns(self):
+        """This function removes the already owned message."""
+
+        # removes text from popup window:
+        self._win.remove(self._already_own_text)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_safe(self):
+        """This function removes the safe spot message."""
+
+        # removes text from popup window:
+        self._win.remove(self._safe_text)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_jail(self):
+        """This function removes the jail message."""
+
+        # removes text from popup window:
+        self._win.remove(self._jail_text)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_pay(self):
+        """This function removes the rent payment."""
+
+        # removes text from popup window:
+        self._win.remove(self._loc_text)
+        self._win.remove(self._pay_text)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_cant_buy(self):
+        """This function removes the message that the player can't buy the
+           property."""
+
+        # removes text from popup window:
+        self._win.remove(self._cant_text1)
+        self._win.remove(self._cant_text2)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_card(self):
+        """This function removes the card that was picked."""
+
+        # removes text from popup window:
+        self._win.remove(self._card_text)
+        self._win.remove(self._card)
+        self._win.remove(self._card_text1)
+        self._win.remove(self._card_text2)
+        self._win.remove(self._card_text3)
+        self._win.remove(self._card_image)
+        # calls the function Game.next_event() - any move made by the
+        # card and the action of the spot it moved to are shown next:
+        self._game.next_event()
+
+    def close_jail_free(self):
+        """This function removes the "Jail Free" card message."""
+
+        # removes text from popup window:
+        self._win.remove(self._jail_free_yes)
+        # calls the function Game.next_event():
+        self._game.next_event()
+
+    def close_house(self):
+        """This function removes the house purchase message."""
+
+        # removes text from popup window:
+        self._win.remove(self._cant_text1)
+        self._win.remove(self._cant_text2)
+
+
+# the function each type of popup window performs when it is closed:
+POPUP_ACTIONS = ActionRegistry()
+POPUP_ACTIONS.register('next', PopUpWin.close_next)
+POPUP_ACTIONS.register('start', PopUpWin.close_start)
+POPUP_ACTIONS.register('rules', PopUpWin.close_rules)
+POPUP_ACTIONS.register('tax', PopUpWin.close_tax)
+POPUP_ACTIONS.register('luxury', PopUpWin.close_luxury)
+POPUP_ACTIONS.register('roll_again', PopUpWin.close_roll_again)
+POPUP_ACTIONS.register('player_owns', PopUpWin.close_player_owns)
+POPUP_ACTIONS.register('safe', PopUpWin.close_safe)
+POPUP_ACTIONS.register('jail', PopUpWin.close_jail)
+POPUP_ACTIONS.register('pay', PopUpWin.close_pay)
+POPUP_ACTIONS.register('cant buy', PopUpWin.close_cant_buy)
+POPUP_ACTIONS.register('card', PopUpWin.close_card)
+POPUP_ACTIONS.register('jail free', PopUpWin.close_jail_free)
+POPUP_ACTIONS.register('cant buy house', PopUpWin.close_house)
+POPUP_ACTIONS.register('bought house', PopUpWin.close_house)
+
+
+# times the phases of a turn when the game is started with --profile:
+PROFILER = PhaseProfiler()
+PROFILER.hook(DieHandler, 'roll', 'roll')
+PROFILER.hook(GamePieces, 'move_piece', 'move')
+PROFILER.hook(GameEngine, 'spot_action', 'spot action')
+PROFILER.hook(GameManager, 'show_event', 'show event')
+PROFILER.hook(GameEngine, 'draw_card', 'card draw')
+PROFILER.hook(PopUpWin, 'chance', 'card popup')
+PROFILER.hook(PopUpWin, 'community', 'card popup')
+PROFILER.hook(PopUpPool, 'open', 'popup')
+PROFILER.hook(GameManager, 'end_turn', 'end turn')
+
+# the file the timings are written to, if the phases are timed:
+PROFILE_FILE = None
+
+
+def write_profile(filename):
+    """This function writes the timings of the phases of a turn and of the
+       buttons and popup windows that were clicked to a JSON file."""
+
+    PROFILER.write(filename, {'buttons': BUTTON_ACTIONS.stats(),
+                              'popups': POPUP_ACTIONS.stats()})
+
+
+def program(win, save_file=None, resume=None):
     """This function starts the game by adjusting the window size and calling
        GameManager."""
 
@@ -2883,14 +2685,44 @@ def program(win):
     win.set_height(700)
     win.set_width(1200)
 
-    GameManager(win)
+    GameManager(win, save_file, resume)
 
 
 def main():
     """This function starts the GraphicsPackage and calls the function
        program."""
 
-    StartGraphicsSystem(program)
+    global PROFILE_FILE
+
+    parser = argparse.ArgumentParser(description='Play Monopoly.')
+    parser.add_argument('--profile', metavar='FILE', default=None,
+                        help='time each phase of a turn and write the '
+                             'timings to FILE after every turn and when '
+                             'the game is closed')
+    parser.add_argument('--save', metavar='FILE', default=None,
+                        help='save the game to FILE after every turn')
+    parser.add_argument('--resume', metavar='FILE', default=None,
+                        help='continue the game saved in FILE')
+    args = parser.parse_args()
+
+    # loads the saved game before the window is opened so that a file that
+    # can't be continued is reported on the command line:
+    resume = None
+    if args.resume is not None:
+        try:
+            resume = snapshot.load(args.resume)
+        except (OSError, ValueError) as error:
+            parser.error('cannot resume %s: %s' % (args.resume, error))
+        if len(resume[0]._players) != 2:
+            parser.error('cannot resume %s: only two-player games can be '
+                         'shown' % args.resume)
+
+    if args.profile is not None:
+        PROFILE_FILE = args.profile
+        PROFILER.enable()
+        atexit.register(write_profile, args.profile)
+
+    StartGraphicsSystem(lambda win: program(win, args.save, resume))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,210 @@
+"""
+ *****************************************************************************
+   FILE:  markov.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This program finds the exact probability of a player's token
+                ending a roll on each spot of the board. The position of a
+                token after each roll is a Markov chain whose states are the
+                spot (1 to 40, or 41 for being in jail) and the number of
+                doubles rolled in succession (0 to 2). The chain follows the
+                rules of engine.GameEngine: two dice, three doubles in a row
+                send the player to jail without moving, "Go to Jail" sends
+                the player to jail, and the Chance and Community Chest cards
+                can move the player. The "Jail Free" card is not modeled -
+                players always go to jail.
+
+ *****************************************************************************
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from batch import (CHANCE, CHANCE_TABLES, COMM_TABLES, COMMUNITY, GO_JAIL,
+                   build_tables)
+from engine import GameEngine, GameRandom, load_board
+from simulate import Bot
+
+
+# the state for a player in jail - their next roll moves from spot 11:
+JAIL = 41
+
+
+def landing_outcomes(spot_type, piece_loc):
+    """Given the spot a token moved to, this function returns a dictionary of
+       the spots it ends on (after any card moves or being sent to jail) and
+       their probabilities."""
+
+    kind = spot_type[piece_loc]
+
+    if kind == GO_JAIL:
+        return {JAIL: 1.0}
+
+    if kind != CHANCE and kind != COMMUNITY:
+        return {piece_loc: 1.0}
+
+    # every card of a shuffled deck is drawn equally often:
+    dest, passes_go, money, others, jails, jail_frees = (
+        CHANCE_TABLES if kind == CHANCE else COMM_TABLES)
+    outcomes = {}
+    for card in range(len(money)):
+        if jails[card]:
+            card_outcomes = {JAIL: 1.0}
+        elif dest[card, piece_loc] > 0:
+            # the spot the card moves the token to is resolved as well:
+            card_outcomes = landing_outcomes(spot_type,
+                                             int(dest[card, piece_loc]))
+        else:
+            card_outcomes = {piece_loc: 1.0}
+        for spot in card_outcomes:
+            outcomes[spot] = (outcomes.get(spot, 0.0) +
+                              card_outcomes[spot] / len(money))
+    return outcomes
+
+
+def transition_matrix(board):
+    """Given the BoardTable of the board, this function builds the
+       transition matrix of the chain. State
+       3 * (spot - 1) + doubles is the token on spot (1 to 41) after
+       rolling doubles in succession doubles (0 to 2) times."""
+
+    spot_type = build_tables(board)[0]
+    matrix = np.zeros((41 * 3, 41 * 3))
+
+    # finds the outcomes of landing on each spot once:
+    outcomes = {}
+    for piece_loc in range(1, 41):
+        outcomes[piece_loc] = landing_outcomes(spot_type, piece_loc)
+
+    for spot in range(1, 42):
+        # a player in jail moves from "Just Visiting":
+        from_loc = 11 if spot == JAIL else spot
+
+        for doubles in range(3):
+            row = 3 * (spot - 1) + doubles
+
+            for die1 in range(1, 7):
+                for die2 in range(1, 7):
+                    # the third doubles in succession sends the player to
+                    # jail without moving:
+                    if die1 == die2 and doubles == 2:
+                        matrix[row, 3 * (JAIL - 1)] += 1 / 36
+                        continue
+
+                    piece_loc = (from_loc + die1 + die2 - 1) % 40 + 1
+                    for end in outcomes[piece_loc]:
+                        # being sent to jail ends the player's rolls:
+                        if die1 == die2 and end != JAIL:
+                            col = 3 * (end - 1) + doubles + 1
+                        else:
+                            col = 3 * (end - 1)
+                        matrix[row, col] += outcomes[piece_loc][end] / 36
+
+    return matrix
+
+
+def stationary_distribution(matrix):
+    """This function solves for the distribution that the transition matrix
+       leaves unchanged."""
+
+    # solves (P^T - I) x = 0 with one of the equations replaced by the
+    # probabilities adding up to 1:
+    size = len(matrix)
+    system = matrix.T - np.eye(size)
+    system[-1, :] = 1.0
+    right = np.zeros(size)
+    right[-1] = 1.0
+    return np.linalg.solve(system, right)
+
+
+def landing_probabilities(board):
+    """This function returns an array of the probability of a roll ending on
+       each spot. Index i is spot i (1 to 40) and index 41 is jail - index 0
+       is unused."""
+
+    distribution = stationary_distribution(transition_matrix(board))
+    probabilities = np.zeros(42)
+    probabilities[1:] = distribution.reshape(41, 3).sum(axis=1)
+    return probabilities
+
+
+def count_landings(board, num_rolls, seed=None):
+    """This function plays games between bots with the rules engine and
+       returns the fraction of rolls that ended on each spot (indexed like
+       landing_probabilities()). * Used to check the simulator against the
+       exact probabilities - "Jail Free" cards are never used"""
+
+    counts = np.zeros(42)
+    rng = GameRandom(seed)
+    bot = Bot()
+    engine = GameEngine(board, rng.spawn(1)[0])
+    rolls = 0
+
+    while rolls < num_rolls:
+        state = engine._state
+        phase = state._phase
+
+        if phase == 'roll':
+            events = engine.roll()
+            rolls += 1
+            if ('jail',) in events or state._phase == 'jail free':
+                counts[JAIL] += 1
+            else:
+                counts[engine.player()._piece_loc] += 1
+        elif phase == 'buy':
+            engine.buy()
+        elif phase == 'tax':
+            engine.pay_income_tax(bot.income_tax(engine))
+        elif phase == 'jail free':
+            engine.jail_free_choice(False)
+        elif phase == 'end':
+            engine.end_turn()
+        else:
+            # starts a new game with its own stream once one is over:
+            engine = GameEngine(board, rng.spawn(1)[0])
+
+    return counts / counts.sum()
+
+
+def main():
+    """This function prints the probability of landing on each spot and can
+       check them against the rules engine."""
+
+    parser = argparse.ArgumentParser(description='Find the exact landing '
+                                                 'probabilities of the '
+                                                 'board.')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    parser.add_argument('--check', type=int, default=0, metavar='ROLLS',
+                        help='also simulate this many rolls and compare')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed of the simulated rolls')
+    args = parser.parse_args()
+
+    board = load_board(args.board)
+    probabilities = landing_probabilities(board)
+    if args.check > 0:
+        simulated = count_landings(board, args.check, args.seed)
+
+    for spot in range(1, 42):
+        if spot == JAIL:
+            name = 'In Jail'
+        else:
+            name = board._names[spot]
+        line = '%2d  %-24s %.5f' % (spot, name, probabilities[spot])
+        if args.check > 0:
+            line += '  %.5f' % simulated[spot]
+        sys.stdout.write(line + '\n')
+
+    if args.check > 0:
+        sys.stdout.write('largest difference: %.5f\n' %
+                         np.abs(probabilities - simulated).max())
+
+
+if __name__ == '__main__':
+    main()
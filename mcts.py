@@ -0,0 +1,359 @@
+"""
+ *****************************************************************************
+   FILE:  mcts.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This module contains a bot that makes its decisions (buying
+                a property, using a "Jail Free" card and building houses)
+                with Monte Carlo tree search on the rules engine. For each
+                decision it plays as many games forward from the current
+                state as it can in a given amount of time, choosing its own
+                decisions in the tree with UCB1 and the rest of the moves
+                with simulate.Bot, and picks the choice that was tried the
+                most. The nodes of the tree are kept in a transposition table
+                keyed by the state of the game, so states reached by
+                different orders of events share a node and the tree built
+                for one decision is reused by the decisions of later turns.
+
+ *****************************************************************************
+"""
+
+import argparse
+import math
+import sys
+import time
+
+from engine import DEED, MAX_HOUSES, GameEngine, GameRandom, load_board
+from simulate import Bot, play_game
+
+
+class TreeNode(object):
+    """This class holds the statistics of one decision: the choices, the
+       number of times each was tried and the total reward it got."""
+
+    __slots__ = ('_actions', '_counts', '_rewards', '_visits')
+
+    # the constructor for the TreeNode class:
+    def __init__(self, actions):
+
+        self._actions = actions
+        self._counts = [0] * len(actions)
+        self._rewards = [0.0] * len(actions)
+        self._visits = 0
+
+    def select(self, exploration):
+        """This function returns the index of the choice to try next: each
+           choice once, then the choice with the best UCB1 score."""
+
+        for i in range(len(self._actions)):
+            if self._counts[i] == 0:
+                return i
+
+        log_visits = math.log(self._visits)
+        best = 0
+        best_score = -1.0
+        for i in range(len(self._actions)):
+            score = (self._rewards[i] / self._counts[i] + exploration *
+                     math.sqrt(log_visits / self._counts[i]))
+            if score > best_score:
+                best = i
+                best_score = score
+        return best
+
+    def update(self, index, reward):
+        """This function adds the reward of a game to the choice."""
+
+        self._visits += 1
+        self._counts[index] += 1
+        self._rewards[index] += reward
+
+    def best(self):
+        """This function returns the index of the choice tried the most."""
+
+        return self._counts.index(max(self._counts))
+
+
+class MctsBot(Bot):
+    """This class makes the decisions of a player with Monte Carlo tree
+       search. Each decision searches for budget seconds (or for
+       max_iterations games, if given) and the games are played forward for
+       at most horizon turns before the position is scored. * The Income Tax
+       is not searched since the cheaper payment is always better"""
+
+    # the constructor for the MctsBot class:
+    def __init__(self, budget=0.1, max_iterations=None, horizon=40,
+                 exploration=1.4, max_nodes=200000, seed=None, reserve=0):
+
+        # the search needs a time budget or a number of games to stop:
+        if budget is None and max_iterations is None:
+            raise ValueError('budget or max_iterations must be given')
+
+        Bot.__init__(self, reserve)
+        self._budget = budget
+        self._max_iterations = max_iterations
+        self._horizon = horizon
+        self._exploration = exploration
+        self._max_nodes = max_nodes
+
+        # the transposition table of TreeNodes, kept between decisions:
+        self._table = {}
+
+        # the generator that each game played forward gets a child of, and
+        # the bot that makes every move outside of the tree:
+        self._rng = GameRandom(seed)
+        self._rollout_bot = Bot(reserve)
+
+    def buy(self, engine):
+        """This function returns True if the bot buys the property it landed
+           on."""
+
+        return self.search(engine, [True, False])
+
+    def use_jail_free(self, engine):
+        """This function returns True if the bot uses its "Jail Free" card."""
+
+        return self.search(engine, [True, False])
+
+    def build_houses(self, engine):
+        """This function buys houses one at a time, searching which property
+           to build on next or whether to stop."""
+
+        while True:
+            actions = self.house_actions(engine)
+            if len(actions) == 1:
+                return
+            piece_loc = self.search(engine, actions)
+            if piece_loc == 0:
+                return
+            events = engine.buy_house(piece_loc)
+            if len(events) == 0 or events[0][0] != 'house':
+                return
+
+    def house_actions(self, engine):
+        """This function returns the properties the active player can build
+           a house on, after 0 for not building."""
+
+        board = engine._board
+        player = engine.player()
+        actions = [0]
+        for piece_loc in player._properties:
+            if (board._kinds[piece_loc] == DEED and
+                    engine.owns_set(piece_loc) and
+                    engine.get_houses(piece_loc) < MAX_HOUSES and
+                    player._money - board._house_costs[piece_loc] >
+                    self._reserve):
+                actions.append(piece_loc)
+        return actions
+
+    def state_key(self, state, actions):
+        """This function returns the key of a decision in the transposition
+           table. * Money is rounded to $25 so that nearly equal states share
+           a node"""
+
+        players = []
+        for player in state._players:
+            players.append((player._piece_loc, player._money // 25,
+                            player._jail_free))
+        return (bytes(state._owned), bytes(state._houses), tuple(players),
+                state._turn, state._phase, tuple(actions))
+
+    def node(self, state, actions):
+        """This function returns the TreeNode of a decision and whether it
+           was just created."""
+
+        key = self.state_key(state, actions)
+        node = self._table.get(key)
+        if node is not None:
+            return node, False
+        node = TreeNode(actions)
+        self._table[key] = node
+        return node, True
+
+    def search(self, engine, actions):
+        """This function searches the decision of the active player between
+           the given choices and returns the best one."""
+
+        # forgets the tree once it gets too big:
+        if len(self._table) > self._max_nodes:
+            self._table.clear()
+
+        root = self.node(engine._state, actions)[0]
+        deadline = None
+        if self._budget is not None:
+            deadline = time.perf_counter() + self._budget
+
+        iterations = 0
+        while True:
+            if (self._max_iterations is not None and
+                    iterations >= self._max_iterations):
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self.playout(engine, root)
+            iterations += 1
+
+        return root._actions[root.best()]
+
+    def playout(self, engine, root):
+        """This function plays one game forward from the engine's state on a
+           copy, choosing the bot's decisions with the tree until it reaches
+           a decision it hasn't seen, and adds the reward to every decision
+           it chose."""
+
+        state = engine._state.copy()
+        sim = GameEngine(engine._board, self._rng.spawn(1)[0], state)
+        me = state._turn
+        bot = self._rollout_bot
+        last_turn = state._turns + self._horizon
+
+        # tries a choice of the root decision:
+        index = root.select(self._exploration)
+        path = [(root, index)]
+        self.perform(sim, root._actions[index])
+        in_tree = True
+
+        # choosing not to build at the root ends the turn - otherwise the
+        # state is unchanged and the root would be chosen from again:
+        if state._phase == 'end' and root._actions[index] == 0:
+            sim.end_turn()
+
+        while state._phase != 'over' and state._turns < last_turn:
+            phase = state._phase
+            mine = in_tree and state._turn == me
+
+            if phase == 'roll':
+                sim.roll()
+
+            elif phase == 'tax':
+                sim.pay_income_tax(bot.income_tax(sim))
+
+            elif phase == 'end':
+                # chooses the houses to build in the tree, then ends the
+                # turn - the rollout bot builds for the other players and
+                # once a playout has left the tree:
+                while mine:
+                    actions = self.house_actions(sim)
+                    if len(actions) == 1:
+                        break
+                    node, created = self.node(state, actions)
+                    index = node.select(self._exploration)
+                    path.append((node, index))
+                    in_tree = mine = not created
+                    if actions[index] == 0:
+                        break
+                    sim.buy_house(actions[index])
+                if not mine:
+                    bot.build_houses(sim)
+                sim.end_turn()
+
+            elif mine:
+                node, created = self.node(state, [True, False])
+                index = node.select(self._exploration)
+                path.append((node, index))
+                in_tree = not created
+                self.perform(sim, node._actions[index])
+
+            elif phase == 'buy':
+                if bot.buy(sim):
+                    sim.buy()
+                else:
+                    sim.pass_property()
+
+            else:
+                sim.jail_free_choice(bot.use_jail_free(sim))
+
+        # adds the reward to each decision once, even if a state came up
+        # again in the game:
+        reward = self.reward(sim, me)
+        updated = set()
+        for node, index in path:
+            if id(node) not in updated:
+                updated.add(id(node))
+                node.update(index, reward)
+
+    def perform(self, sim, action):
+        """This function performs a choice of the active player's decision
+           in the given phase."""
+
+        phase = sim._state._phase
+        if phase == 'buy':
+            if action:
+                sim.buy()
+            else:
+                sim.pass_property()
+        elif phase == 'jail free':
+            sim.jail_free_choice(action)
+        elif action != 0:
+            sim.buy_house(action)
+
+    def reward(self, sim, me):
+        """This function scores the game from the point of view of the
+           player at index me: 1 for a win, 0 for a loss, and otherwise the
+           player's share of the money and property value of the game."""
+
+        state = sim._state
+        if state._winner is not None:
+            return 1.0 if state._winner == state._players[me]._idnum else 0.0
+
+        board = sim._board
+        worths = []
+        for player in state._players:
+            worth = player._money
+            for piece_loc in player._properties:
+                worth += (board._prices[piece_loc] +
+                          state._houses[piece_loc] *
+                          board._house_costs[piece_loc])
+            worths.append(max(worth, 0))
+        if sum(worths) == 0:
+            return 0.5
+        return worths[me] / sum(worths)
+
+
+def main():
+    """This function plays games between the MctsBot and simulate.Bot from
+       the command line and prints the number of wins of each."""
+
+    parser = argparse.ArgumentParser(description='Play the tree search bot '
+                                                 'against the simple bot.')
+    parser.add_argument('games', type=int, help='number of games to play')
+    parser.add_argument('--budget', type=float, default=0.05,
+                        help='seconds to search each decision')
+    parser.add_argument('--iterations', type=int, default=None,
+                        help='games to play forward for each decision '
+                             '(instead of a time budget)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first game')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    args = parser.parse_args()
+
+    board = load_board(args.board)
+    budget = args.budget if args.iterations is None else None
+    wins = {'mcts': 0, 'bot': 0, 'none': 0}
+
+    for game in range(args.games):
+        # swaps who plays first every game:
+        mcts = MctsBot(budget, args.iterations, seed=args.seed + game)
+        if game % 2 == 0:
+            bots = [mcts, Bot()]
+        else:
+            bots = [Bot(), mcts]
+        result = play_game(board, args.seed + game, bots)
+        if result['winner'] == 0:
+            wins['none'] += 1
+        elif bots[result['winner'] - 1] is mcts:
+            wins['mcts'] += 1
+        else:
+            wins['bot'] += 1
+
+    sys.stdout.write('games: %d\n' % args.games)
+    sys.stdout.write('mcts wins: %d\n' % wins['mcts'])
+    sys.stdout.write('bot wins: %d\n' % wins['bot'])
+    sys.stdout.write('no winner: %d\n' % wins['none'])
+
+
+if __name__ == '__main__':
+    main()
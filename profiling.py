@@ -0,0 +1,169 @@
+"""
+ *****************************************************************************
+   FILE:  profiling.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This module times the phases of a turn (rolling, moving a
+                token, the action of a spot, cards, popup windows, ending
+                the turn). A PhaseProfiler is given the functions that
+                perform each phase and, only while it is enabled, replaces
+                them with versions that time every call. It keeps the
+                number of calls, total and longest time of each phase and a
+                histogram of the times in buckets that double in size, which
+                can be exported as a dictionary or a JSON file at any time.
+                While it is disabled the original functions are in place,
+                so profiling costs nothing.
+
+ *****************************************************************************
+"""
+
+import functools
+import json
+import time
+
+
+class PhaseStats(object):
+    """This class holds the timings of one phase: the number of calls, the
+       total and longest time, and the number of calls that took less than
+       1, 2, 4, 8, ... microseconds."""
+
+    __slots__ = ('_calls', '_seconds', '_longest', '_buckets')
+
+    # the constructor for the PhaseStats class:
+    def __init__(self):
+
+        self.clear()
+
+    def clear(self):
+        """This function forgets every call."""
+
+        self._calls = 0
+        self._seconds = 0.0
+        self._longest = 0.0
+
+        # the number of calls in each bucket - bucket i holds the calls that
+        # took from 2 ** (i - 1) up to 2 ** i microseconds:
+        self._buckets = []
+
+    def add(self, seconds):
+        """This function adds the time of a call."""
+
+        self._calls += 1
+        self._seconds += seconds
+        if seconds > self._longest:
+            self._longest = seconds
+
+        bucket = int(seconds * 1e6).bit_length()
+        if bucket >= len(self._buckets):
+            self._buckets.extend([0] * (bucket + 1 - len(self._buckets)))
+        self._buckets[bucket] += 1
+
+    def export(self):
+        """This function returns the timings as a dictionary. * The
+           histogram lists the upper bound of each bucket (in microseconds)
+           that has calls and its number of calls"""
+
+        histogram = []
+        for bucket in range(len(self._buckets)):
+            if self._buckets[bucket] > 0:
+                histogram.append([2 ** bucket, self._buckets[bucket]])
+        return {'calls': self._calls,
+                'seconds': self._seconds,
+                'average': self._seconds / max(self._calls, 1),
+                'longest': self._longest,
+                'histogram': histogram}
+
+
+class PhaseProfiler(object):
+    """This class times the functions of the phases it is given while it is
+       enabled. * The time of a phase includes the phases called inside it,
+       e.g. the roll includes moving the token and the action of the spot"""
+
+    # the constructor for the PhaseProfiler class:
+    def __init__(self):
+
+        # the (class, function name, phase) of each function to time:
+        self._hooks = []
+
+        # the original functions replaced while enabled:
+        self._originals = []
+
+        # the PhaseStats of each phase:
+        self._phases = {}
+
+    def hook(self, owner, name, phase):
+        """This function has the function with the given name of a class
+           timed as part of the phase."""
+
+        self._hooks.append((owner, name, phase))
+
+    def enabled(self):
+        """This function returns True if the profiler is timing its
+           phases."""
+
+        return len(self._originals) > 0
+
+    def enable(self):
+        """This function replaces each hooked function with one that times
+           its calls."""
+
+        if self.enabled():
+            return
+        for owner, name, phase in self._hooks:
+            function = owner.__dict__[name]
+            self._originals.append((owner, name, function))
+            setattr(owner, name, self.timed(function, phase))
+
+    def disable(self):
+        """This function puts the hooked functions back."""
+
+        for owner, name, function in self._originals:
+            setattr(owner, name, function)
+        self._originals = []
+
+    def timed(self, function, phase):
+        """This function returns a version of the function that adds the
+           time of each call to the phase."""
+
+        stats = self._phases.setdefault(phase, PhaseStats())
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stats.add(clock() - start)
+
+        return timed_function
+
+    def reset(self):
+        """This function forgets every timing."""
+
+        for phase in self._phases:
+            self._phases[phase].clear()
+
+    def export(self):
+        """This function returns the timings of every phase that was called
+           as a dictionary."""
+
+        phases = {}
+        for phase in self._phases:
+            if self._phases[phase]._calls > 0:
+                phases[phase] = self._phases[phase].export()
+        return {'phases': phases}
+
+    def write(self, filename, extra=None):
+        """This function writes the exported timings (and the extra
+           dictionary, if given) to a JSON file."""
+
+        report = self.export()
+        if extra is not None:
+            report.update(extra)
+        with open(filename, 'w') as outfile:
+            json.dump(report, outfile, indent=2)
+            outfile.write('\n')
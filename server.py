@@ -0,0 +1,425 @@
+"""
+ *****************************************************************************
+   FILE:  server.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This program hosts many games of Monopoly for remote players
+                on a single asyncio event loop. Clients connect over TCP and
+                send one JSON object per line. A client can create a game
+                of 2 to 8 players and play any of its players, or join a
+                free player of a game another client created. The decisions
+                are the ones the buttons of game.py stand for:
+
+                  {"op": "new", "players": 6, "seats": [1], "seed": 7}
+                  {"op": "join", "game": 3}
+                  {"op": "roll", "game": 3}
+                  {"op": "buy", "game": 3}        or "pass"
+                  {"op": "tax", "game": 3, "choice": "10%"}   or "200"
+                  {"op": "jail free", "game": 3, "use": true}
+                  {"op": "house", "game": 3, "spot": 40}
+                  {"op": "end turn", "game": 3}
+                  {"op": "state", "game": 3}
+
+                Every player of the game is sent the events of each action
+                and the new state. If the active player doesn't act within
+                the game's timeout, simulate.Bot makes the decision for
+                them - right away for players that nobody plays. A game
+                with no winner after max_turns turns is stopped like the
+                games of simulate.py. Each client has a bounded queue of
+                lines to send - a client that doesn't read them fast enough
+                is disconnected instead of holding up the games it plays.
+
+ *****************************************************************************
+"""
+
+import argparse
+import asyncio
+import json
+
+from engine import (MAX_PLAYERS, MIN_PLAYERS, GameEngine, GameRandom,
+                    GameState, load_board)
+from simulate import Bot
+
+
+# the longest line a client can send:
+MAX_LINE = 4096
+
+
+class Connection(object):
+    """This class is a connected client: its stream, the queue of lines
+       waiting to be sent to it and the players it controls."""
+
+    # the constructor for the Connection class:
+    def __init__(self, reader, writer, queue_size):
+
+        self._reader = reader
+        self._writer = writer
+        self._queue = asyncio.Queue(queue_size)
+        self._closed = False
+
+        # the (game id, player id number) pairs the client plays:
+        self._seats = set()
+
+    def send(self, message):
+        """This function queues a message to be sent to the client, closing
+           the connection if the client has fallen too far behind."""
+
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait((json.dumps(message) + '\n').encode())
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        """This function stops sending to the client and closes its
+           stream."""
+
+        if self._closed:
+            return
+        self._closed = True
+        # wakes up the sender so that it can finish:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+        self._writer.close()
+
+    async def sender(self):
+        """This function writes the queued lines to the client, waiting for
+           each to be taken by the network before writing the next."""
+
+        try:
+            while True:
+                line = await self._queue.get()
+                if line is None:
+                    return
+                self._writer.write(line)
+                await self._writer.drain()
+        except (ConnectionError, OSError):
+            self.close()
+
+
+class ServerGame(object):
+    """This class is one game hosted by the server: its engine, the
+       connection playing each player and the timer of the active player's
+       decision."""
+
+    __slots__ = ('_id', '_engine', '_seats', '_timer')
+
+    # the constructor for the ServerGame class:
+    def __init__(self, game_id, board, seed, num_players=2):
+
+        self._id = game_id
+        self._engine = GameEngine(board, GameRandom(seed),
+                                  GameState(num_players))
+
+        # the Connection playing each player, keyed by id number:
+        self._seats = {}
+        for idnum in range(1, num_players + 1):
+            self._seats[idnum] = None
+        self._timer = None
+
+    def state(self):
+        """This function returns the part of the game state that the players
+           can see."""
+
+        state = self._engine._state
+        players = []
+        for player in state._players:
+            players.append({'id': player._idnum,
+                            'spot': player._piece_loc,
+                            'money': player._money,
+                            'jail free': player._jail_free,
+                            'bankrupt': player._bankrupt,
+                            'properties': player._properties})
+        # the cause of the end of a game, once it is over:
+        cause = None
+        if state._phase == 'over':
+            cause = state._bankrupcy_cause
+            if state._winner is None:
+                cause = 'turn limit'
+
+        return {'game': self._id,
+                'turn': self._engine.player()._idnum,
+                'phase': state._phase,
+                'turns': state._turns,
+                'winner': state._winner,
+                'cause': cause,
+                'players': players}
+
+
+class GameServer(object):
+    """This class hosts the games and answers the clients' messages."""
+
+    # the constructor for the GameServer class:
+    def __init__(self, board, timeout=60.0, max_games=10000,
+                 queue_size=256, max_turns=1000):
+
+        self._board = board
+        self._timeout = timeout
+        self._max_games = max_games
+        self._queue_size = queue_size
+        self._max_turns = max_turns
+
+        self._games = {}
+        self._next_id = 1
+        self._bot = Bot()
+
+    async def handle_client(self, reader, writer):
+        """This function reads the messages of a client one line at a time
+           until it disconnects. * A line is only read once the last one was
+           answered, so a busy client can't flood the server"""
+
+        conn = Connection(reader, writer, self._queue_size)
+        sender = asyncio.ensure_future(conn.sender())
+        try:
+            while not conn._closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError('message is not an object')
+                    self.dispatch(conn, message)
+                except ValueError as error:
+                    conn.send({'error': str(error)})
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # the server is shutting down:
+            sender.cancel()
+            return
+        finally:
+            self.disconnect(conn)
+            conn.close()
+        await sender
+
+    def disconnect(self, conn):
+        """This function frees the players of a client that left, ending the
+           games that nobody plays anymore."""
+
+        for game_id, idnum in list(conn._seats):
+            game = self._games.get(game_id)
+            if game is None:
+                continue
+            game._seats[idnum] = None
+            if all(seat is None for seat in game._seats.values()):
+                self.end_game(game)
+            else:
+                # the bot takes over if the player left was the active one:
+                self.start_timer(game)
+        conn._seats.clear()
+
+    def dispatch(self, conn, message):
+        """This function performs the operation of a client's message. It
+           raises a ValueError describing a message that can't be
+           performed."""
+
+        op = message.get('op')
+
+        if op == 'new':
+            if len(self._games) >= self._max_games:
+                raise ValueError('too many games')
+            num_players = message.get('players', 2)
+            if (not isinstance(num_players, int) or
+                    not MIN_PLAYERS <= num_players <= MAX_PLAYERS):
+                raise ValueError('players must be from %d to %d' %
+                                 (MIN_PLAYERS, MAX_PLAYERS))
+            seats = message.get('seats', list(range(1, num_players + 1)))
+            if (not isinstance(seats, list) or len(seats) == 0 or
+                    not all(isinstance(idnum, int) for idnum in seats) or
+                    not set(seats) <= set(range(1, num_players + 1))):
+                raise ValueError('seats must be players from 1 to %d' %
+                                 num_players)
+            seed = message.get('seed')
+            if seed is not None and not isinstance(seed, int):
+                raise ValueError('seed must be an integer')
+
+            game = ServerGame(self._next_id, self._board, seed, num_players)
+            self._next_id += 1
+            self._games[game._id] = game
+            for idnum in seats:
+                game._seats[idnum] = conn
+                conn._seats.add((game._id, idnum))
+            self.start_timer(game)
+            conn.send(dict(game.state(), seats=sorted(seats)))
+            return
+
+        # the other operations are on an existing game:
+        game_id = message.get('game')
+        if not isinstance(game_id, int) or game_id not in self._games:
+            raise ValueError('no such game')
+        game = self._games[game_id]
+
+        if op == 'join':
+            for idnum in sorted(game._seats):
+                if game._seats[idnum] is None:
+                    game._seats[idnum] = conn
+                    conn._seats.add((game._id, idnum))
+                    conn.send(dict(game.state(), seats=[idnum]))
+                    return
+            raise ValueError('game is full')
+
+        if op == 'state':
+            conn.send(game.state())
+            return
+
+        # only the client of the active player can make its decisions:
+        engine = game._engine
+        if game._seats[engine.player()._idnum] is not conn:
+            raise ValueError('not your turn')
+        self.play(game, self.perform(engine, op, message), False)
+
+    def perform(self, engine, op, message):
+        """This function performs a decision of the active player and returns
+           its events, raising a ValueError if the decision can't be made in
+           the current phase."""
+
+        phase = engine._state._phase
+
+        if op == 'roll' and phase == 'roll':
+            return engine.roll()
+        if op == 'buy' and phase == 'buy':
+            return engine.buy()
+        if op == 'pass' and phase == 'buy':
+            return engine.pass_property()
+        if op == 'tax' and phase == 'tax':
+            if message.get('choice') not in ('10%', '200'):
+                raise ValueError('choice must be "10%" or "200"')
+            return engine.pay_income_tax(message['choice'])
+        if op == 'jail free' and phase == 'jail free':
+            return engine.jail_free_choice(bool(message.get('use')))
+        if op == 'house' and phase == 'end':
+            spot = message.get('spot')
+            if not isinstance(spot, int) or not 1 <= spot <= 40:
+                raise ValueError('spot must be from 1 to 40')
+            events = engine.buy_house(spot)
+            if len(events) == 0:
+                raise ValueError('no house can be built on %d' % spot)
+            return events
+        if op == 'end turn' and phase == 'end':
+            return engine.end_turn()
+        raise ValueError('%r is not allowed in phase %r' % (op, phase))
+
+    def play(self, game, events, automatic):
+        """This function sends the events of an action and the new state to
+           every player of the game, restarting the timer of the next
+           decision or ending the game if it is over."""
+
+        # stops a game that reached the turn limit, in the same place
+        # simulate.play_game does:
+        state = game._engine._state
+        if state._phase == 'end' and state._turns >= self._max_turns:
+            state._phase = 'over'
+
+        # the order of the shuffled decks is kept from the players:
+        shown = []
+        for event in events:
+            if event[0] != 'shuffle':
+                shown.append(list(event))
+
+        message = dict(game.state(), events=shown, auto=automatic)
+        for conn in set(game._seats.values()):
+            if conn is not None:
+                conn.send(message)
+
+        if game._engine._state._phase == 'over':
+            self.end_game(game)
+        else:
+            self.start_timer(game)
+
+    def start_timer(self, game):
+        """This function (re)starts the timer of the active player's
+           decision. * The decisions of players that nobody plays are made
+           on the next pass of the event loop instead of after the
+           timeout"""
+
+        if game._timer is not None:
+            game._timer.cancel()
+        loop = asyncio.get_running_loop()
+        if game._seats[game._engine.player()._idnum] is None:
+            game._timer = loop.call_soon(self.time_out, game._id)
+        else:
+            game._timer = loop.call_later(self._timeout, self.time_out,
+                                          game._id)
+
+    def time_out(self, game_id):
+        """This function makes the decision of an active player that took
+           too long with simulate.Bot."""
+
+        game = self._games.get(game_id)
+        if game is None:
+            return
+        game._timer = None
+
+        engine = game._engine
+        bot = self._bot
+        phase = engine._state._phase
+        if phase == 'roll':
+            events = engine.roll()
+        elif phase == 'buy':
+            events = engine.buy() if bot.buy(engine) else \
+                engine.pass_property()
+        elif phase == 'tax':
+            events = engine.pay_income_tax(bot.income_tax(engine))
+        elif phase == 'jail free':
+            events = engine.jail_free_choice(bot.use_jail_free(engine))
+        else:
+            events = engine.end_turn()
+        self.play(game, events, True)
+
+    def end_game(self, game):
+        """This function removes a game from the server."""
+
+        if game._timer is not None:
+            game._timer.cancel()
+            game._timer = None
+        self._games.pop(game._id, None)
+        for idnum in game._seats:
+            conn = game._seats[idnum]
+            if conn is not None:
+                conn._seats.discard((game._id, idnum))
+
+    async def serve(self, host, port):
+        """This function accepts clients on the given address until the
+           server is stopped."""
+
+        server = await asyncio.start_server(self.handle_client, host, port,
+                                            limit=MAX_LINE)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """This function runs the server from the command line."""
+
+    parser = argparse.ArgumentParser(description='Host games of Monopoly '
+                                                 'for remote players.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='address to listen on')
+    parser.add_argument('--port', type=int, default=8765,
+                        help='port to listen on')
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help='seconds a player has to make a decision')
+    parser.add_argument('--max-games', type=int, default=10000,
+                        help='number of games hosted at once')
+    parser.add_argument('--max-turns', type=int, default=1000,
+                        help='number of turns before a game is stopped')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    args = parser.parse_args()
+
+    server = GameServer(load_board(args.board), args.timeout,
+                        args.max_games, max_turns=args.max_turns)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+ *****************************************************************************
+   FILE:  simulate.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This program plays complete games of Monopoly between 2 to
+                8 bots making every decision. Games are spread over a pool
+                of worker processes and the result of each game is streamed
+                back as soon as its batch of games is finished.
+
+ *****************************************************************************
+"""
+
+import argparse
+import multiprocessing
+import sys
+
+from engine import (DEED, MAX_PLAYERS, MIN_PLAYERS, GameEngine, GameRandom,
+                    GameState, load_board)
+from eventlog import EventLog, write_game
+
+
+class Bot(object):
+    """This class makes the decisions of a player that would otherwise be
+       button clicks: buying properties, paying the Income Tax, using a
+       "Jail Free" card and buying houses."""
+
+    # the constructor for the Bot class:
+    def __init__(self, reserve=0):
+
+        # the amount of money the bot keeps after buying a property or house:
+        self._reserve = reserve
+
+    def buy(self, engine):
+        """This function returns True if the bot buys the property it landed
+           on."""
+
+        player = engine.player()
+        price = engine._board._prices[player._piece_loc]
+        return player._money - price >= self._reserve
+
+    def income_tax(self, engine):
+        """This function returns the Income Tax choice ('10%' or '200') that
+           costs the bot the least."""
+
+        if int(engine.player()._money * 0.1) < 200:
+            return '10%'
+        return '200'
+
+    def use_jail_free(self, engine):
+        """This function returns True if the bot uses its "Jail Free" card."""
+
+        return True
+
+    def build_houses(self, engine):
+        """This function buys as many houses as the bot can afford on the
+           sets it owns completely."""
+
+        board = engine._board
+        player = engine.player()
+        for piece_loc in list(player._properties):
+            while (board._kinds[piece_loc] == DEED and
+                   player._money - board._house_costs[piece_loc] >
+                   self._reserve):
+                events = engine.buy_house(piece_loc)
+                if len(events) == 0 or events[0][0] != 'house':
+                    break
+
+
+def play_turn(engine, bot):
+    """This function has the given bot make decisions for the active
+       player until their turn is over. * The turn is not ended so that
+       the caller can still look at the game state"""
+
+    state = engine._state
+    while state._phase != 'end' and state._phase != 'over':
+        phase = state._phase
+        if phase == 'roll':
+            engine.roll()
+        elif phase == 'buy':
+            if bot.buy(engine):
+                engine.buy()
+            else:
+                engine.pass_property()
+        elif phase == 'tax':
+            engine.pay_income_tax(bot.income_tax(engine))
+        elif phase == 'jail free':
+            engine.jail_free_choice(bot.use_jail_free(engine))
+
+    # buys houses once the player is done rolling:
+    if state._phase == 'end':
+        bot.build_houses(engine)
+
+
+def play_game(board, seed, bots=None, max_turns=1000, record=False):
+    """This function plays a complete game on the given BoardTable with the
+       given seed, one player for each bot (two simulate.Bots if none are
+       given), and returns a dictionary with the winner (0 if nobody won),
+       the number of turns, the cause of the last bankrupcy and the final
+       money of each player. If record is True, the dictionary also has the
+       event log of the game."""
+
+    if bots is None:
+        bots = [Bot(), Bot()]
+
+    log = EventLog(len(bots)) if record else None
+    engine = GameEngine(board, GameRandom(seed), GameState(len(bots)), log)
+    state = engine._state
+
+    # plays turns until a player goes bankrupt or the turn limit is reached:
+    while True:
+        play_turn(engine, bots[state._turn])
+        if state._phase == 'over' or state._turns >= max_turns:
+            break
+        engine.end_turn()
+
+    cause = state._bankrupcy_cause
+    if state._phase != 'over':
+        cause = 'turn limit'
+
+    result = {'seed': seed,
+              'winner': state._winner or 0,
+              'turns': state._turns,
+              'cause': cause,
+              'money': [player._money for player in state._players]}
+    if record:
+        result['log'] = log.getvalue()
+    return result
+
+
+# the BoardTable used by each worker process:
+_worker_board = None
+
+
+def _start_worker(filename):
+    """This function loads the board information once in a worker process
+       so that it isn't sent again with every batch of games. * The board
+       was already compiled by the main process, so this only reads the
+       cached BoardTable"""
+
+    global _worker_board
+    _worker_board = load_board(filename)
+
+
+def _play_seed_range(args):
+    """This function plays the games for a range of seeds in a worker
+       process and returns their results."""
+
+    first_seed, last_seed, max_turns, record, num_players = args
+    results = []
+    for seed in range(first_seed, last_seed):
+        bots = [Bot() for i in range(num_players)]
+        results.append(play_game(_worker_board, seed, bots, max_turns,
+                                 record))
+    return results
+
+
+def run_simulation(num_games, workers=None, first_seed=0, batch_size=1000,
+                   max_turns=1000, filename='dicts.json', record=False,
+                   num_players=2):
+    """This function plays num_games games of num_players bots with the
+       seeds first_seed, first_seed + 1, ... over a pool of worker processes
+       (one per core unless workers is given). Each worker plays a range of
+       batch_size seeds at a time, and the results (with the event logs if
+       record is True) are yielded as each range is finished, in no
+       particular order."""
+
+    # checks and compiles the board before starting the workers:
+    load_board(filename)
+
+    # splits the seeds into ranges for the workers:
+    last_seed = first_seed + num_games
+    seed_ranges = []
+    for start in range(first_seed, last_seed, batch_size):
+        seed_ranges.append((start, min(start + batch_size, last_seed),
+                            max_turns, record, num_players))
+
+    pool = multiprocessing.Pool(workers, _start_worker, (filename,))
+    try:
+        for results in pool.imap_unordered(_play_seed_range, seed_ranges):
+            for result in results:
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main():
+    """This function runs a simulation from the command line and prints the
+       number of wins for each player, the average number of turns and the
+       number of games that ended with each cause."""
+
+    parser = argparse.ArgumentParser(description='Simulate games of '
+                                                 'Monopoly between bots.')
+    parser.add_argument('games', type=int, help='number of games to play')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: one per '
+                             'core)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first game')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='number of games a worker plays at a time')
+    parser.add_argument('--max-turns', type=int, default=1000,
+                        help='number of turns before a game is stopped')
+    parser.add_argument('--players', type=int, default=2,
+                        choices=range(MIN_PLAYERS, MAX_PLAYERS + 1),
+                        metavar='PLAYERS',
+                        help='number of players in each game (2 to 8)')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    parser.add_argument('--output', default=None,
+                        help='file to write a line per game to')
+    parser.add_argument('--log', default=None,
+                        help='archive file to append the event log of each '
+                             'game to')
+    args = parser.parse_args()
+
+    outfile = None
+    if args.output is not None:
+        outfile = open(args.output, 'w')
+        outfile.write('seed,winner,turns,cause,' +
+                      ','.join(['money%d' % (i + 1)
+                                for i in range(args.players)]) + '\n')
+    logfile = None
+    if args.log is not None:
+        logfile = open(args.log, 'ab')
+
+    wins = dict((idnum, 0) for idnum in range(args.players + 1))
+    causes = {}
+    total_turns = 0
+    num_games = 0
+
+    for result in run_simulation(args.games, args.workers, args.seed,
+                                 args.batch_size, args.max_turns,
+                                 args.board, logfile is not None,
+                                 args.players):
+        num_games += 1
+        wins[result['winner']] += 1
+        causes[result['cause']] = causes.get(result['cause'], 0) + 1
+        total_turns += result['turns']
+        if outfile is not None:
+            outfile.write('%d,%d,%d,%s,' %
+                          (result['seed'], result['winner'], result['turns'],
+                           result['cause']) +
+                          ','.join([str(money) for money in result['money']])
+                          + '\n')
+        if logfile is not None:
+            write_game(logfile, result['seed'], result['log'])
+
+    if outfile is not None:
+        outfile.close()
+    if logfile is not None:
+        logfile.close()
+
+    sys.stdout.write('games: %d\n' % num_games)
+    for idnum in range(1, args.players + 1):
+        sys.stdout.write('player %d wins: %d\n' % (idnum, wins[idnum]))
+    sys.stdout.write('no winner: %d\n' % wins[0])
+    if num_games > 0:
+        sys.stdout.write('average turns: %.1f\n' % (total_turns / num_games))
+    for cause in sorted(causes):
+        sys.stdout.write('%s: %d\n' % (cause, causes[cause]))
+
+
+if __name__ == '__main__':
+    main()
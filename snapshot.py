@@ -0,0 +1,321 @@
+"""
+ *****************************************************************************
+   FILE:  snapshot.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This module saves a game (its engine.GameState and
+                engine.GameRandom) to a binary file with a fixed layout and
+                loads it back. Every field of the state is at an offset that
+                only depends on the number of players, so a SnapshotView can
+                map the file into memory and decode just the fields it is
+                asked for. The file is laid out as: the header, the turn,
+                the owner and houses of each spot, the order of each deck,
+                a record per player, and the state of the random number
+                generator (the Mersenne Twister state and then the key and
+                the unused dice and card bytes, whose lengths are in the
+                generator's record). All numbers are little-endian.
+
+ *****************************************************************************
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+
+from engine import CARD_TABLES, GameRandom, GameState, PlayerState
+from eventlog import CAUSES
+
+
+# the first bytes of every snapshot and the version of the layout:
+MAGIC = b'MNPL'
+VERSION = 3
+
+# the phases of a turn in the order of their codes:
+PHASES = ['roll', 'buy', 'tax', 'jail free', 'end', 'over']
+
+# the header: magic, version and number of players:
+_HEADER = struct.Struct('<4sHB')
+
+# the turn: active player, doubles in succession, whether the player may
+# roll again, last roll, phase code, number of turns, winner (0 if none)
+# and cause code (0 if none, else 1 + index into CAUSES):
+_TURN = struct.Struct('<BBBBBIBB')
+
+# the owner and number of houses of each spot (index 0 unused):
+_SPOTS = struct.Struct('<41s41s')
+
+# the order of each deck and the number of cards drawn from it:
+_DECKS = [struct.Struct('<%dsB' % len(table._names)) for table in CARD_TABLES]
+
+# a player: id number, spot, money, "Jail Free" card, whether they went
+# bankrupt, number of properties, the properties in the order they were
+# bought (padded to 40) and the mask of owned properties:
+_PLAYER = struct.Struct('<BBiBBB40sQ')
+
+# the generator: Mersenne Twister state (624 words and the position), whether
+# there is a saved Gaussian value and the value, the number of children
+# spawned, the buffer size, and the lengths of the key and the unused dice
+# and card bytes that follow:
+_RANDOM = struct.Struct('<625IBdIIHII')
+
+# the offsets of each part of the layout:
+_TURN_AT = _HEADER.size
+_SPOTS_AT = _TURN_AT + _TURN.size
+_DECKS_AT = _SPOTS_AT + _SPOTS.size
+_PLAYERS_AT = _DECKS_AT + sum([deck.size for deck in _DECKS])
+
+
+def _random_at(num_players):
+    """This function returns the offset of the generator's record."""
+
+    return _PLAYERS_AT + num_players * _PLAYER.size
+
+
+def dumps(state, rng):
+    """This function returns the snapshot of the game as bytes."""
+
+    parts = [_HEADER.pack(MAGIC, VERSION, len(state._players))]
+
+    # packs the turn, spots and decks:
+    cause = 0
+    if state._bankrupcy_cause is not None:
+        cause = 1 + CAUSES.index(state._bankrupcy_cause)
+    parts.append(_TURN.pack(state._turn, state._roll_doubles,
+                            state._same_roll, state._advance,
+                            PHASES.index(state._phase), state._turns,
+                            state._winner or 0, cause))
+    parts.append(_SPOTS.pack(bytes(state._owned), bytes(state._houses)))
+    for i in range(len(_DECKS)):
+        parts.append(_DECKS[i].pack(bytes(state._decks[i]),
+                                    state._drawn[i]))
+
+    # packs each player:
+    for player in state._players:
+        parts.append(_PLAYER.pack(player._idnum, player._piece_loc,
+                                  player._money, player._jail_free,
+                                  player._bankrupt, len(player._properties),
+                                  bytes(player._properties),
+                                  player._owned_mask))
+
+    # packs the generator - only the unused part of its buffers is kept:
+    (key, spawned, random_state, buffer_size, dice, dice_pos, cards,
+     cards_pos) = rng.getstate()
+    version, words, gauss = random_state
+    keys = b''.join([_pack_int(number) for number in key])
+    parts.append(_RANDOM.pack(*(list(words) +
+                                [gauss is not None, gauss or 0.0, spawned,
+                                 buffer_size, len(keys),
+                                 len(dice) - dice_pos,
+                                 len(cards) - cards_pos])))
+    parts.append(keys)
+    parts.append(dice[dice_pos:])
+    parts.append(cards[cards_pos:])
+
+    return b''.join(parts)
+
+
+def _pack_int(number):
+    """This function returns a key number as its length and its bytes."""
+
+    data = number.to_bytes(number.bit_length() // 8 + 1, 'little',
+                           signed=True)
+    return bytes([len(data)]) + data
+
+
+def loads(data):
+    """This function returns the GameState and GameRandom of a snapshot."""
+
+    return SnapshotView(data).load()
+
+
+def save(filename, state, rng):
+    """This function writes the snapshot of the game to the file. * The
+       snapshot is written to a temporary file first so that a snapshot
+       being replaced is never left half written"""
+
+    data = dumps(state, rng)
+    outfd, temp_file = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(filename)))
+    try:
+        with os.fdopen(outfd, 'wb') as outfile:
+            outfile.write(data)
+        os.replace(temp_file, filename)
+    except OSError:
+        os.unlink(temp_file)
+        raise
+
+
+def load(filename):
+    """This function returns the GameState and GameRandom saved in the
+       file."""
+
+    with SnapshotView.open(filename) as view:
+        return view.load()
+
+
+class SnapshotView(object):
+    """This class reads the fields of a snapshot from bytes or a memory
+       mapped file, decoding each field only when it is asked for."""
+
+    # the constructor for the SnapshotView class:
+    def __init__(self, data, mapped=None):
+
+        self._data = data
+        self._mapped = mapped
+
+        magic, version, self._num_players = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a version %d snapshot' % VERSION)
+
+    @classmethod
+    def open(cls, filename):
+        """This function returns a SnapshotView of the file that maps it
+           into memory instead of reading it."""
+
+        with open(filename, 'rb') as infile:
+            mapped = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped)
+
+    def close(self):
+        """This function unmaps the file of the snapshot."""
+
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self):
+        """This function lets the view be used in a with statement."""
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """This function unmaps the file at the end of a with statement."""
+
+        self.close()
+
+    def num_players(self):
+        """This function returns the number of players."""
+
+        return self._num_players
+
+    def turn(self):
+        """This function returns the index of the active player."""
+
+        return self._data[_TURN_AT]
+
+    def phase(self):
+        """This function returns the phase of the turn."""
+
+        return PHASES[self._data[_TURN_AT + 4]]
+
+    def turns(self):
+        """This function returns the number of turns played."""
+
+        return _TURN.unpack_from(self._data, _TURN_AT)[5]
+
+    def winner(self):
+        """This function returns the id number of the winner, or None."""
+
+        return self._data[_TURN_AT + _TURN.size - 2] or None
+
+    def owner(self, piece_loc):
+        """This function returns the id number of the owner of a spot (0 if
+           it isn't owned)."""
+
+        return self._data[_SPOTS_AT + piece_loc]
+
+    def houses(self, piece_loc):
+        """This function returns the number of houses on a spot."""
+
+        return self._data[_SPOTS_AT + 41 + piece_loc]
+
+    def player(self, index):
+        """This function returns the PlayerState of the player at the given
+           index."""
+
+        (idnum, piece_loc, money, jail_free, bankrupt, num_properties,
+         properties, owned_mask) = _PLAYER.unpack_from(
+             self._data, _PLAYERS_AT + index * _PLAYER.size)
+
+        player = PlayerState(idnum)
+        player._piece_loc = piece_loc
+        player._money = money
+        player._jail_free = bool(jail_free)
+        player._bankrupt = bool(bankrupt)
+        player._properties = list(properties[:num_properties])
+        player._owned_mask = owned_mask
+        return player
+
+    def money(self, index):
+        """This function returns the money of the player at the given
+           index."""
+
+        return struct.unpack_from('<i', self._data,
+                                  _PLAYERS_AT + index * _PLAYER.size + 2)[0]
+
+    def state(self):
+        """This function decodes the whole GameState."""
+
+        data = self._data
+        state = GameState(self._num_players)
+
+        (state._turn, state._roll_doubles, same_roll, state._advance, phase,
+         state._turns, winner, cause) = _TURN.unpack_from(data, _TURN_AT)
+        state._same_roll = bool(same_roll)
+        state._phase = PHASES[phase]
+        state._winner = winner or None
+        state._bankrupcy_cause = CAUSES[cause - 1] if cause else None
+
+        owned, houses = _SPOTS.unpack_from(data, _SPOTS_AT)
+        state._owned = bytearray(owned)
+        state._houses = bytearray(houses)
+
+        offset = _DECKS_AT
+        for i in range(len(_DECKS)):
+            deck, state._drawn[i] = _DECKS[i].unpack_from(data, offset)
+            state._decks[i] = bytearray(deck)
+            offset += _DECKS[i].size
+
+        state._players = [self.player(i) for i in range(self._num_players)]
+        state._players_left = len([player for player in state._players
+                                   if not player._bankrupt])
+        return state
+
+    def rng(self):
+        """This function decodes the GameRandom."""
+
+        data = self._data
+        offset = _random_at(self._num_players)
+        fields = _RANDOM.unpack_from(data, offset)
+        words = fields[:625]
+        (has_gauss, gauss, spawned, buffer_size, keys_length, dice_length,
+         cards_length) = fields[625:]
+        offset += _RANDOM.size
+
+        # reads the key numbers:
+        key = []
+        end = offset + keys_length
+        while offset < end:
+            length = data[offset]
+            key.append(int.from_bytes(data[offset + 1:offset + 1 + length],
+                                      'little', signed=True))
+            offset += 1 + length
+
+        dice = bytes(data[offset:offset + dice_length])
+        offset += dice_length
+        cards = bytes(data[offset:offset + cards_length])
+
+        rng = GameRandom(0)
+        rng.setstate((tuple(key), spawned,
+                      (3, words, gauss if has_gauss else None), buffer_size,
+                      dice, 0, cards, 0))
+        return rng
+
+    def load(self):
+        """This function decodes the GameState and GameRandom."""
+
+        return self.state(), self.rng()
@@ -0,0 +1,242 @@
+"""
+ *****************************************************************************
+   FILE:  tournament.py
+
+   AUTHOR: Alma Thompson
+
+   ASSIGNMENT: Final Project - Monopoly
+
+   DESCRIPTION: This program plays a round-robin tournament between bot
+                policies. Every pair of policies plays the same seeds twice,
+                once with each policy going first, so that neither the dice
+                nor the first move favor one of them. The games are spread
+                over a pool of worker processes and the standings (the score
+                of each policy, a win counting 1 and a game without a winner
+                1/2, with its 95% confidence interval) are updated as each
+                batch of games comes back.
+
+ *****************************************************************************
+"""
+
+import argparse
+import math
+import multiprocessing
+import sys
+
+import simulate
+from engine import MAX_PLAYERS, load_board
+from mcts import MctsBot
+from simulate import Bot, play_game
+
+
+# the policies that can be entered, as the class of the bot and the
+# arguments it is created with:
+POLICIES = {'bot': (Bot, {}),
+            'reserve': (Bot, {'reserve': 150}),
+            'mcts': (MctsBot, {'budget': None, 'max_iterations': 20}),
+            'mcts-fast': (MctsBot, {'budget': None, 'max_iterations': 5})}
+
+
+def make_bot(name, seed, seat):
+    """This function creates a bot of the named policy for the seat (0 for
+       player 1) of the game with the given seed."""
+
+    bot_class, arguments = POLICIES[name]
+    arguments = dict(arguments)
+
+    # seeds the search of tree search bots with the game and seat so that
+    # games can be played again and two bots in a game (or the same seat in
+    # another game) never search with the same random numbers:
+    if issubclass(bot_class, MctsBot):
+        arguments['seed'] = seed * MAX_PLAYERS + seat
+    return bot_class(**arguments)
+
+
+def wilson_interval(score, games, z=1.96):
+    """This function returns the Wilson score interval of a proportion of
+       score out of games."""
+
+    if games == 0:
+        return 0.0, 1.0
+    rate = score / games
+    center = (rate + z * z / (2 * games)) / (1 + z * z / games)
+    spread = (z * math.sqrt(rate * (1 - rate) / games +
+                            z * z / (4 * games * games)) /
+              (1 + z * z / games))
+    return max(center - spread, 0.0), min(center + spread, 1.0)
+
+
+class Standings(object):
+    """This class adds up the results of the games of a tournament: the
+       wins, losses and games without a winner of each policy against each
+       other policy."""
+
+    # the constructor for the Standings class:
+    def __init__(self, names):
+
+        self._names = names
+
+        # the [wins, losses, no winner] of a policy against another, keyed
+        # by (policy, opponent):
+        self._records = {}
+        for name in names:
+            for opponent in names:
+                if name != opponent:
+                    self._records[(name, opponent)] = [0, 0, 0]
+
+    def add(self, names, winner):
+        """Given the policies of player 1 and player 2 and the policy that
+           won (None if nobody won), this function adds the game."""
+
+        first, second = names
+        if winner is None:
+            self._records[(first, second)][2] += 1
+            self._records[(second, first)][2] += 1
+        else:
+            loser = second if winner == first else first
+            self._records[(winner, loser)][0] += 1
+            self._records[(loser, winner)][1] += 1
+
+    def score(self, name, opponent=None):
+        """This function returns the number of games, score and confidence
+           interval of a policy against the opponent (or every opponent)."""
+
+        games = 0
+        score = 0.0
+        for other in self._names:
+            if other == name or (opponent is not None and other != opponent):
+                continue
+            wins, losses, draws = self._records[(name, other)]
+            games += wins + losses + draws
+            score += wins + draws / 2
+        low, high = wilson_interval(score, games)
+        return games, score, low, high
+
+    def report(self, outfile):
+        """This function writes the score of each policy and the table of
+           scores between each pair of policies."""
+
+        for name in self._names:
+            games, score, low, high = self.score(name)
+            rate = score / games if games > 0 else 0.0
+            outfile.write('%-10s %6d games  %5.1f%%  [%5.1f%%, %5.1f%%]\n' %
+                          (name, games, 100 * rate, 100 * low, 100 * high))
+
+        # writes the score of the policy of each row against each column:
+        outfile.write('%-10s' % '')
+        for name in self._names:
+            outfile.write(' %10s' % name)
+        outfile.write('\n')
+        for name in self._names:
+            outfile.write('%-10s' % name)
+            for opponent in self._names:
+                games, score = self.score(name, opponent)[:2]
+                if name == opponent or games == 0:
+                    outfile.write(' %10s' % '-')
+                else:
+                    outfile.write(' %9.1f%%' % (100 * score / games))
+            outfile.write('\n')
+
+
+def _play_pairing(args):
+    """This function plays the games of a pair of policies for a range of
+       seeds in a worker process, each seed once with each policy going
+       first, and returns the policies of each game and the winner."""
+
+    first, second, first_seed, last_seed, max_turns = args
+    results = []
+    for seed in range(first_seed, last_seed):
+        for names in ((first, second), (second, first)):
+            bots = [make_bot(names[0], seed, 0), make_bot(names[1], seed, 1)]
+            result = play_game(simulate._worker_board, seed, bots, max_turns)
+            winner = None
+            if result['winner'] != 0:
+                winner = names[result['winner'] - 1]
+            results.append((names, winner))
+    return results
+
+
+def run_tournament(names, seeds_per_pair, workers=None, first_seed=0,
+                   batch_size=50, max_turns=1000, filename='dicts.json'):
+    """This function plays every pair of the named policies on the seeds
+       first_seed to first_seed + seeds_per_pair - 1 (two games per seed)
+       over a pool of worker processes. The Standings are yielded each time
+       a batch of batch_size seeds of a pair is finished."""
+
+    # checks and compiles the board before starting the workers:
+    load_board(filename)
+
+    # splits the seeds of each pair into batches for the workers:
+    last_seed = first_seed + seeds_per_pair
+    batches = []
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            for start in range(first_seed, last_seed, batch_size):
+                batches.append((names[i], names[j], start,
+                                min(start + batch_size, last_seed),
+                                max_turns))
+
+    standings = Standings(names)
+    pool = multiprocessing.Pool(workers, simulate._start_worker, (filename,))
+    try:
+        for results in pool.imap_unordered(_play_pairing, batches):
+            for game_names, winner in results:
+                standings.add(game_names, winner)
+            yield standings
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main():
+    """This function runs a tournament from the command line, printing the
+       score of each policy as the games come in and the full standings at
+       the end."""
+
+    parser = argparse.ArgumentParser(description='Play a round-robin '
+                                                 'tournament between bot '
+                                                 'policies.')
+    parser.add_argument('seeds', type=int,
+                        help='number of seeds each pair plays (two games '
+                             'per seed)')
+    parser.add_argument('--policies', nargs='+', default=['bot', 'reserve'],
+                        choices=sorted(POLICIES),
+                        help='policies to enter (default: bot reserve)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: one per '
+                             'core)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='first seed')
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help='number of seeds a worker plays at a time')
+    parser.add_argument('--max-turns', type=int, default=1000,
+                        help='number of turns before a game is stopped')
+    parser.add_argument('--board', default='dicts.json',
+                        help='file with the information about each spot')
+    args = parser.parse_args()
+
+    if len(set(args.policies)) < 2:
+        parser.error('at least two different policies are needed')
+    names = sorted(set(args.policies), key=args.policies.index)
+
+    standings = None
+    for standings in run_tournament(names, args.seeds, args.workers,
+                                    args.seed, args.batch_size,
+                                    args.max_turns, args.board):
+        # writes a line with the current score of each policy:
+        line = []
+        for name in names:
+            games, score, low, high = standings.score(name)
+            line.append('%s %.1f%% [%.1f, %.1f]' %
+                        (name, 100 * score / max(games, 1), 100 * low,
+                         100 * high))
+        sys.stdout.write('  '.join(line) + '\n')
+        sys.stdout.flush()
+
+    if standings is not None:
+        sys.stdout.write('\n')
+        standings.report(sys.stdout)
+
+
+if __name__ == '__main__':
+    main()